@@ -1,14 +1,22 @@
 import tkinter as tk
 from tkinter import messagebox
-import random
+import argparse
+import getpass
+import os
+import time
 from PIL import Image, ImageTk 
 import io
-import pygame
-
-# Global Quiz Parameters 
-POINTS_FIRST_TRY = 10
-POINTS_SECOND_TRY = 5
-NUM_QUESTIONS = 10
+import quiz_engine
+import problem_bank
+from quiz_engine import NUM_QUESTIONS
+from assets import AssetManager
+import telemetry
+from leaderboard import Leaderboard
+import review_queue
+from quiz_server import RemoteQuizSession
+
+# Set to True to always put the larger number first in subtraction problems
+NON_NEGATIVE_SUBTRACTION = False
 
 # Color and Font Configuration for Design 
 PRIMARY_COLOR = '#4285F4'   
@@ -21,24 +29,45 @@ HEADING_FONT = ('Cooper Black', 18, 'bold')
 BODY_FONT = ('Verdana', 12)
 BUTTON_FONT = ('Verdana', 12, 'bold')
 
-# Initialize the mixer for sound effects and bg music
-pygame.mixer.init()
-
-# Load background music
-pygame.mixer.music.load("Assessment 1 - Skills Portfolio/Exercise1/bgsound.mp3")
-pygame.mixer.music.set_volume(0.3)
-pygame.mixer.music.play(-1)  # -1 = loop forever
-
-# Load sound effects for correct and wrong answers
-correct_sound = pygame.mixer.Sound("Assessment 1 - Skills Portfolio/Exercise1/correct.wav")
-wrong_sound = pygame.mixer.Sound("Assessment 1 - Skills Portfolio/Exercise1/wrong.wav")
+# Sound and background image files (next to this script, so the app runs from any folder)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MUSIC_FILE = os.path.join(BASE_DIR, "bgsound.mp3")
+CORRECT_SOUND = os.path.join(BASE_DIR, "correct.wav")
+WRONG_SOUND = os.path.join(BASE_DIR, "wrong.wav")
+MENU_BG = os.path.join(BASE_DIR, "menu_bg.png")
+QUIZ_BG = os.path.join(BASE_DIR, "quiz_bg.png")
+RESULTS_BG = os.path.join(BASE_DIR, "results_bg.png")
+
+# Binary log of per-question response times (see telemetry.py)
+SESSION_LOG = os.path.join(BASE_DIR, "quiz_sessions.log")
+# Append-only log of finished quizzes for the high score tables (see leaderboard.py)
+LEADERBOARD_LOG = os.path.join(BASE_DIR, "quiz_leaderboard.log")
+LEADERBOARD_SHOWN = 5             # Number of high scores shown on the results screen
+# One review queue file per player of the problems they missed or were slow on (see review_queue.py)
+REVIEW_DIR = os.path.join(BASE_DIR, "review")
+
+# How long answer feedback stays on the quiz card before the next question (Enter skips it)
+FEEDBACK_MS = 800
+FAILED_FEEDBACK_MS = 1500         # Longer, so there is time to read the correct answer
+
+# One line with the median and p95 of a list of latencies in seconds
+def latencySummary(label, latencies):
+    ms = sorted(t * 1000 for t in latencies)
+    return f"{label:<15} p50 {ms[len(ms) // 2]:6.1f} ms  p95 {ms[min(len(ms) - 1, int(len(ms) * 0.95))]:6.1f} ms"
 
 # Main application class for the math quiz.
 # Manages  navigation ,state between screens and quiz logic.
 class MathQuiz:
-    def __init__(self, master):
+    # server is an optional (host, port) of a quiz_server.py to play against instead of locally
+    # player picks whose review queue of missed questions is used
+    def __init__(self, master, server=None, player=None):
         # Initialize the root window
         self.master = master
+        self.server = server
+        try:
+            self.player = player or getpass.getuser()
+        except (KeyError, OSError):
+            self.player = "player"       # No login name to go by
         master.title("Math Quiz!")
         master.geometry("500x450") 
 
@@ -50,16 +79,26 @@ class MathQuiz:
         # Set the default background color for the root window
         master.config(bg=BACKGROUND_COLOR) 
                 
-        # Initialize Quiz State Variables
-        self.difficulty_level = None      # Easy, Moderate, or Advanced
-        self.question_count = 0           # Current question number (1 to NUM_QUESTIONS)
-        self.current_score = 0            # Total points collected
-        self.current_problem = None       # Dictionary holding the current problem {num1, num2, op, answer}
-        self.attempts = 0                 # Attempts made on the current question
+        # Quiz state (level, question count, score, attempts) lives in a headless QuizSession
+        self.session = None
+        self.recorder = None              # Records response times for the current quiz
+        self.stats = None                 # Analytics over all logged quizzes, loaded when first needed
+        self.leaderboard = None           # High scores per level, loaded when the first quiz ends
+        self.reviews = None               # The player's review queue, loaded when the first quiz starts
+
+        # Background PNGs start decoding in parallel now, audio loads once the window is showing
+        self.assets = AssetManager(
+            music_file=MUSIC_FILE,
+            sound_files={'correct': CORRECT_SOUND, 'wrong': WRONG_SOUND},
+            image_files=(MENU_BG, QUIZ_BG, RESULTS_BG)
+        )
+        master.after_idle(self.assets.startAudio)
+        master.protocol("WM_DELETE_WINDOW", self.close)
 
         # Background/Image variables
         self.current_bg_image_tk = None   # Tkinter PhotoImage object for the background
         self.current_image_filename = ""  # Stores the name of the currently loaded background image
+        self.bg_rendered_key = None       # (filename, width, height) of the image currently shown
         
         # Background Label (fills the entire root window)
         self.bg_label = tk.Label(master)
@@ -80,6 +119,26 @@ class MathQuiz:
         # Center the main card frame and make it responsive (70% of root size)
         self.main_frame.place(relx=0.5, rely=0.5, anchor=tk.CENTER, relwidth=0.7, relheight=0.7)
 
+        # Every screen is built once and stacked in the same grid cell of the card.
+        # Switching screens only raises the right frame instead of rebuilding widgets.
+        self.main_frame.grid_rowconfigure(0, weight=1)
+        self.main_frame.grid_columnconfigure(0, weight=1)
+        self.screens = {}                 # Screen name -> Frame
+        self.current_screen = None        # Name of the screen currently on top
+        self.transition_times = []        # Seconds spent switching to each new question
+
+        # Answer feedback is shown on the card instead of in a dialog, while the next question is prepared
+        self.feedback_job = None          # after() id of the pending switch to the next question
+        self.next_ready = False           # True once the session has moved on to the question shown next
+        self.feedback_latencies = []      # Seconds from an answer to its feedback being on screen
+        self.answer_latencies = []        # Seconds from the feedback ending (its timer or Enter) to the next question being on screen
+
+        self.buildInstructions()
+        self.buildMenu()
+        self.buildQuiz()
+        self.buildResults()
+        self.buildAnalytics()
+
         # Start the application with the instructions screen
         self.displayInstructions()
         
@@ -95,6 +154,10 @@ class MathQuiz:
 
     # Handles window resizing by reloading and scaling the background image to fit the new dimensions of the root window.
     def on_resize(self, event=None):
+        # <Configure> bound on the root also fires for every child widget, only the root's own events matter
+        if event is not None and event.widget is not self.master:
+            return
+
         image_filename = self.current_image_filename
         if not image_filename:
             return
@@ -105,10 +168,15 @@ class MathQuiz:
         # Prevent errors if the window is minimized or too small
         if new_width < 10 or new_height < 10:
             return
+
+        # Skip the rescale when the same image is already shown at this size
+        render_key = (image_filename, new_width, new_height)
+        if render_key == self.bg_rendered_key:
+            return
             
         try:
-            # Open the image using PIL
-            img_pil = Image.open(image_filename)
+            # Get the decoded image from the asset manager (from the asset pack, or decoded once from disk)
+            img_pil = self.assets.image(image_filename, (new_width, new_height))
             # Resize the image using high-quality anti-aliasing
             img_pil = img_pil.resize((new_width, new_height), Image.LANCZOS)
             
@@ -117,6 +185,7 @@ class MathQuiz:
 
             # Update the background label configuration
             self.bg_label.config(image=self.current_bg_image_tk)
+            self.bg_rendered_key = render_key
             
         # Fallback if the image file is not found, sets a solid background
         except FileNotFoundError:
@@ -126,13 +195,26 @@ class MathQuiz:
             # General error fallback
             self.bg_label.config(image=None, bg=BACKGROUND_COLOR)
 
-    # Displays the instructions before starting the quiz.
-    def displayInstructions(self):
-        self.set_background("Assessment 1 - Skills Portfolio/Exercise1/menu_bg.png")
-        self.clearFrame()
+    # Creates an empty screen frame stacked on top of the others inside the card.
+    def newScreen(self, name):
+        frame = tk.Frame(self.main_frame, bg=CARD_COLOR)
+        frame.grid(row=0, column=0, sticky='nsew')
+        self.screens[name] = frame
+        return frame
+
+    # Sets the background and raises the requested screen (widgets are never rebuilt).
+    def showScreen(self, name, image_filename):
+        self.set_background(image_filename)
+        if self.current_screen != name:
+            self.screens[name].tkraise()
+            self.current_screen = name
+
+    # Builds the instructions screen shown before starting the quiz.
+    def buildInstructions(self):
+        screen = self.newScreen('instructions')
 
         tk.Label(
-            self.main_frame,
+            screen,
             text="Quiz Rules",
             font=HEADING_FONT,
             fg=PRIMARY_COLOR,
@@ -156,7 +238,7 @@ class MathQuiz:
         # Create a label for each rule
         for rule in rules:
             tk.Label(
-                self.main_frame,
+                screen,
                 text=rule,
                 font=BODY_FONT,
                 fg=TEXT_COLOR,
@@ -167,7 +249,7 @@ class MathQuiz:
          
         # Button to move to the difficulty menu
         tk.Button(
-            self.main_frame,
+            screen,
             text="Start Quiz",
             command=self.displayMenu, 
             font=BUTTON_FONT,
@@ -177,94 +259,154 @@ class MathQuiz:
             bd=3
         ).pack(pady=20, fill='x')
 
-    # Returns the (minimum, maximum) range for number generation based on difficulty.
-    def randomInt(self, difficulty_level):
-        if difficulty_level == 'Easy': return (1, 9)              # Single digits
-        elif difficulty_level == 'Moderate': return (10, 99)      # Double digits
-        elif difficulty_level == 'Advanced': return (1000, 9999)  # Four digits
-        else: raise ValueError("Invalid difficulty level")
-
-    # Randomly selects an operation: addition or subtraction.
-    def decideOperation(self):
-        return random.choice(['+', '-'])
-
-    # Generates a new arithmetic problem based on the selected difficulty.
-    def generateProblem(self):
-        min_val, max_val = self.randomInt(self.difficulty_level)
-        num1 = random.randint(min_val, max_val)
-        num2 = random.randint(min_val, max_val)
-        # Ensure the first number is larger than the second for non-negative subtraction
-        operator = self.decideOperation()
-        answer = num1 + num2 if operator == '+' else num1 - num2
-        # Store the generated problem details
-        self.current_problem = {
-            'num1': num1, 'num2': num2, 'operator': operator, 'correct_answer': answer
-        }
-
-    # Checks if the user's input matches the correct answer.
-    def isCorrect(self, user_answer):
-        try:
-            # Convert and check the stripped input against the stored answer
-            return int(user_answer.strip()) == self.current_problem['correct_answer']
-        # Returns False if the input is not a valid integer
-        except ValueError:
-            return False
+    # Displays the instructions before starting the quiz.
+    def displayInstructions(self):
+        self.showScreen('instructions', MENU_BG)
 
     # Handles the user submitting answers, checks if it is correct or not, and updates the score.
     def submitAnswer(self):
+        # The entry keeps its binding while hidden, so ignore Enter on other screens
+        if self.current_screen != 'quiz':
+            return
+        # Enter while the feedback is showing skips straight to the next question
+        if self.feedback_job is not None:
+            self.showNextQuestion()
+            return
+        start = time.perf_counter()
         user_answer = self.answer_entry.get()
-        if self.isCorrect(user_answer):
-            correct_sound.play()      # Play correct sound
-            points = POINTS_FIRST_TRY if self.attempts == 1 else POINTS_SECOND_TRY
-            self.current_score += points
-            messagebox.showinfo("Feedback", f"Correct! You earned {points} points.")
-            self.nextQuestion()
-        else:
-            wrong_sound.play()        # Play wrong sound
-            self.attempts += 1
+        problem, attempt = self.session.current_problem, self.session.attempts
+        try:
+            outcome, points = self.session.submitAnswer(user_answer)
+        except (RuntimeError, OSError) as e:
+            self.serverLost(e)
+            return
+        if outcome == quiz_engine.CORRECT:
+            self.reviewAnswer(problem, attempt, True)
+            self.assets.play('correct')    # Play correct sound
+            self.showFeedback(f"Correct! You earned {points} points.", SECONDARY_COLOR, start, FEEDBACK_MS)
+        elif outcome == quiz_engine.RETRY:
+            self.assets.play('wrong')      # Play wrong sound
             # First incorrect attempt, give second chance
-            if self.attempts == 2:
-                messagebox.showerror("Feedback", "Incorrect. You get one more try for 5 points.")
-                self.feedback_label.config(text="Incorrect. Try again for 5 points.", fg='red')
+            retry_points = quiz_engine.pointsForAttempt(self.session.attempts)
+            self.feedback_label.config(text=f"Incorrect. Try again for {retry_points} points.", fg='red')
+            self.recordPaint(self.feedback_latencies, start)
+        else:
+            self.reviewAnswer(problem, attempt, False)
+            self.assets.play('wrong')      # Play wrong sound
             # Second incorrect attempt, show correct answer and move to next
-            elif self.attempts == 3:
-                correct_ans = self.current_problem['correct_answer']
-                messagebox.showerror("Feedback", f"Failed. The correct answer was {correct_ans}.")
-                self.nextQuestion()
-        
-         # Clear the entry box and refocus if attempts are available
-        if self.answer_entry.winfo_exists(): 
-            self.answer_entry.delete(0, tk.END)
-            if self.attempts < 3:
-                self.answer_entry.focus_set()
+            correct_ans = self.session.current_problem['correct_answer']
+            self.showFeedback(f"Failed. The correct answer was {correct_ans}.", 'red', start, FAILED_FEEDBACK_MS)
+
+         # Clear the entry box and refocus
+        self.answer_entry.delete(0, tk.END)
+        self.answer_entry.focus_set()
+
+    # Records the response time of a final answer and updates the review queue with it.
+    # Missed and slow problems come back in later quizzes until they are answered quickly.
+    def reviewAnswer(self, problem, attempt, correct):
+        record = self.recorder.finishQuestion(problem, attempt, correct)
+        if self.reviews is not None and not self.server:
+            latency_ms = telemetry.RECORD.unpack(record)[-1]
+            try:
+                self.reviews.record(self.session.difficulty_level, problem, correct, attempt, latency_ms)
+            except OSError:
+                pass    # The quiz goes on without review if the queue can't be saved
+
+    # Shows the result of a final answer on the quiz card for a while, then moves on.
+    # The next question is worked out straight after the feedback is drawn, so it's ready to show.
+    def showFeedback(self, text, color, start, duration_ms):
+        self.feedback_label.config(text=text, fg=color)
+        self.recordPaint(self.feedback_latencies, start)
+        self.master.after_idle(self.prepareNextQuestion)
+        self.feedback_job = self.master.after(duration_ms, self.showNextQuestion)
+
+    # Moves the session on to the next question without showing it yet
+    def prepareNextQuestion(self):
+        if self.feedback_job is not None and not self.next_ready:
+            try:
+                self.session.nextQuestion()
+            except (RuntimeError, OSError) as e:
+                self.serverLost(e)
+                return
+            self.next_ready = True
+
+    # Ends the feedback and shows the prepared question (or the results).
+    # The time to the next question is counted from here, not from the answer, so it doesn't
+    # include the time the feedback was on screen.
+    def showNextQuestion(self):
+        start = time.perf_counter()
+        self.cancelFeedback()
+        if self.current_screen != 'quiz':
+            return
+        if not self.next_ready:
+            try:
+                self.session.nextQuestion()
+            except (RuntimeError, OSError) as e:
+                self.serverLost(e)
+                return
+        self.next_ready = False
+        self.showQuestion(self.session.current_problem)
+        self.recordPaint(self.answer_latencies, start)
+
+    # Server mode: the quiz server can't be reached any more (or refused a request), so the quiz ends here
+    def serverLost(self, error):
+        self.endSession()
+        messagebox.showerror("Server", f"Lost the connection to the quiz server: {error}")
+        self.displayMenu()
+
+    # Leaves the quiz (or its results) for the difficulty menu
+    def quitQuiz(self):
+        self.endSession()
+        self.displayMenu()
+
+    # Stops the current quiz: drops a pending next question and, in server mode, closes the connection
+    def endSession(self):
+        self.cancelFeedback()
+        self.next_ready = False
+        if isinstance(self.session, RemoteQuizSession):
+            self.session.close()
+
+    # Drops a pending switch to the next question (the quiz was left or restarted)
+    def cancelFeedback(self):
+        if self.feedback_job is not None:
+            self.master.after_cancel(self.feedback_job)
+            self.feedback_job = None
+
+    # Adds the time from `start` until the window has been redrawn to a list of latencies.
+    # Idle callbacks run in order, so this one runs after the redraws already queued.
+    def recordPaint(self, latencies, start):
+        self.master.after_idle(lambda: latencies.append(time.perf_counter() - start))
 
     # Increments question count and either displays the next problem or the results.
     def nextQuestion(self):
-        self.question_count += 1
-        self.attempts = 1
-        if self.question_count > NUM_QUESTIONS:
+        try:
+            problem = self.session.nextQuestion()
+        except (RuntimeError, OSError) as e:
+            self.serverLost(e)
+            return
+        self.showQuestion(problem)
+
+    # Displays a problem the session has moved to, or the results when it is None (end of quiz)
+    def showQuestion(self, problem):
+        start = time.perf_counter()
+        if problem is None:
             self.displayResults()    # End of quiz
         else:
-            self.generateProblem()   # Generate and display new problem
-            self.displayProblem()
+            self.displayProblem()    # Display the newly generated problem
+            # Record how long the switch to the new question took
+            self.transition_times.append(time.perf_counter() - start)
 
-    # Removes all widgets from the main content frame.
-    def clearFrame(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-
-    # Displays the difficulty selection menu.
-    def displayMenu(self):
-        self.set_background("Assessment 1 - Skills Portfolio/Exercise1/menu_bg.png") 
-        self.clearFrame()
+    # Builds the difficulty selection menu.
+    def buildMenu(self):
+        screen = self.newScreen('menu')
 
         tk.Label(
-            self.main_frame, text="🔢 Math Quiz! 🧠", 
+            screen, text="🔢 Math Quiz! 🧠", 
             font=HEADING_FONT, bg=CARD_COLOR, fg=PRIMARY_COLOR, pady=15
         ).pack(fill='x')
 
         tk.Label(
-            self.main_frame, text="Select your difficulty level:", 
+            screen, text="Select your difficulty level:", 
             font=BODY_FONT, bg=CARD_COLOR, fg=TEXT_COLOR
         ).pack(pady=(10, 5))
 
@@ -279,111 +421,234 @@ class MathQuiz:
         for text, level in difficulties.items():
             # Uses lambda to pass the level argument to startQuiz when clicked
             tk.Button(
-                self.main_frame, text=text, command=lambda l=level: self.startQuiz(l),
+                screen, text=text, command=lambda l=level: self.startQuiz(l),
                 font=BUTTON_FONT, width=None, bg=ACCENT_COLOR, fg='white',
                 relief=tk.RAISED, bd=3
             ).pack(pady=8, fill='x')
 
+    # Displays the difficulty selection menu.
+    def displayMenu(self):
+        self.showScreen('menu', MENU_BG)
+
     # Initializes quiz and begins the first question.
     def startQuiz(self, level):
-        self.difficulty_level = level
-        self.question_count = 0
-        self.current_score = 0
-        self.attempts = 1
+        self.endSession()
+        if self.server:
+            # Thin client mode: the server generates problems, checks answers and keeps score
+            try:
+                self.session = RemoteQuizSession(level, *self.server)
+            except OSError as e:
+                messagebox.showerror("Server", f"Could not connect to the quiz server: {e}")
+                return
+        else:
+            # The whole quiz is generated up front so no question is repeated,
+            # with problems from the review queue that are due mixed in between
+            if self.reviews is None:
+                self.reviews = review_queue.ReviewQueue(review_queue.playerFile(REVIEW_DIR, self.player))
+            self.reviews.putBack()
+            problems = problem_bank.generateQuiz(level, non_negative=NON_NEGATIVE_SUBTRACTION)
+            self.session = quiz_engine.QuizSession(level, problems=problems,
+                                                   review=lambda: self.reviews.popDue(level))
+        self.recorder = telemetry.SessionRecorder(level)
         self.nextQuestion()
 
-    # Displays the current arithmetic problem and input fields.
-    def displayProblem(self):
-        self.set_background("Assessment 1 - Skills Portfolio/Exercise1/quiz_bg.png")
-        self.clearFrame()
-        p = self.current_problem  # Current problem dictionary
+    # Builds the quiz screen once, only its text is updated between questions.
+    def buildQuiz(self):
+        screen = self.newScreen('quiz')
 
         # Status frame to show question number and current score
-        status_frame = tk.Frame(self.main_frame, bg=BACKGROUND_COLOR, padx=10, pady=5)
+        status_frame = tk.Frame(screen, bg=BACKGROUND_COLOR, padx=10, pady=5)
         status_frame.pack(fill='x', pady=(0, 20))
         
-        tk.Label(status_frame, text=f"Question {self.question_count}/{NUM_QUESTIONS}",
-                 font=BODY_FONT, fg=TEXT_COLOR, bg=BACKGROUND_COLOR).pack(side=tk.LEFT)
-        tk.Label(status_frame, text=f"Score: {self.current_score}",
-                 font=BODY_FONT, fg=TEXT_COLOR, bg=BACKGROUND_COLOR).pack(side=tk.RIGHT)
+        self.question_count_label = tk.Label(status_frame, font=BODY_FONT, fg=TEXT_COLOR, bg=BACKGROUND_COLOR)
+        self.question_count_label.pack(side=tk.LEFT)
+        self.score_label = tk.Label(status_frame, font=BODY_FONT, fg=TEXT_COLOR, bg=BACKGROUND_COLOR)
+        self.score_label.pack(side=tk.RIGHT)
 
         # Display the math problem prominently
-        problem_text = f"❓ {p['num1']} {p['operator']} {p['num2']} = ?"
-        tk.Label(self.main_frame, text=problem_text, font=('Consolas', 24, 'bold'), 
-                 fg=PRIMARY_COLOR, bg=CARD_COLOR).pack(pady=20) 
+        self.problem_label = tk.Label(screen, font=('Consolas', 24, 'bold'), 
+                                      fg=PRIMARY_COLOR, bg=CARD_COLOR)
+        self.problem_label.pack(pady=20) 
         
         # Label to display feedback
-        self.feedback_label = tk.Label(self.main_frame, text="Type your answer below:", 
+        self.feedback_label = tk.Label(screen, text="Type your answer below:", 
                                        fg=TEXT_COLOR, font=BODY_FONT, bg=CARD_COLOR) 
         self.feedback_label.pack()
 
         # Entry widget for user input
-        self.answer_entry = tk.Entry(self.main_frame, font=('Arial', 20), width=10, 
+        self.answer_entry = tk.Entry(screen, font=('Arial', 20), width=10, 
                                      justify='center', bd=4, relief=tk.GROOVE)
         self.answer_entry.pack(pady=10, ipady=5)
         # Bind the Enter key to the submitAnswer function
         self.answer_entry.bind('<Return>', lambda event=None: self.submitAnswer())
-        self.answer_entry.focus_set()
 
         # Submit Button
-        tk.Button(self.main_frame, text="Submit", command=self.submitAnswer,
+        tk.Button(screen, text="Submit", command=self.submitAnswer,
                   font=BUTTON_FONT, bg=PRIMARY_COLOR, fg='white',
                   relief=tk.RAISED, bd=3, width=None).pack(pady=20, fill='x')
         
          # Quit Button to return to the difficulty menu
-        tk.Button(self.main_frame, text="Quit", command=self.displayMenu,
+        tk.Button(screen, text="Quit", command=self.quitQuiz,
           font=BUTTON_FONT, bg='#CC0000', fg='white',
           relief=tk.RAISED, bd=3, width=None).pack(side=tk.RIGHT, padx=5, fill='x', expand=True)
 
-    # Determines a letter grade/rank based on the final percentage score.
-    def rank(self, final_score):
-        if final_score >= 90: return "A+ (Excellent!) "
-        elif final_score >= 80: return "A (Great job!) "
-        elif final_score >= 70: return "B (Solid effort!) "
-        elif final_score >= 60: return "C (Keep practicing!) "
-        else: return "D (Time to study up!) "
+    # Displays the current arithmetic problem by updating the quiz screen's text.
+    def displayProblem(self):
+        self.showScreen('quiz', QUIZ_BG)
+        p = self.session.current_problem  # Current problem dictionary
 
-    # Displays the final score, percentage, and rank.
-    def displayResults(self):
-        self.set_background("Assessment 1 - Skills Portfolio/Exercise1/results_bg.png")
-        self.clearFrame()
+        review = " 🔁 Review" if getattr(self.session, 'is_review', False) else ""
+        self.question_count_label.config(text=f"Question {self.session.question_count}/{NUM_QUESTIONS}{review}")
+        self.score_label.config(text=f"Score: {self.session.current_score}")
+        self.problem_label.config(text=f"❓ {p['num1']} {p['operator']} {p['num2']} = ?")
+        self.feedback_label.config(text="Type your answer below:", fg=TEXT_COLOR)
 
-        possible_score = NUM_QUESTIONS * POINTS_FIRST_TRY
-        final_score_percentage = (self.current_score / possible_score) * 100
-        rank = self.rank(final_score_percentage)
-        
-        tk.Label(self.main_frame, text="🏆 QUIZ COMPLETE! 🏆", 
+        # Clear any previous answer and put the cursor back in the entry
+        self.answer_entry.delete(0, tk.END)
+        self.answer_entry.focus_set()
+        self.recorder.startQuestion()    # Response time is measured from here to the final answer
+
+    # Builds the results screen, its labels are filled in by displayResults.
+    def buildResults(self):
+        screen = self.newScreen('results')
+
+        tk.Label(screen, text="🏆 QUIZ COMPLETE! 🏆", 
                  font=HEADING_FONT, fg=SECONDARY_COLOR, bg=CARD_COLOR).pack(pady=10) 
 
-        tk.Label(self.main_frame, text=f"Final Score: {self.current_score} / {possible_score}", 
-                 font=('Arial', 14), bg=CARD_COLOR).pack(pady=5) 
-        tk.Label(self.main_frame, text=f"Percentage: {final_score_percentage:.1f}%", 
-                 font=('Arial', 14), bg=CARD_COLOR).pack(pady=5) 
+        self.final_score_label = tk.Label(screen, font=('Arial', 14), bg=CARD_COLOR)
+        self.final_score_label.pack(pady=5) 
+        self.percentage_label = tk.Label(screen, font=('Arial', 14), bg=CARD_COLOR)
+        self.percentage_label.pack(pady=5) 
 
-        tk.Label(self.main_frame, text=f"Your Rank: {rank}", 
-                 font=('Arial', 16, 'bold'), fg=ACCENT_COLOR, bg=CARD_COLOR).pack(pady=15) 
+        self.rank_label = tk.Label(screen, font=('Arial', 16, 'bold'), fg=ACCENT_COLOR, bg=CARD_COLOR)
+        self.rank_label.pack(pady=15) 
 
-        tk.Label(self.main_frame, text="What's next?", font=BODY_FONT, bg=CARD_COLOR).pack(pady=10) 
+        # Leaderboard panel with the best scores for the level just played
+        self.leaderboard_label = tk.Label(screen, font=('Consolas', 10), fg=TEXT_COLOR, bg=CARD_COLOR,
+                                          justify='center')
+        self.leaderboard_label.pack(pady=5)
 
         # Frame for placing "Play Again" and "Exit" 
-        button_frame = tk.Frame(self.main_frame, bg=CARD_COLOR) 
+        button_frame = tk.Frame(screen, bg=CARD_COLOR) 
         button_frame.pack(pady=10, fill='x')
 
         # Button to reset and return to the Menu
-        tk.Button(button_frame, text="Play Again", command=self.displayMenu,
+        tk.Button(button_frame, text="Play Again", command=self.quitQuiz,
                   font=BUTTON_FONT, bg=SECONDARY_COLOR, fg='white', width=None
         ).pack(side=tk.LEFT, padx=10, fill='x', expand=True)
 
+        # Button to view response-time analytics
+        tk.Button(button_frame, text="Stats", command=self.displayAnalytics,
+                  font=BUTTON_FONT, bg=PRIMARY_COLOR, fg='white', width=None
+        ).pack(side=tk.LEFT, padx=10, fill='x', expand=True)
+
         # Button to exit and close the application
-        tk.Button(button_frame, text="Exit", command=self.master.quit,
+        tk.Button(button_frame, text="Exit", command=self.close,
                   font=BUTTON_FONT, bg='#CC0000', fg='white', width=None
         ).pack(side=tk.RIGHT, padx=10, fill='x', expand=True)
 
+    # Closes the app, stopping any image decoding still running in the background
+    def close(self):
+        self.endSession()
+        self.assets.shutdown()
+        self.master.destroy()
+
+    # Displays the final score, percentage, and rank.
+    def displayResults(self):
+        self.showScreen('results', RESULTS_BG)
+
+        possible_score = quiz_engine.possibleScore()
+        final_score_percentage = self.session.percentage()
+        rank = self.session.rank()
+
+        self.final_score_label.config(text=f"Final Score: {self.session.current_score} / {possible_score}")
+        self.percentage_label.config(text=f"Percentage: {final_score_percentage:.1f}%")
+        self.rank_label.config(text=f"Your Rank: {rank}")
+
+        # Save this quiz's response times to the session log (the results still show if that fails)
+        try:
+            self.recorder.flush(SESSION_LOG)
+        except OSError as e:
+            print("Could not save response times.", e)
+
+        # Add the result to the leaderboard and show the top scores (reading them is O(k)).
+        # If the leaderboard can't be read or saved the results show without it.
+        level = self.session.difficulty_level
+        try:
+            if self.leaderboard is None:
+                self.leaderboard = Leaderboard(LEADERBOARD_LOG)
+            place = self.leaderboard.add(level, self.session.current_score)
+        except OSError as e:
+            print("Could not update the leaderboard.", e)
+            self.leaderboard_label.config(text="")
+            return
+        best = self.leaderboard.top(level)[:LEADERBOARD_SHOWN]
+        scores = "  ".join(f"{i}. {score}" for i, (score, _) in enumerate(best, start=1))
+        heading = f"🏅 New high score: #{place}!" if place else f"Top scores ({level})"
+        self.leaderboard_label.config(text=f"{heading}\n{scores}")
+
+    # Builds the analytics screen showing response times and error rates.
+    def buildAnalytics(self):
+        screen = self.newScreen('analytics')
+
+        tk.Label(screen, text="📊 Your Stats", 
+                 font=HEADING_FONT, fg=PRIMARY_COLOR, bg=CARD_COLOR).pack(pady=(0, 10))
+
+        # Fixed-width font so the table columns line up
+        self.analytics_label = tk.Label(screen, font=('Consolas', 9), fg=TEXT_COLOR, bg=CARD_COLOR,
+                                        justify='left', anchor='nw')
+        self.analytics_label.pack(fill='both', expand=True)
+
+        tk.Button(screen, text="Back", command=lambda: self.showScreen('results', RESULTS_BG),
+                  font=BUTTON_FONT, bg=SECONDARY_COLOR, fg='white', width=None
+        ).pack(pady=10, fill='x')
+
+    # Displays latency percentiles, error and retry rates per difficulty and operator.
+    def displayAnalytics(self):
+        # Only the part of the log written since the last update is read
+        # A log or stats file that can't be read or written doesn't stop the screen from showing
+        try:
+            if self.stats is None:
+                self.stats = telemetry.QuizStats(SESSION_LOG)
+            else:
+                self.stats.catchUp()
+            self.stats.save()
+        except OSError as e:
+            print("Could not update stats.", e)
+
+        lines = [f"{'Level':<9}{'Op':<3}{'Qs':>5}{'p50':>7}{'p90':>7}{'Err':>6}{'2nd':>6}"]
+        for level, op, count, p50, p90, errors, retries in (self.stats.summary() if self.stats else ()):
+            lines.append(f"{level:<9}{op:<3}{count:>5}{p50 / 1000:>6.1f}s{p90 / 1000:>6.1f}s"
+                         f"{errors:>6.0%}{retries:>6.0%}")
+        if len(lines) == 1:
+            lines.append("No answers recorded yet.")
+        # How quickly this window reacted to answers since it was opened
+        if self.feedback_latencies:
+            lines += ["", latencySummary("Feedback shown", self.feedback_latencies)]
+        if self.answer_latencies:
+            lines.append(latencySummary("Next question", self.answer_latencies))
+        self.analytics_label.config(text="\n".join(lines))
+        self.showScreen('analytics', RESULTS_BG)
+
 if __name__ == "__main__":
+    # --server HOST:PORT plays against a quiz_server.py instead of locally
+    # --player NAME picks the review queue of missed questions (default: the login name)
+    parser = argparse.ArgumentParser(description="Math Quiz")
+    parser.add_argument("--server", help="HOST:PORT of a running quiz server")
+    parser.add_argument("--player", help="Player name for the review queue")
+    args = parser.parse_args()
+    server = None
+    if args.server:
+        host, _, port = args.server.rpartition(":")
+        server = (host or "127.0.0.1", int(port))
+
      # Create the root Tkinter window
     root = tk.Tk()
-    root.iconbitmap("Assessment 1 - Skills Portfolio/Exercise1/icon.ico")
+    try:
+        root.iconbitmap(os.path.join(BASE_DIR, "icon.ico"))
+    except tk.TclError:
+        pass    # X11 can't show .ico icons
     # Instantiate the application class
-    app = MathQuiz(root)
+    app = MathQuiz(root, server, args.player)
     # Start the Tkinter event loop
     root.mainloop()
@@ -0,0 +1,95 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+# The shared asset pack reader (asset_pack.py, one folder up) is on the path when the app is
+# started through run.py. Started on its own, the app decodes its images from disk instead.
+try:
+    import asset_pack
+except ImportError:
+    asset_pack = None
+
+# Loads the quiz's sounds and background images without holding up the window.
+# - Audio: pygame is imported, the mixer initialised and the sounds decoded on a background
+#   thread. If there is no audio device (or no pygame) the quiz simply runs silently.
+# - Images: backgrounds come straight from the memory-mapped asset pack when one has been built
+#   (see asset_pack.py). Anything not in the pack is decoded in parallel on a small thread pool
+#   (PIL releases the GIL while decoding) and handed out once ready.
+# Sound effects play on one mixer channel reserved when the mixer starts, so playing one never
+# has to search for (or steal) a free channel, and a new effect cuts off the previous one.
+
+class AssetManager:
+    def __init__(self, music_file=None, sound_files=None, image_files=(), music_volume=0.3):
+        self.music_file = music_file
+        self.sound_files = dict(sound_files or {})    # Sound name -> file path
+        self.music_volume = music_volume
+        self.sounds = {}                              # Sound name -> pygame Sound, filled in by the audio thread
+        self.effects_channel = None                   # Reserved mixer channel for the sound effects
+        self.audio_ready = threading.Event()          # Set once audio has finished loading (or failed)
+        self.audio_ok = False                         # True if the mixer and sounds loaded
+        self.audio_ready_time = None                  # perf_counter() value when audio became ready
+        self.created_time = time.perf_counter()
+
+        # Start decoding the background images that aren't in the asset pack straight away
+        self.pack = asset_pack.openPack() if asset_pack else None
+        to_decode = [path for path in image_files if not (self.pack and path in self.pack)]
+        self.image_pool = ThreadPoolExecutor(max_workers=max(1, min(4, len(to_decode))))
+        self.images = {path: self.image_pool.submit(self._decodeImage, path) for path in to_decode}
+
+    # Opens and fully decodes one image file (runs on the pool)
+    @staticmethod
+    def _decodeImage(path):
+        img = Image.open(path)
+        img.load()
+        return img
+
+    # Returns the decoded PIL image for a path, waiting for it if it's still loading.
+    # With an asset pack this is the smallest pre-downscaled variant at least min_size big.
+    # Raises the loading error (e.g. FileNotFoundError) like Image.open would.
+    def image(self, path, min_size=(0, 0)):
+        if self.pack and path in self.pack:
+            return self.pack.image(path, min_size)
+        if path not in self.images:
+            self.images[path] = self.image_pool.submit(self._decodeImage, path)
+        return self.images[path].result()
+
+    # Starts loading audio on a background thread. on_ready(ok) is called from that thread when done.
+    def startAudio(self, on_ready=None):
+        thread = threading.Thread(target=self._loadAudio, args=(on_ready,), daemon=True)
+        thread.start()
+        return thread
+
+    # Initialises the mixer, starts the music and decodes the sound effects (runs on the audio thread)
+    def _loadAudio(self, on_ready):
+        try:
+            import pygame
+            pygame.mixer.init()
+            # Channel 0 is kept for the sound effects, pygame won't hand it to anything else
+            pygame.mixer.set_reserved(1)
+            self.effects_channel = pygame.mixer.Channel(0)
+            if self.music_file:
+                pygame.mixer.music.load(self.music_file)
+                pygame.mixer.music.set_volume(self.music_volume)
+                pygame.mixer.music.play(-1)  # -1 = loop forever
+            self.sounds = {name: pygame.mixer.Sound(path) for name, path in self.sound_files.items()}
+            self.audio_ok = True
+        except Exception as e:
+            # Missing pygame, no audio device or a missing file: carry on without sound
+            print(f"Audio unavailable, continuing without sound: {e}")
+            self.audio_ok = False
+        self.audio_ready_time = time.perf_counter()
+        self.audio_ready.set()
+        if callable(on_ready):
+            on_ready(self.audio_ok)
+
+    # Plays a sound effect by name if audio is ready, otherwise does nothing.
+    def play(self, name):
+        sound = self.sounds.get(name)
+        if sound is not None:
+            self.effects_channel.play(sound)
+
+    # Stops background work (used when the window closes).
+    def shutdown(self):
+        self.image_pool.shutdown(wait=False, cancel_futures=True)
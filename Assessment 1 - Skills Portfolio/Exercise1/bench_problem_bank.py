@@ -0,0 +1,44 @@
+import argparse
+import random
+import time
+
+import problem_bank
+import quiz_engine
+
+# Compares problems per second for the one-question-at-a-time path (quiz_engine.generateProblem)
+# with batched bank generation, for each difficulty level.
+#   python bench_problem_bank.py --sessions 100000
+
+# Per-question path: one generateProblem call per question, no deduplication
+def perQuestion(level, sessions, seed):
+    rng = random.Random(seed)
+    for _ in range(sessions * quiz_engine.NUM_QUESTIONS):
+        quiz_engine.generateProblem(level, rng)
+
+# Times a function call and returns problems per second
+def rate(func, problems):
+    start = time.perf_counter()
+    func()
+    return problems / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark problem bank generation.")
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    problems = args.sessions * quiz_engine.NUM_QUESTIONS
+    print(f"{problems:,} problems ({args.sessions:,} quizzes) per run, numpy available: {problem_bank.np is not None}")
+    print(f"{'Level':<10}{'per-question':>16}{'bank (python)':>16}{'bank (numpy)':>16}   problems/s")
+    for level in quiz_engine.DIFFICULTY_RANGES:
+        single = rate(lambda: perQuestion(level, args.sessions, args.seed), problems)
+        python_bank = rate(lambda: problem_bank.generateBank(level, args.sessions, seed=args.seed,
+                                                             non_negative=True, use_numpy=False), problems)
+        if problem_bank.np is not None:
+            numpy_bank = f"{rate(lambda: problem_bank.generateBank(level, args.sessions, seed=args.seed, non_negative=True), problems):>16,.0f}"
+        else:
+            numpy_bank = f"{'n/a':>16}"
+        print(f"{level:<10}{single:>16,.0f}{python_bank:>16,.0f}{numpy_bank}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import quiz_engine
+import review_queue
+
+# Review queue after years of play: answers a player gives over many quizzes go through record(),
+# then the queue is opened again the way the app opens it at the first quiz.
+# - records: records in the file, against every change ever made (what a never-compacted log would hold)
+# - open: replaying the file and building the heaps
+# - record / popDue: one queue update, one due problem taken off a heap
+#   python bench_review_queue.py --years 5 --quizzes-per-day 3
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the MathQuiz review queue.")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--quizzes-per-day", type=int, default=3)
+    parser.add_argument("--miss-rate", type=float, default=0.2, help="Share of answers missed or slow")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    clock = [0.0]
+    levels = review_queue.LEVELS
+    with tempfile.TemporaryDirectory() as work_dir:
+        queue = review_queue.ReviewQueue(os.path.join(work_dir, "bench.review"), clock=lambda: clock[0])
+        changes = answers = 0
+        record_time = 0.0
+        for day in range(args.years * 365):
+            for _ in range(args.quizzes_per_day):
+                level = rng.choice(levels)
+                low, high = quiz_engine.DIFFICULTY_RANGES[level]
+                for _ in range(10):
+                    clock[0] += 20
+                    problem = queue.popDue(level)
+                    reviewed = problem is not None
+                    if problem is None:
+                        problem = {'num1': rng.randint(low, high), 'num2': rng.randint(low, high),
+                                   'operator': rng.choice(review_queue.OPERATORS)}
+                    correct = rng.random() > args.miss_rate
+                    start = time.perf_counter()
+                    queue.record(level, problem, correct, 1, 100 if correct else 30000)
+                    record_time += time.perf_counter() - start
+                    changes += reviewed or not correct
+                    answers += 1
+            clock[0] = (day + 1) * 86400.0
+
+        start = time.perf_counter()
+        reopened = review_queue.ReviewQueue(queue.path, clock=lambda: clock[0])
+        open_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        taken = sum(reopened.popDue(level) is not None for level in levels for _ in range(10))
+        pop_us = (time.perf_counter() - start) * 1e6 / (len(levels) * 10)
+
+        print(f"{answers:,} answers over {args.years} years, {len(reopened):,} problems queued")
+        print(f"records in file   {reopened.records:>10,}   ({changes:,} changes made, {os.path.getsize(queue.path):,} bytes)")
+        print(f"open              {open_ms:>10.2f} ms")
+        print(f"record            {record_time * 1e6 / answers:>10.2f} us")
+        print(f"popDue            {pop_us:>10.2f} us   ({taken} due problems taken)")
+
+if __name__ == "__main__":
+    main()
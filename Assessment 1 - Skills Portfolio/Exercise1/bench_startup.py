@@ -0,0 +1,50 @@
+import importlib.util
+import os
+import time
+
+START = time.perf_counter()
+
+import tkinter as tk
+
+# Startup benchmark for the Math Quiz. Reports:
+# - import time: loading "01 - MathQuiz.py" and the modules it imports
+# - time to first paint: until the window has been drawn for the first time
+# - time to audio ready: until the mixer, music and sound effects have loaded (or failed)
+# Run from any folder: python "Assessment 1 - Skills Portfolio/Exercise1/bench_startup.py"
+
+QUIZ_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "01 - MathQuiz.py")
+
+def main():
+    import_start = time.perf_counter()
+    spec = importlib.util.spec_from_file_location("math_quiz", QUIZ_FILE)
+    quiz = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(quiz)
+    import_done = time.perf_counter()
+
+    root = tk.Tk()
+    painted = []
+
+    # <Map> on the root fires once the window is on screen, update_idletasks then finishes drawing it
+    def on_map(event):
+        if event.widget is root and not painted:
+            painted.append(time.perf_counter())
+    root.bind('<Map>', on_map, add='+')
+    app = quiz.MathQuiz(root)
+    while not painted:
+        root.update()
+    root.update_idletasks()
+    first_paint = time.perf_counter()
+
+    # Keep the event loop running until the audio thread reports in
+    while not app.assets.audio_ready.is_set():
+        root.update()
+        time.sleep(0.001)
+
+    print(f"Import time:          {(import_done - import_start) * 1000:8.1f} ms")
+    print(f"Time to first paint:  {(first_paint - START) * 1000:8.1f} ms")
+    print(f"Time to audio ready:  {(app.assets.audio_ready_time - START) * 1000:8.1f} ms"
+          f"  ({'audio on' if app.assets.audio_ok else 'no audio device'})")
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import importlib.util
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+# Measures how long it takes to move from one question to the next.
+# "rebuild" recreates every quiz widget per question (how the quiz used to work),
+# "persistent" uses the quiz screen that is built once and only has its text updated.
+# "answer" is input to next question: a correct answer is submitted, its feedback drawn on the
+# card and skipped with Enter straight away (the feedback time-box itself isn't counted).
+# The quiz's logs and review queue go to a temporary folder, so the real ones are never touched.
+# Run from any folder: python "Assessment 1 - Skills Portfolio/Exercise1/bench_transitions.py"
+
+QUIZ_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "01 - MathQuiz.py")
+ROUNDS = 200
+
+# Loads "01 - MathQuiz.py" as a module (its file name is not a valid import name)
+def load_quiz_module():
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")   # No sound card needed for timing
+    spec = importlib.util.spec_from_file_location("math_quiz", QUIZ_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# Old behaviour: destroy the card's contents and rebuild the whole question layout
+def rebuild_problem(quiz, app, frame):
+    for widget in frame.winfo_children():
+        widget.destroy()
+    p = app.session.current_problem
+    status_frame = tk.Frame(frame, bg=quiz.BACKGROUND_COLOR, padx=10, pady=5)
+    status_frame.pack(fill='x', pady=(0, 20))
+    tk.Label(status_frame, text=f"Question {app.session.question_count}/{quiz.NUM_QUESTIONS}",
+             font=quiz.BODY_FONT, bg=quiz.BACKGROUND_COLOR).pack(side=tk.LEFT)
+    tk.Label(status_frame, text=f"Score: {app.session.current_score}",
+             font=quiz.BODY_FONT, bg=quiz.BACKGROUND_COLOR).pack(side=tk.RIGHT)
+    tk.Label(frame, text=f"❓ {p['num1']} {p['operator']} {p['num2']} = ?",
+             font=('Consolas', 24, 'bold'), bg=quiz.CARD_COLOR).pack(pady=20)
+    tk.Label(frame, text="Type your answer below:", font=quiz.BODY_FONT, bg=quiz.CARD_COLOR).pack()
+    entry = tk.Entry(frame, font=('Arial', 20), width=10, justify='center', bd=4, relief=tk.GROOVE)
+    entry.pack(pady=10, ipady=5)
+    entry.focus_set()
+    tk.Button(frame, text="Submit", font=quiz.BUTTON_FONT).pack(pady=20, fill='x')
+    tk.Button(frame, text="Quit", font=quiz.BUTTON_FONT).pack(side=tk.RIGHT, padx=5, fill='x', expand=True)
+
+# Returns a one-line summary of a list of timings in milliseconds
+def summary(label, times):
+    ms = sorted(t * 1000 for t in times)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    return f"{label:<11} mean {statistics.mean(ms):7.3f} ms   median {statistics.median(ms):7.3f} ms   p95 {p95:7.3f} ms"
+
+def main():
+    quiz = load_quiz_module()
+    with tempfile.TemporaryDirectory(prefix="bench_transitions_") as work_dir:
+        quiz.SESSION_LOG = os.path.join(work_dir, "quiz_sessions.log")
+        quiz.LEADERBOARD_LOG = os.path.join(work_dir, "quiz_leaderboard.log")
+        quiz.REVIEW_DIR = os.path.join(work_dir, "review")
+        return run(quiz)
+
+def run(quiz):
+    root = tk.Tk()
+    app = quiz.MathQuiz(root)
+    root.update()
+    app.startQuiz('Moderate')
+    root.update()
+
+    # Before: destroy-and-rebuild on a scratch frame the size of the card
+    scratch = tk.Frame(app.main_frame, bg=quiz.CARD_COLOR)
+    scratch.grid(row=0, column=0, sticky='nsew')
+    rebuild_times = []
+    for _ in range(ROUNDS):
+        app.session.question_count = 0
+        start = time.perf_counter()
+        app.session.nextQuestion()
+        rebuild_problem(quiz, app, scratch)
+        root.update_idletasks()
+        rebuild_times.append(time.perf_counter() - start)
+    scratch.destroy()
+
+    # After: the persistent quiz screen, question count is reset so the quiz never ends
+    persistent_times = []
+    for _ in range(ROUNDS):
+        app.session.question_count = 0
+        start = time.perf_counter()
+        app.nextQuestion()
+        root.update_idletasks()
+        persistent_times.append(time.perf_counter() - start)
+
+    # Answering: feedback on the card, the next question prepared while it shows, then Enter
+    answer_times = []
+    for _ in range(ROUNDS):
+        app.session.question_count = 0
+        app.answer_entry.insert(0, str(app.session.current_problem['correct_answer']))
+        start = time.perf_counter()
+        app.submitAnswer()
+        root.update()
+        app.submitAnswer()
+        root.update_idletasks()
+        answer_times.append(time.perf_counter() - start)
+
+    root.destroy()
+    print(f"Per-question transition latency over {ROUNDS} questions")
+    print(summary("rebuild", rebuild_times))
+    print(summary("persistent", persistent_times))
+    print(summary("answer", answer_times))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import bisect
+import json
+import os
+import struct
+import time
+
+import quiz_engine
+
+# Persistent high scores per difficulty level.
+# - Every finished quiz is appended to a small binary log (one 11 byte record each).
+# - The best `k` results per level are kept in a sorted list, so reading a leaderboard is O(k)
+#   and never looks at the rest of the history.
+# - The top lists are saved next to the log with the log offset they include, so opening the
+#   leaderboard only reads results appended since the last save. They are only saved again when a
+#   result makes the top list, others are picked up from the log the next time it is opened.
+# - Once enough records have built up the log is compacted down to the current top entries,
+#   which keeps the file size bounded.
+
+# finished time, level, score
+RECORD = struct.Struct('<dBH')
+
+LEVELS = tuple(quiz_engine.DIFFICULTY_RANGES)
+
+class Leaderboard:
+    def __init__(self, log_file, k=10, compact_after=1000):
+        self.log_file = log_file
+        self.snapshot_file = log_file + ".top.json"
+        self.k = k
+        self.compact_after = compact_after        # Appended records allowed before compacting
+        self.offset = 0                           # Bytes of the log already included in self.tops
+        self.tops = {level: [] for level in LEVELS}   # level -> sorted [(-score, finished_time)]
+        self._loadSnapshot()
+        self._catchUp()
+
+    # Loads the saved top lists, if any
+    def _loadSnapshot(self):
+        try:
+            with open(self.snapshot_file, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if snapshot.get("k") != self.k:
+            return     # Saved with a different k, rebuild from the log instead
+        self.offset = snapshot["offset"]
+        for level, entries in snapshot["tops"].items():
+            if level in self.tops:
+                self.tops[level] = [tuple(e) for e in entries]
+
+    # Saves the top lists together with the log offset they cover
+    def _saveSnapshot(self):
+        tmp = self.snapshot_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"k": self.k, "offset": self.offset, "tops": self.tops}, f)
+        os.replace(tmp, self.snapshot_file)
+
+    # Reads results appended to the log since the snapshot was saved
+    def _catchUp(self):
+        try:
+            size = os.path.getsize(self.log_file)
+        except OSError:
+            return
+        if size < self.offset:
+            # The log was replaced behind our back, rebuild from scratch
+            self.offset, self.tops = 0, {level: [] for level in LEVELS}
+        if size == self.offset:
+            return
+        with open(self.log_file, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        usable = len(data) - len(data) % RECORD.size
+        for finished, level, score in RECORD.iter_unpack(data[:usable]):
+            self._insert(LEVELS[level], score, finished)
+        self.offset += usable
+        self._saveSnapshot()
+
+    # Puts a result into the level's top list if it is good enough. Returns its 1-based place or None.
+    def _insert(self, level, score, finished):
+        top = self.tops[level]
+        entry = (-score, finished)      # Higher scores first, earlier results win ties
+        if len(top) >= self.k and entry >= top[-1]:
+            return None
+        place = bisect.bisect_left(top, entry)
+        top.insert(place, entry)
+        del top[self.k:]
+        return place + 1
+
+    # Records a finished quiz. Returns the place it reached on the leaderboard, or None.
+    def add(self, level, score):
+        finished = time.time()
+        with open(self.log_file, "ab") as f:
+            f.write(RECORD.pack(finished, LEVELS.index(level), score))
+        self.offset += RECORD.size
+        place = self._insert(level, score, finished)
+        if self.offset >= self.compact_after * RECORD.size:
+            self.compact()
+        elif place is not None:
+            self._saveSnapshot()
+        return place
+
+    # Returns up to k (score, finished_time) pairs for a level, best first. O(k).
+    def top(self, level):
+        return [(-neg_score, finished) for neg_score, finished in self.tops[level]]
+
+    # Rewrites the log to hold only the current top entries, so it never grows without bound
+    def compact(self):
+        records = bytearray()
+        for level in LEVELS:
+            for neg_score, finished in self.tops[level]:
+                records += RECORD.pack(finished, LEVELS.index(level), -neg_score)
+        tmp = self.log_file + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(records)
+        os.replace(tmp, self.log_file)
+        self.offset = len(records)
+        self._saveSnapshot()
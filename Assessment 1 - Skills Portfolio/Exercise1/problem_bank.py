@@ -0,0 +1,120 @@
+import random
+
+import quiz_engine
+
+# Builds whole quizzes (or banks of quizzes for many sessions) in one batch per difficulty
+# instead of drawing random numbers one question at a time.
+# - The same seed always gives the same problems
+# - No question appears twice within one quiz
+# - Subtraction can optionally be kept non-negative by swapping the operands
+# numpy is used for large banks when it is installed, otherwise the standard library is used.
+# The two backends give different (but each reproducible) problems for the same seed.
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# A batch of quizzes stored as three flat columns (num1, num2, is_subtraction), one row per question.
+class ProblemBank:
+    def __init__(self, difficulty_level, num_questions, num1, num2, minus):
+        self.difficulty_level = difficulty_level
+        self.num_questions = num_questions
+        self.num1 = num1
+        self.num2 = num2
+        self.minus = minus
+
+    # Number of quizzes in the bank
+    def __len__(self):
+        return len(self.num1) // self.num_questions
+
+    # Returns quiz number `index` as a list of problem dictionaries like quiz_engine.generateProblem makes.
+    def quiz(self, index):
+        start = index * self.num_questions
+        problems = []
+        for row in range(start, start + self.num_questions):
+            num1, num2 = int(self.num1[row]), int(self.num2[row])
+            if self.minus[row]:
+                problems.append({'num1': num1, 'num2': num2, 'operator': '-', 'correct_answer': num1 - num2})
+            else:
+                problems.append({'num1': num1, 'num2': num2, 'operator': '+', 'correct_answer': num1 + num2})
+        return problems
+
+    # Total number of problems in the bank
+    def problemCount(self):
+        return len(self.num1)
+
+# Number of different problems a quiz can draw from at this difficulty.
+def problemSpace(difficulty_level, non_negative=False):
+    min_val, max_val = quiz_engine.randomInt(difficulty_level)
+    span = max_val - min_val + 1
+    additions = span * span
+    subtractions = span * (span + 1) // 2 if non_negative else span * span
+    return additions + subtractions
+
+# Standard library backend: each quiz is drawn with one random.sample call, which never repeats.
+# Draws are encoded as one integer (num1, num2, operator), normalised, and topped up if
+# non-negative swapping made two of them the same question.
+def _bankPython(difficulty_level, sessions, num_questions, seed, non_negative):
+    min_val, max_val = quiz_engine.randomInt(difficulty_level)
+    span = max_val - min_val + 1
+    space = 2 * span * span
+    rng = random.Random(seed)
+    num1_col, num2_col, minus_col = [], [], []
+    for _ in range(sessions):
+        seen = set()
+        while len(seen) < num_questions:
+            for code in rng.sample(range(space), num_questions - len(seen)):
+                minus, rest = divmod(code, span * span)
+                a, b = divmod(rest, span)
+                if non_negative and minus and a < b:
+                    a, b = b, a
+                key = (minus, a, b)
+                if key not in seen:
+                    seen.add(key)
+                    num1_col.append(a + min_val)
+                    num2_col.append(b + min_val)
+                    minus_col.append(minus)
+    return ProblemBank(difficulty_level, num_questions, num1_col, num2_col, minus_col)
+
+# numpy backend: every question of every quiz is drawn in one vectorised call,
+# then only the quizzes that ended up with a repeated question are redrawn.
+def _bankNumpy(difficulty_level, sessions, num_questions, seed, non_negative):
+    min_val, max_val = quiz_engine.randomInt(difficulty_level)
+    span = max_val - min_val + 1
+    rng = np.random.default_rng(seed)
+
+    def draw(rows):
+        a = rng.integers(0, span, size=(rows, num_questions))
+        b = rng.integers(0, span, size=(rows, num_questions))
+        minus = rng.integers(0, 2, size=(rows, num_questions), dtype=np.int8)
+        if non_negative:
+            swap = (minus == 1) & (a < b)
+            a, b = np.where(swap, b, a), np.where(swap, a, b)
+        return a, b, minus
+
+    def repeated(a, b, minus):
+        keys = np.sort((minus.astype(np.int64) * span + a) * span + b, axis=1)
+        return np.flatnonzero((keys[:, 1:] == keys[:, :-1]).any(axis=1))
+
+    a, b, minus = draw(sessions)
+    redo = repeated(a, b, minus)
+    while redo.size:
+        a[redo], b[redo], minus[redo] = draw(redo.size)
+        redo = redo[repeated(a[redo], b[redo], minus[redo])]
+    return ProblemBank(difficulty_level, num_questions,
+                       (a + min_val).ravel(), (b + min_val).ravel(), minus.ravel())
+
+# Generates `sessions` quizzes of `num_questions` problems each in one batch.
+def generateBank(difficulty_level, sessions, num_questions=quiz_engine.NUM_QUESTIONS,
+                 seed=None, non_negative=False, use_numpy=True):
+    if num_questions > problemSpace(difficulty_level, non_negative):
+        raise ValueError("Not enough different problems at this difficulty for a quiz that long")
+    if use_numpy and np is not None:
+        return _bankNumpy(difficulty_level, sessions, num_questions, seed, non_negative)
+    return _bankPython(difficulty_level, sessions, num_questions, seed, non_negative)
+
+# Generates a single quiz as a list of problem dictionaries.
+def generateQuiz(difficulty_level, num_questions=quiz_engine.NUM_QUESTIONS, seed=None, non_negative=False):
+    # One quiz is too small for numpy's setup cost to pay off
+    return generateBank(difficulty_level, 1, num_questions, seed, non_negative, use_numpy=False).quiz(0)
@@ -0,0 +1,199 @@
+import random
+
+# Headless quiz engine: problem generation, answer checking, scoring and ranking.
+# Nothing in here touches Tkinter or pygame, so the rules can be used by the GUI,
+# the session simulator and anything else that needs to play a quiz without a window.
+
+# Global Quiz Parameters
+POINTS_FIRST_TRY = 10
+POINTS_SECOND_TRY = 5
+NUM_QUESTIONS = 10
+
+# Points awarded for a correct answer on each attempt, the length is the number of attempts allowed
+POINT_TABLE = (POINTS_FIRST_TRY, POINTS_SECOND_TRY)
+
+# (minimum, maximum) operand values for each difficulty level
+DIFFICULTY_RANGES = {
+    'Easy': (1, 9),              # Single digits
+    'Moderate': (10, 99),        # Double digits
+    'Advanced': (1000, 9999),    # Four digits
+}
+
+# At most every this many questions is a review of an earlier miss (when a review queue is given)
+REVIEW_EVERY = 2
+# Fresh problems drawn at most to find one that isn't a repeat of a review problem in the same quiz
+MAX_REDRAWS = 50
+
+# Lowest percentage needed for each rank, checked from the top down
+RANK_THRESHOLDS = (
+    (90, "A+ (Excellent!) "),
+    (80, "A (Great job!) "),
+    (70, "B (Solid effort!) "),
+    (60, "C (Keep practicing!) "),
+)
+LOWEST_RANK = "D (Time to study up!) "
+
+# Possible outcomes of submitting an answer
+CORRECT = 'correct'    # Right answer, points awarded, move on
+RETRY = 'retry'        # Wrong answer, another attempt is allowed
+FAILED = 'failed'      # Wrong answer on the last attempt, move on with 0 points
+
+# Returns the (minimum, maximum) range for number generation based on difficulty.
+def randomInt(difficulty_level):
+    try:
+        return DIFFICULTY_RANGES[difficulty_level]
+    except KeyError:
+        raise ValueError("Invalid difficulty level")
+
+# Randomly selects an operation: addition or subtraction.
+def decideOperation(rng=random):
+    return '+' if rng.random() < 0.5 else '-'
+
+# Generates a new arithmetic problem dictionary {num1, num2, operator, correct_answer}.
+# With non_negative the larger number goes first in subtractions so answers are never negative.
+def generateProblem(difficulty_level, rng=random, non_negative=False):
+    min_val, max_val = randomInt(difficulty_level)
+    num1 = rng.randint(min_val, max_val)
+    num2 = rng.randint(min_val, max_val)
+    operator = decideOperation(rng)
+    if non_negative and operator == '-' and num1 < num2:
+        num1, num2 = num2, num1
+    answer = num1 + num2 if operator == '+' else num1 - num2
+    return {'num1': num1, 'num2': num2, 'operator': operator, 'correct_answer': answer}
+
+# Identifies a problem, so the same numbers and operator compare equal wherever the problem came from
+def problemKey(problem):
+    return (problem['num1'], problem['operator'], problem['num2'])
+
+# Checks if the user's input matches the problem's correct answer.
+def isCorrect(problem, user_answer):
+    try:
+        # Convert and check the stripped input against the stored answer
+        return int(str(user_answer).strip()) == problem['correct_answer']
+    # Returns False if the input is not a valid integer
+    except ValueError:
+        return False
+
+# Returns the points for a correct answer on the given attempt (1-based), 0 if out of attempts.
+def pointsForAttempt(attempt, points=POINT_TABLE):
+    if 1 <= attempt <= len(points):
+        return points[attempt - 1]
+    return 0
+
+# Highest possible score for a quiz played with the given rules.
+def possibleScore(num_questions=NUM_QUESTIONS, points=POINT_TABLE):
+    return num_questions * max(points)
+
+# Determines a letter grade/rank based on the final percentage score.
+def rank(final_score, thresholds=RANK_THRESHOLDS):
+    for minimum, name in thresholds:
+        if final_score >= minimum:
+            return name
+    return LOWEST_RANK
+
+# State of one quiz play: question count, score and attempts on the current problem.
+# `problems` can be a pre-generated quiz (see problem_bank), otherwise problems are drawn one at a time.
+# `review()` can return a problem due for another go (see review_queue), or None. It is asked on every
+# REVIEW_EVERY-th question and its problems take the place of fresh ones. No problem is asked twice in
+# one quiz: a review problem already asked is skipped, and so is a fresh one that was already a review.
+# `thresholds` are the rank thresholds (see RANK_THRESHOLDS).
+class QuizSession:
+    def __init__(self, difficulty_level, rng=None, num_questions=NUM_QUESTIONS, points=POINT_TABLE, problems=None,
+                 review=None, thresholds=RANK_THRESHOLDS):
+        randomInt(difficulty_level)        # Fail early on an unknown level
+        self.difficulty_level = difficulty_level
+        self.rng = rng or random.Random()
+        self.num_questions = num_questions
+        self.points = points
+        self.thresholds = thresholds
+        self.problems = list(problems) if problems is not None else None
+        self.question_count = 0            # Current question number (1 to num_questions)
+        self.current_score = 0             # Total points collected
+        self.current_problem = None        # Problem dictionary for the current question
+        self.attempts = 1                  # Attempt number on the current question
+        self.review = review
+        self.fresh_count = 0               # Fresh (not review) problems asked so far
+        self.fresh_index = 0               # Next pre-generated problem to use
+        self.asked = set()                 # problemKey() of every problem asked so far
+        self.is_review = False             # True if the current problem came from review()
+        self.answered = False              # True once the current problem is finished (correct or failed)
+
+    # True once every question has been asked and answered.
+    @property
+    def finished(self):
+        return self.question_count > self.num_questions
+
+    # Moves to the next question. Returns the new problem, or None when the quiz is over.
+    def nextQuestion(self):
+        self.question_count += 1
+        self.attempts = 1
+        self.is_review = False
+        self.answered = False
+        if self.finished:
+            self.current_problem = None
+            return None
+        if self.review is not None and self.question_count % REVIEW_EVERY == 0:
+            problem = self.review()
+            if problem is not None and problemKey(problem) not in self.asked:
+                self.is_review = True
+                return self._ask(problem)
+        self.fresh_count += 1
+        return self._ask(self._freshProblem())
+
+    # The next pre-generated (or newly drawn) problem. Only review problems can repeat a fresh one
+    # (a pre-generated quiz has no repeats), so without review() every problem is taken as it comes.
+    def _freshProblem(self):
+        for _ in range(MAX_REDRAWS):
+            if self.problems is not None and self.fresh_index < len(self.problems):
+                problem = self.problems[self.fresh_index]
+                self.fresh_index += 1
+            else:
+                problem = generateProblem(self.difficulty_level, self.rng)
+            if self.review is None or problemKey(problem) not in self.asked:
+                break
+        return problem
+
+    def _ask(self, problem):
+        self.asked.add(problemKey(problem))
+        self.current_problem = problem
+        return problem
+
+    # Checks an answer and updates the score.
+    # Returns (outcome, points) where outcome is CORRECT, RETRY or FAILED.
+    # Once a problem is finished (CORRECT or FAILED) no more answers count until nextQuestion().
+    def submitAnswer(self, user_answer):
+        if self.current_problem is None or self.answered:
+            raise ValueError("No question to answer")
+        if isCorrect(self.current_problem, user_answer):
+            points = pointsForAttempt(self.attempts, self.points)
+            self.current_score += points
+            self.answered = True
+            return CORRECT, points
+        self.attempts += 1
+        if self.attempts > len(self.points):
+            self.answered = True
+            return FAILED, 0
+        return RETRY, 0
+
+    # Final score as a percentage of the best possible score.
+    def percentage(self):
+        return (self.current_score / possibleScore(self.num_questions, self.points)) * 100
+
+    # Rank for the current percentage.
+    def rank(self):
+        return rank(self.percentage(), self.thresholds)
+
+# Plays one whole quiz through a QuizSession without a window and returns the finished session.
+# answer_model(problem, attempt, rng) returns True when the simulated player answers correctly.
+# Used by the simulator, so a change to the rules in QuizSession shows up in its results.
+def playSession(difficulty_level, answer_model, rng, num_questions=NUM_QUESTIONS, points=POINT_TABLE,
+                thresholds=RANK_THRESHOLDS):
+    session = QuizSession(difficulty_level, rng, num_questions, points, thresholds=thresholds)
+    while session.nextQuestion() is not None:
+        problem = session.current_problem
+        outcome = RETRY
+        while outcome == RETRY:
+            correct = answer_model(problem, session.attempts, rng)
+            answer = problem['correct_answer'] if correct else problem['correct_answer'] + 1
+            outcome, _ = session.submitAnswer(answer)
+    return session
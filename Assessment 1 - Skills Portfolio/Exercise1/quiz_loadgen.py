@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import quiz_engine
+from quiz_server import DEFAULT_HOST, DEFAULT_PORT, QuizServer
+
+# Load generator for quiz_server.py. Opens many concurrent stand-in clients that each play
+# whole quizzes, answering correctly with a set probability, and reports completed sessions
+# per second and answer round-trip latency percentiles.
+#   python quiz_loadgen.py --clients 1000 --sessions 2
+# Without --port a server is started inside this process on a free port.
+
+# One stand-in client: plays `sessions` quizzes back to back on one connection
+async def client(host, port, level, sessions, accuracy, seed, latencies):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def call(request):
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    try:
+        for _ in range(sessions):
+            await call({"op": "start", "level": level})
+            while True:
+                reply = await call({"op": "next"})
+                if reply.get("finished"):
+                    break
+                p = reply["problem"]
+                right = p["num1"] + p["num2"] if p["operator"] == '+' else p["num1"] - p["num2"]
+                while True:
+                    answer = right if rng.random() < accuracy else right + 1
+                    start = time.perf_counter()
+                    result = await call({"op": "answer", "answer": str(answer)})
+                    latencies.append(time.perf_counter() - start)
+                    if result["outcome"] != quiz_engine.RETRY:
+                        break
+    finally:
+        writer.close()
+
+# Returns the pct percentile of a sorted list
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+async def main(args):
+    server = listener = None
+    host, port = args.host, args.port
+    if port is None:
+        server = QuizServer()
+        listener = await server.start(host, 0)
+        port = listener.sockets[0].getsockname()[1]
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, args.level, args.sessions, args.accuracy, args.seed + i, latencies)
+        for i in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+
+    if listener:
+        listener.close()
+        await listener.wait_closed()
+
+    total = args.clients * args.sessions
+    ms = sorted(t * 1000 for t in latencies)
+    print(f"Clients: {args.clients:,}   Sessions: {total:,}   Answers: {len(ms):,}   Time: {elapsed:.2f}s")
+    print(f"Sessions/s: {total / elapsed:,.0f}   Answers/s: {len(ms) / elapsed:,.0f}")
+    print(f"Answer latency  p50 {percentile(ms, 50):.2f} ms   p95 {percentile(ms, 95):.2f} ms   "
+          f"p99 {percentile(ms, 99):.2f} ms   max {ms[-1]:.2f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Math Quiz server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=None, help=f"Server port (e.g. {DEFAULT_PORT}), omit to run one in-process")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--sessions", type=int, default=1, help="Quizzes played by each client")
+    parser.add_argument("--level", choices=list(quiz_engine.DIFFICULTY_RANGES), default='Moderate')
+    parser.add_argument("--accuracy", type=float, default=0.8, help="Chance each answer is right")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
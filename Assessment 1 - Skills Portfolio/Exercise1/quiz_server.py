@@ -0,0 +1,200 @@
+import argparse
+import asyncio
+import itertools
+import json
+import socket
+
+import problem_bank
+import quiz_engine
+
+# Multi-client Math Quiz server. One server is the authority for many students answering at
+# once: problems, answer checking, the 10/5 two-attempt scoring and ranks all come from
+# quiz_engine, so a networked quiz plays by exactly the same rules as the local one.
+#
+# Protocol: one JSON object per line over TCP, one quiz session per connection.
+#   {"op": "start", "level": "Easy"}    -> {"ok": true, "session": 7}
+#   {"op": "next"}                      -> {"ok": true, "question": 1, "problem": {"num1": 3, "num2": 4, "operator": "+"}}
+#                                          or {"ok": true, "finished": true, "score": 85, "percentage": 85.0, "rank": "A ..."}
+#   {"op": "answer", "answer": "7"}     -> {"ok": true, "outcome": "correct", "points": 10, "score": 10, "attempts": 1}
+#                                          (a "failed" outcome also carries "correct_answer";
+#                                          after "correct" or "failed" no answer counts until "next")
+# Errors come back as {"ok": false, "error": "..."}.
+#   python quiz_server.py --port 8765
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+class QuizServer:
+    def __init__(self, non_negative=False):
+        self.non_negative = non_negative
+        self.session_ids = itertools.count(1)
+        self.active = 0            # Connected clients
+        self.completed = 0         # Quizzes played to the end
+
+    # Handles one request for a connection's session and returns (reply, session)
+    def handleRequest(self, request, session):
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Request must be a JSON object"}, session
+        op = request.get("op")
+        if op == "start":
+            level = request.get("level")
+            if not isinstance(level, str) or level not in quiz_engine.DIFFICULTY_RANGES:
+                return {"ok": False, "error": "Invalid difficulty level"}, session
+            problems = problem_bank.generateQuiz(level, non_negative=self.non_negative)
+            session = quiz_engine.QuizSession(level, problems=problems)
+            session.id = next(self.session_ids)
+            return {"ok": True, "session": session.id}, session
+
+        if session is None:
+            return {"ok": False, "error": "No quiz started"}, session
+
+        if op == "next":
+            if session.finished:
+                return {"ok": False, "error": "Quiz already finished"}, session
+            problem = session.nextQuestion()
+            if problem is None:
+                self.completed += 1
+                return {"ok": True, "finished": True, "score": session.current_score,
+                        "percentage": session.percentage(), "rank": session.rank()}, session
+            # Never send the answer with the question
+            return {"ok": True, "question": session.question_count,
+                    "problem": {k: problem[k] for k in ("num1", "num2", "operator")}}, session
+
+        if op == "answer":
+            # A finished question takes no more answers, so it can't be scored twice
+            if session.current_problem is None or session.answered:
+                return {"ok": False, "error": "No question to answer"}, session
+            attempt = session.attempts
+            outcome, points = session.submitAnswer(str(request.get("answer", "")))
+            reply = {"ok": True, "outcome": outcome, "points": points,
+                     "score": session.current_score, "attempts": attempt}
+            if outcome == quiz_engine.FAILED:
+                reply["correct_answer"] = session.current_problem["correct_answer"]
+            return reply, session
+
+        return {"ok": False, "error": f"Unknown op: {op}"}, session
+
+    # Serves one client connection until it disconnects
+    async def handleClient(self, reader, writer):
+        self.active += 1
+        session = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    reply = {"ok": False, "error": "Bad JSON"}
+                else:
+                    try:
+                        reply, session = self.handleRequest(request, session)
+                    except Exception as e:
+                        # A request the checks above didn't expect: answer it, keep the connection
+                        print(f"Error handling {request!r}: {e!r}")
+                        reply = {"ok": False, "error": "Server error"}
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.active -= 1
+            writer.close()
+
+    # Starts listening and returns the asyncio server
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handleClient, host, port, backlog=4096)
+
+# Blocking client used by the Tk app's thin client mode.
+# It has the same attributes and methods MathQuiz uses on a local QuizSession,
+# so the GUI doesn't need to know whether the quiz runs locally or on a server.
+class RemoteQuizSession:
+    def __init__(self, difficulty_level, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=5):
+        self.difficulty_level = difficulty_level
+        self.points = quiz_engine.POINT_TABLE
+        self.num_questions = quiz_engine.NUM_QUESTIONS
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.file = self.sock.makefile("rwb")
+        self.question_count = 0
+        self.current_score = 0
+        self.current_problem = None
+        self.attempts = 1
+        self.result = None         # Final score details from the server
+        self._call({"op": "start", "level": difficulty_level})
+
+    # Sends one request and waits for the reply. Raises OSError if the connection fails and
+    # RuntimeError if the server refuses the request.
+    def _call(self, request):
+        self.file.write(json.dumps(request).encode() + b"\n")
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("The quiz server closed the connection")
+        try:
+            reply = json.loads(line)
+        except ValueError:
+            raise RuntimeError("Unreadable reply from the quiz server")
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error", "Server error"))
+        return reply
+
+    @property
+    def finished(self):
+        return self.result is not None
+
+    # Moves to the next question. Returns the new problem, or None when the quiz is over.
+    def nextQuestion(self):
+        reply = self._call({"op": "next"})
+        self.attempts = 1
+        if reply.get("finished"):
+            self.result = reply
+            self.question_count = self.num_questions + 1
+            self.current_problem = None
+            self.close()
+        else:
+            self.question_count = reply["question"]
+            self.current_problem = reply["problem"]
+        return self.current_problem
+
+    # Sends an answer to the server. Returns (outcome, points) like QuizSession.submitAnswer.
+    def submitAnswer(self, user_answer):
+        reply = self._call({"op": "answer", "answer": str(user_answer)})
+        self.current_score = reply["score"]
+        self.attempts = reply["attempts"] + (0 if reply["outcome"] == quiz_engine.CORRECT else 1)
+        if "correct_answer" in reply:
+            self.current_problem["correct_answer"] = reply["correct_answer"]
+        return reply["outcome"], reply["points"]
+
+    def percentage(self):
+        if self.result:
+            return self.result["percentage"]
+        return self.current_score / quiz_engine.possibleScore(self.num_questions, self.points) * 100
+
+    def rank(self):
+        return self.result["rank"] if self.result else quiz_engine.rank(self.percentage())
+
+    def close(self):
+        try:
+            self.file.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+async def main(host, port, non_negative):
+    server = QuizServer(non_negative)
+    listener = await server.start(host, port)
+    print(f"Math Quiz server listening on {host}:{port}")
+    async with listener:
+        await listener.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host Math Quiz sessions for many clients.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--non-negative", action="store_true", help="Keep subtraction answers non-negative")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.host, args.port, args.non_negative))
+    except KeyboardInterrupt:
+        pass
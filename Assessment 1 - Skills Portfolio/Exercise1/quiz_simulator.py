@@ -0,0 +1,122 @@
+import argparse
+import math
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+import quiz_engine
+
+# Plays large numbers of seeded quiz sessions with simulated players and reports
+# how scores and ranks are distributed. Used to try out scoring-rule changes offline.
+# Every session is played through quiz_engine.QuizSession, the same rules the app uses.
+#   python quiz_simulator.py --sessions 1000000 --level Moderate --model fixed --p-first 0.7
+#   python quiz_simulator.py --points 10 6 3 --thresholds 85 75 65 50
+# Results only depend on --seed and --chunk, not on the number of worker processes.
+
+# Simulated player that is right with a fixed probability on the first and later attempts.
+def fixedAccuracy(p_first=0.8, p_second=0.6):
+    def model(problem, attempt, rng):
+        return rng.random() < (p_first if attempt == 1 else p_second)
+    return model
+
+# Simulated player that gets less accurate as numbers get longer and on subtraction.
+# Each extra digit in the larger operand and a subtraction costs digit_penalty / sub_penalty.
+def digitAccuracy(p_first=0.95, p_second=0.7, digit_penalty=0.05, sub_penalty=0.05):
+    def model(problem, attempt, rng):
+        p = p_first if attempt == 1 else p_second
+        p -= digit_penalty * (len(str(max(problem['num1'], problem['num2']))) - 1)
+        if problem['operator'] == '-':
+            p -= sub_penalty
+        return rng.random() < p
+    return model
+
+# Answer models selectable from the command line
+ANSWER_MODELS = {
+    'fixed': fixedAccuracy,
+    'digits': digitAccuracy,
+}
+
+# Plays one chunk of sessions and returns (score counts, rank counts).
+# Each chunk has its own seed so results are the same however chunks are spread over workers.
+def simulateChunk(job):
+    seed, sessions, level, model_name, model_args, num_questions, points, thresholds = job
+    rng = random.Random(seed)
+    model = ANSWER_MODELS[model_name](**model_args)
+    scores, ranks = Counter(), Counter()
+    for _ in range(sessions):
+        session = quiz_engine.playSession(level, model, rng, num_questions, points, thresholds)
+        scores[session.current_score] += 1
+        ranks[session.rank().split()[0]] += 1
+    return scores, ranks
+
+# Splits the sessions into seeded chunks, runs them (optionally in parallel) and merges the counts.
+def simulate(sessions, level='Moderate', model_name='fixed', model_args=None, seed=0,
+             workers=1, chunk=10000, num_questions=quiz_engine.NUM_QUESTIONS, points=quiz_engine.POINT_TABLE,
+             thresholds=quiz_engine.RANK_THRESHOLDS):
+    model_args = model_args or {}
+    jobs = []
+    for i in range(math.ceil(sessions / chunk)):
+        size = min(chunk, sessions - i * chunk)
+        jobs.append((seed * 1_000_003 + i, size, level, model_name, model_args, num_questions, points, thresholds))
+
+    scores, ranks = Counter(), Counter()
+    if workers > 1:
+        with Pool(workers) as pool:
+            results = pool.imap_unordered(simulateChunk, jobs)
+            for chunk_scores, chunk_ranks in results:
+                scores.update(chunk_scores)
+                ranks.update(chunk_ranks)
+    else:
+        for job in jobs:
+            chunk_scores, chunk_ranks = simulateChunk(job)
+            scores.update(chunk_scores)
+            ranks.update(chunk_ranks)
+    return scores, ranks
+
+# Prints the score histogram, summary statistics and rank distribution.
+def report(scores, ranks, elapsed):
+    total = sum(scores.values())
+    mean = sum(s * c for s, c in scores.items()) / total
+    variance = sum(c * (s - mean) ** 2 for s, c in scores.items()) / total
+    print(f"Sessions: {total:,}   Time: {elapsed:.2f}s   Sessions/s: {total / elapsed:,.0f}")
+    print(f"Mean score: {mean:.2f}   Std dev: {math.sqrt(variance):.2f}")
+    print("\nScore distribution")
+    widest = max(scores.values())
+    for score in sorted(scores):
+        share = scores[score] / total
+        bar = "#" * max(1, round(40 * scores[score] / widest))
+        print(f"{score:>4} {share:7.2%} {bar}")
+    print("\nRank distribution")
+    for name in [n.split()[0] for _, n in quiz_engine.RANK_THRESHOLDS] + [quiz_engine.LOWEST_RANK.split()[0]]:
+        print(f"{name:>3} {ranks[name] / total:7.2%}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many Math Quiz sessions offline.")
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--level", choices=list(quiz_engine.DIFFICULTY_RANGES), default='Moderate')
+    parser.add_argument("--model", choices=list(ANSWER_MODELS), default='fixed')
+    parser.add_argument("--p-first", type=float, default=0.8, help="Chance of a correct first attempt")
+    parser.add_argument("--p-second", type=float, default=0.6, help="Chance of a correct later attempt")
+    parser.add_argument("--points", type=int, nargs='+', default=list(quiz_engine.POINT_TABLE),
+                        help="Points per attempt, e.g. 10 5 (the count sets the attempts allowed)")
+    parser.add_argument("--questions", type=int, default=quiz_engine.NUM_QUESTIONS)
+    parser.add_argument("--thresholds", type=float, nargs=len(quiz_engine.RANK_THRESHOLDS),
+                        default=[minimum for minimum, _ in quiz_engine.RANK_THRESHOLDS],
+                        help="Lowest percentage for each rank from A+ down, e.g. 90 80 70 60")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk", type=int, default=10000, help="Sessions per seeded chunk")
+    args = parser.parse_args()
+    if sorted(args.thresholds, reverse=True) != args.thresholds:
+        parser.error("--thresholds must go from the highest rank down")
+    thresholds = tuple(zip(args.thresholds, (name for _, name in quiz_engine.RANK_THRESHOLDS)))
+
+    start = time.perf_counter()
+    scores, ranks = simulate(args.sessions, args.level, args.model,
+                             {'p_first': args.p_first, 'p_second': args.p_second},
+                             args.seed, args.workers, args.chunk, args.questions, tuple(args.points), thresholds)
+    report(scores, ranks, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import heapq
+import os
+import re
+import struct
+import time
+
+import quiz_engine
+
+# Per-player review queue of problems that were missed or answered slowly.
+# - Every problem in the queue has a due time and a difficulty. They sit in one heap per level,
+#   ordered by due time and then hardest first, so taking the next due problem is O(log n).
+# - Failing a problem puts it back at the first step of REVIEW_INTERVALS. A slow answer or one that
+#   needed a second try queues it at the second step. Each quick right answer moves a queued
+#   problem one step further out, and it leaves the queue after the last step.
+# - Every change is appended to the player's file as one 17 byte record, so nothing is ever
+#   rewritten while playing. Opening the queue replays the file. Once the superseded records
+#   outnumber the live ones the file is compacted to one record per queued problem, so it stays
+#   small (and opening it fast) however many years of quizzes are behind it.
+
+# kind, level, operator, num1, num2, due time, step, difficulty
+RECORD = struct.Struct('<BBBHHdBB')
+QUEUED, REMOVED = 1, 2
+
+LEVELS = tuple(quiz_engine.DIFFICULTY_RANGES)
+OPERATORS = ('+', '-')
+
+# Seconds until a queued problem is due again, for each step
+REVIEW_INTERVALS = (60, 10 * 60, 24 * 3600, 3 * 24 * 3600, 7 * 24 * 3600)
+# An answer slower than this (milliseconds) counts as slow
+SLOW_MS = {'Easy': 6000, 'Moderate': 12000, 'Advanced': 25000}
+COMPACT_MIN = 256           # Records allowed in the file before compacting is considered
+
+# File holding one player's queue
+def playerFile(directory, player):
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "_", player.strip()).strip("_") or "player"
+    return os.path.join(directory, f"{slug}.review")
+
+class ReviewQueue:
+    def __init__(self, path, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.entries = {}                               # (level, op, num1, num2) -> [due, step, difficulty, version]
+        self.heaps = {level: [] for level in LEVELS}    # level -> [(due, -difficulty, version, key)]
+        self.records = 0                                # Records in the file
+        self.taken = set()                              # Keys handed out by popDue() and not yet recorded
+        self.version = 0
+        self._load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        usable = len(data) - len(data) % RECORD.size    # Ignore a half-written record at the end
+        for kind, level, op, num1, num2, due, step, difficulty in RECORD.iter_unpack(memoryview(data)[:usable]):
+            key = (LEVELS[level], OPERATORS[op], num1, num2)
+            if kind == QUEUED:
+                self.entries[key] = [due, step, difficulty, 0]
+            else:
+                self.entries.pop(key, None)
+        self.records = usable // RECORD.size
+        for key, entry in self.entries.items():
+            self._push(key, entry)
+        if self.records > max(COMPACT_MIN, 2 * len(self.entries)):
+            self.compact()
+
+    def _push(self, key, entry):
+        self.version += 1
+        entry[3] = self.version
+        heapq.heappush(self.heaps[key[0]], (entry[0], -entry[2], self.version, key))
+
+    def _append(self, kind, key, due=0.0, step=0, difficulty=0):
+        level, op, num1, num2 = key
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(RECORD.pack(kind, LEVELS.index(level), OPERATORS.index(op), num1, num2, due, step, difficulty))
+        self.records += 1
+        if self.records > max(COMPACT_MIN, 2 * len(self.entries)):
+            self.compact()
+
+    # Takes the most urgent due problem at a level off the heap and returns it as a problem
+    # dictionary, or None if nothing is due. It stays queued until record() says how it went.
+    def popDue(self, level):
+        heap = self.heaps[level]
+        now = self.clock()
+        while heap:
+            due, _, version, key = heap[0]
+            entry = self.entries.get(key)
+            if entry is None or entry[3] != version:
+                heapq.heappop(heap)      # Superseded by a later change
+                continue
+            if due > now:
+                return None
+            heapq.heappop(heap)
+            self.taken.add(key)
+            _, op, num1, num2 = key
+            return {'num1': num1, 'num2': num2, 'operator': op,
+                    'correct_answer': num1 + num2 if op == '+' else num1 - num2}
+        return None
+
+    # Updates the queue with how a finished problem went: correct or not, the attempt it was
+    # answered on and how long it took.
+    def record(self, level, problem, correct, attempts, latency_ms):
+        key = (level, problem['operator'], problem['num1'], problem['num2'])
+        entry = self.entries.get(key)
+        now = self.clock()
+        self.taken.discard(key)
+        if not correct:
+            # Missed: back to the start, and a little harder each time
+            difficulty = min(255, (entry[2] if entry else 0) + 2)
+            self._schedule(key, now, 0, difficulty)
+        elif attempts > 1 or latency_ms > SLOW_MS[level]:
+            # Got there slowly: keep it at (or put it in at) the second step
+            step = min(entry[1], 1) if entry else 1
+            self._schedule(key, now, step, max(1, entry[2] if entry else 1))
+        elif entry is not None:
+            # Quick and right: see it less often, until it drops out of the queue
+            if entry[1] + 1 >= len(REVIEW_INTERVALS):
+                del self.entries[key]
+                self._append(REMOVED, key)
+            else:
+                self._schedule(key, now, entry[1] + 1, max(0, entry[2] - 1))
+
+    # Puts problems handed out but never answered (say, a quiz left half way) back on their heaps
+    def putBack(self):
+        for key in self.taken:
+            if key in self.entries:
+                self._push(key, self.entries[key])
+        self.taken.clear()
+
+    def _schedule(self, key, now, step, difficulty):
+        entry = [now + REVIEW_INTERVALS[step], step, difficulty, 0]
+        self.entries[key] = entry
+        self._push(key, entry)
+        self._append(QUEUED, key, entry[0], step, difficulty)
+
+    # Rewrites the file with one record per queued problem
+    def compact(self):
+        records = bytearray()
+        for (level, op, num1, num2), (due, step, difficulty, _) in self.entries.items():
+            records += RECORD.pack(QUEUED, LEVELS.index(level), OPERATORS.index(op), num1, num2, due, step, difficulty)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(records)
+        os.replace(tmp, self.path)
+        self.records = len(self.entries)
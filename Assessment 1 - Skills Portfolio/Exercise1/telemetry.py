@@ -0,0 +1,163 @@
+import json
+import math
+import os
+import struct
+import time
+
+# Per-question response-time telemetry for the Math Quiz.
+# Every answered question becomes one fixed-size 16 byte record appended to a binary session log.
+# QuizStats keeps running totals and latency histograms per (difficulty, operator) and saves them
+# next to the log together with how many bytes of the log they already include, so loading the
+# stats only reads records appended since the last save instead of the whole log.
+
+# session id, level, operator, num1, num2, attempts used, correct (0/1), latency in ms
+RECORD = struct.Struct('<IBBHHBBf')
+
+LEVELS = ('Easy', 'Moderate', 'Advanced')
+OPERATORS = ('+', '-')
+
+# Latency histogram buckets are logarithmic, each one ~5% wider than the last
+BUCKETS_PER_E = 20
+
+# Collects the records for one quiz play and appends them to the log when the quiz ends.
+class SessionRecorder:
+    def __init__(self, difficulty_level):
+        self.session_id = int(time.time()) & 0xFFFFFFFF
+        self.level = LEVELS.index(difficulty_level)
+        self.records = bytearray()
+        self.question_start = None      # perf_counter() when the current question appeared
+
+    # Call when a question has been put on screen
+    def startQuestion(self):
+        self.question_start = time.perf_counter()
+
+    # Call when a question is finished (answered correctly or out of attempts).
+    # Returns the packed record.
+    def finishQuestion(self, problem, attempts, correct):
+        latency_ms = (time.perf_counter() - self.question_start) * 1000 if self.question_start else 0.0
+        record = RECORD.pack(self.session_id, self.level, OPERATORS.index(problem['operator']),
+                             problem['num1'], problem['num2'], attempts, int(correct), latency_ms)
+        self.records += record
+        self.question_start = None
+        return record
+
+    # Appends this session's records to the log file and clears them
+    def flush(self, log_file):
+        if not self.records:
+            return
+        with open(log_file, "ab") as f:
+            f.write(self.records)
+        self.records = bytearray()
+
+# Reads (session_id, level, operator, num1, num2, attempts, correct, latency_ms) tuples from packed bytes
+def iterRecords(data):
+    usable = len(data) - len(data) % RECORD.size    # Ignore a half-written record at the end
+    for fields in RECORD.iter_unpack(memoryview(data)[:usable]):
+        session_id, level, op, num1, num2, attempts, correct, latency = fields
+        yield session_id, LEVELS[level], OPERATORS[op], num1, num2, attempts, correct, latency
+
+# Running totals for one (difficulty, operator) group
+class GroupStats:
+    def __init__(self):
+        self.count = 0
+        self.failed = 0            # Wrong on every attempt
+        self.retried = 0           # Needed more than one attempt
+        self.histogram = {}        # Latency bucket -> count
+
+    def add(self, attempts, correct, latency_ms):
+        self.count += 1
+        self.failed += 0 if correct else 1
+        self.retried += 1 if attempts > 1 else 0
+        bucket = int(math.log(max(latency_ms, 1.0)) * BUCKETS_PER_E)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    # Approximate latency percentile (0-100) in milliseconds from the histogram
+    def percentile(self, pct):
+        if not self.count:
+            return 0.0
+        target = self.count * pct / 100
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= target:
+                return math.exp((bucket + 0.5) / BUCKETS_PER_E)
+        return math.exp((max(self.histogram) + 0.5) / BUCKETS_PER_E)
+
+    def errorRate(self):
+        return self.failed / self.count if self.count else 0.0
+
+    def retryRate(self):
+        return self.retried / self.count if self.count else 0.0
+
+# Aggregated analytics over the whole session log, updated incrementally.
+class QuizStats:
+    def __init__(self, log_file):
+        self.log_file = log_file
+        self.stats_file = log_file + ".stats.json"
+        self.offset = 0            # Bytes of the log already counted
+        self.groups = {}           # (level, operator) -> GroupStats
+        self._loadSnapshot()
+        self.catchUp()
+
+    # Loads the saved totals, if any
+    def _loadSnapshot(self):
+        try:
+            with open(self.stats_file, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        self.offset = snapshot["offset"]
+        for key, g in snapshot["groups"].items():
+            level, op = key.split("|")
+            group = GroupStats()
+            group.count, group.failed, group.retried = g["count"], g["failed"], g["retried"]
+            group.histogram = {int(b): c for b, c in g["histogram"].items()}
+            self.groups[(level, op)] = group
+
+    # Saves the totals together with the log offset they cover
+    def save(self):
+        snapshot = {"offset": self.offset, "groups": {
+            f"{level}|{op}": {"count": g.count, "failed": g.failed, "retried": g.retried,
+                              "histogram": g.histogram}
+            for (level, op), g in self.groups.items()
+        }}
+        tmp = self.stats_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, self.stats_file)
+
+    # Adds one record's values to the right group
+    def add(self, level, op, attempts, correct, latency_ms):
+        self.groups.setdefault((level, op), GroupStats()).add(attempts, correct, latency_ms)
+
+    # Adds packed records (e.g. a just-finished session) without touching the log
+    def addRecords(self, data):
+        for _, level, op, _, _, attempts, correct, latency in iterRecords(data):
+            self.add(level, op, attempts, correct, latency)
+        self.offset += len(data) - len(data) % RECORD.size
+
+    # Reads only the part of the log written since the last update
+    def catchUp(self):
+        try:
+            size = os.path.getsize(self.log_file)
+        except OSError:
+            return
+        if size < self.offset:
+            # The log was replaced or truncated, start again
+            self.offset, self.groups = 0, {}
+        if size == self.offset:
+            return
+        with open(self.log_file, "rb") as f:
+            f.seek(self.offset)
+            self.addRecords(f.read(size - self.offset))
+
+    # Rows of (level, operator, count, p50 ms, p90 ms, error rate, retry rate) for display
+    def summary(self):
+        rows = []
+        for level in LEVELS:
+            for op in OPERATORS:
+                g = self.groups.get((level, op))
+                if g and g.count:
+                    rows.append((level, op, g.count, g.percentile(50), g.percentile(90),
+                                 g.errorRate(), g.retryRate()))
+        return rows
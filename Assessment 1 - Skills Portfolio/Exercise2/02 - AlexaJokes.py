@@ -1,41 +1,93 @@
 import tkinter as tk
+import argparse
 from tkinter import messagebox
-import random
 import os
-from PIL import Image, ImageTk
-import pygame   
-
-# File names for jokes, background GIF, and music
-JOKES_FILE = "Assessment 1 - Skills Portfolio/Exercise2/Jokes.txt"
-GIF_FILE = "Assessment 1 - Skills Portfolio/Exercise2/jokesbg.gif"
-MUSIC_FILE = "Assessment 1 - Skills Portfolio/Exercise2/jokesbg.mp3"   
+import queue
+import struct
+import threading
+import time
+from PIL import ImageTk
+from gif_variants import GifVariants
+from animation import AnimationScheduler
+from joke_corpus import JokeCorpus
+from shuffle_bag import ShuffleBag
+from joke_search import JokeIndex
+from joke_server import RemoteJokes
+from joke_ingest import PackedCorpus
+
+# The shared asset pack reader (asset_pack.py, one folder up) is on the path when the app is
+# started through run.py. Started on its own, the app decodes its images from disk instead.
+try:
+    import asset_pack
+except ImportError:
+    asset_pack = None
+
+# File names for jokes, background GIF, and music (next to this script, so the app runs from any folder)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOKES_FILE = os.path.join(BASE_DIR, "Jokes.txt")
+GIF_FILE = os.path.join(BASE_DIR, "jokesbg.gif")
+MUSIC_FILE = os.path.join(BASE_DIR, "jokesbg.mp3")   
+PACKED_JOKES_FILE = os.path.join(BASE_DIR, "Jokes.corpus")   # Built by joke_ingest.py (optional)
+BAG_FILE = os.path.join(BASE_DIR, "joke_order.json")   # Which jokes are left this round
+
+WINDOW_SIZE = (600, 300)  # Size the window opens at (and its minimum), frames are scaled to the window
+FRAMES_AHEAD = 8          # Decoded frames waiting in each size variant's stream at most
+FRAME_CACHE = 32          # Tk images kept for reuse per size variant, a GIF this short is never decoded twice
+TEXT_MARGIN = 40          # Joke text wraps this many pixels short of the window width
+SAVE_ORDER_EVERY = 10     # Jokes told between saves of the joke order (it is also saved on exit)
+RELOAD_POLL_MS = 1000     # How often to check whether Jokes.txt was edited
+STARTUP_POLL_MS = 20      # How often the Tk thread collects results from the startup threads
+
+# Opens the jokes on this machine. A corpus pre-parsed by joke_ingest.py opens instantly, so it is
+# used unless Jokes.txt was edited since it was built, then Jokes.txt itself is read.
+# Raises OSError if Jokes.txt is needed and can't be read.
+def open_corpus(filepath):
+    try:
+        if not os.path.exists(filepath) or os.path.getmtime(PACKED_JOKES_FILE) >= os.path.getmtime(filepath):
+            packed = PackedCorpus(PACKED_JOKES_FILE, filepath)
+            if len(packed):
+                return packed
+            packed.close()
+    except (OSError, ValueError, struct.error) as e:
+        if os.path.exists(PACKED_JOKES_FILE):
+            print("Could not open the packed jokes, reading Jokes.txt instead.", e)
+    # Jokes are read straight from a memory-mapped file through a saved line index,
+    # so only the joke being shown is ever parsed (see joke_corpus.py)
+    return JokeCorpus(filepath)
 
 class randomJokes(tk.Tk):
-    def __init__(self, jokes_file):
+    # server is an optional (host, port) of a joke_server.py to take the jokes from instead of the file
+    def __init__(self, jokes_file, server=None):
+        self.startup_time = time.perf_counter()
+        self.interactive_time = None    # When "Alexa tell me a Joke" became usable
+        self.loaded_time = None         # When audio, GIF and jokes had all finished loading
         super().__init__()
-        # Set the window icon using a custom .ico file
-        self.iconbitmap("Assessment 1 - Skills Portfolio/Exercise2/laugh.ico")
+        self.server = server
+        # Set the window icon using a custom .ico file (X11 can't show .ico icons, so skip it there)
+        try:
+            self.iconbitmap(os.path.join(BASE_DIR, "laugh.ico"))
+        except tk.TclError:
+            pass
         # Basic window settings
         self.title("Alexa! Tell Me a Joke")
-        self.geometry("600x300")
-        self.resizable(False, False)
-
-        # Initialize Pygame and start the background music
-        pygame.mixer.init()                    
-        self.play_background_music()           
+        self.geometry(f"{WINDOW_SIZE[0]}x{WINDOW_SIZE[1]}")
+        self.minsize(*WINDOW_SIZE)
 
-        # For animated GIF frames
-        self.frames = []
-        self.current_frame = 0
+        # For animated GIF frames: a few pre-scaled size variants, each decoded on demand by a
+        # background thread with a bounded cache of Tk images for frames already shown (see gif_variants.py)
+        self.gif_variants = None
+        self.window_size = WINDOW_SIZE
+        self.bind("<Configure>", self.on_resize)
 
-        # Load GIF background frames and place the label
+        # Place the label for the GIF background frames
         # I used online resources which helped me to understand how to load GIF frames
         # and animate them using Tkinter 
-        self.load_gif_frames(GIF_FILE)
         self.bg_label = tk.Label(self, bg="black")
         self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-         # Start GIF animation
-        self.animate()
+         # GIF animation, started once the frames are streaming and paused while the window is minimised or covered
+        self.animator = AnimationScheduler(self, self.animate)
+        # F2 shows the animation's measured FPS and CPU cost in the title bar
+        self.bind("<F2>", self.show_animation_stats)
 
         # UI colors
         self.fg_color = "#ffffff"
@@ -44,73 +96,316 @@ class randomJokes(tk.Tk):
         # Joke storage
         self.jokes = []
         self.current_index = None
-
-        # Load jokes and build interface
-        self.load_jokes(JOKES_FILE)
+        self.joke_bag = None      # Random order of the jokes, no repeats until all have been told
+        self.jokes_told = 0
+        self.joke_index = JokeIndex()   # Word search over the jokes, filled in on the first search (None while a worker thread has it)
+        self.index_results = queue.Queue()
+        self.index_corpus = None        # Jokes a worker thread is indexing
+        self.pending_search = None      # Search waiting for the index to be ready
+        self.search_results = []        # Jokes matching the last search, "Next Joke" walks through them
+        self.search_position = 0
+        self.server_requests = queue.Queue()    # Server mode: requests waiting for the server thread
+        self.server_replies = queue.Queue()     # and its replies, collected by the Tk thread
+        self.server_waiting = 0
+
+        # Build the interface straight away so the window paints at once, then load the
+        # music, the GIF and the jokes at the same time on worker threads. Each thread puts
+        # its result in a queue that the Tk thread empties with after(), the only thread
+        # that touches widgets. The joke button is enabled as soon as the jokes are ready.
         self.create_widgets()
+        self.startup_results = queue.Queue()
+        self.startup_pending = {"audio", "gif", "jokes"}
+        for task in (self.start_audio, lambda: self.load_gif_frames(GIF_FILE), lambda: self.load_jokes(JOKES_FILE)):
+            threading.Thread(target=task, daemon=True).start()
+        self.after(STARTUP_POLL_MS, self.finish_startup)
+        if server:
+            threading.Thread(target=self.serve_requests, daemon=True).start()
+
+        # Watch the jokes file so edits show up without restarting (and re-decoding the GIF or restarting the music)
+        self.reloaded_jokes = queue.Queue()
+        self.reloading = False
+        self.after(RELOAD_POLL_MS, self.check_jokes_file)
+
+    # Worker thread: initialize Pygame and start the background music (importing pygame alone takes a while)
+    def start_audio(self):
+        try:
+            import pygame
+            pygame.mixer.init()
+        except Exception as e:
+            print("Could not start audio.", e)
+        else:
+            self.play_background_music()
+        self.startup_results.put(("audio", None))
 
     # Play looping background music
     # I took help from some online resources to add audio in the code
     def play_background_music(self):
         try:
+            import pygame
             pygame.mixer.music.load(MUSIC_FILE)   # Load MP3 file
             pygame.mixer.music.play(-1)           # -1 = loop forever
         except:
             print("Could not load background music.")
 
-    # Load all GIF frames into memory so the animation works properly
+    # Worker thread: set up the GIF's size variants, each decodes frames ahead of time on a background thread
     def load_gif_frames(self, path):
-        # Go through each GIF frame until EOF
-        try:
-            gif = Image.open(path)                   
-        except:
-            print("Could not load GIF background.")
-            return
-
-        self.frames = []
-
+        variants = None
         try:
-            while True:
-                frame = gif.copy().resize((600, 300))          # Resize to window
-                self.frames.append(ImageTk.PhotoImage(frame))
-                gif.seek(len(self.frames))                     # Move to next frame
-        except EOFError:
-            pass
+            # Frames in the asset pack are already decoded, so they only need scaling
+            pack = asset_pack.openPack() if asset_pack else None
+            packed = pack.frames(path) if pack else None
+            if packed:
+                variants = GifVariants(packed, FRAMES_AHEAD)
+            elif os.path.exists(path):
+                variants = GifVariants(path, FRAMES_AHEAD)
+            else:
+                print("Could not load GIF background.")
+            if variants is not None:
+                variants.variantFor(WINDOW_SIZE)     # Start decoding for the opening size now
+        except Exception as e:
+            print("Could not load GIF background.", e)
+        self.startup_results.put(("gif", variants))
+
+    # Tk thread: take in whatever the startup threads have finished
+    def finish_startup(self):
+        while True:
+            try:
+                name, result = self.startup_results.get_nowait()
+            except queue.Empty:
+                break
+            self.startup_pending.discard(name)
+            if name == "gif" and result is not None:
+                self.gif_variants = result
+                self.animator.resume()
+            elif name == "jokes":
+                if not self.jokes_ready(*result):
+                    return      # Window closed
+        if self.startup_pending:
+            self.after(STARTUP_POLL_MS, self.finish_startup)
+        else:
+            self.loaded_time = time.perf_counter()
 
-    # Loop the GIF animation by switching frames every 80 ms
-    def animate(self):
-        if self.frames:
-            frame = self.frames[self.current_frame]
-            self.bg_label.config(image=frame)
-            self.current_frame = (self.current_frame + 1) % len(self.frames)
-        self.after(80, self.animate)
+    # Window resized: only remember the size, the animation picks the frames for it on its next frame
+    def on_resize(self, event):
+        if event.widget is not self or (event.width, event.height) == self.window_size:
+            return
+        self.window_size = (event.width, event.height)
+        wrap = max(1, event.width - TEXT_MARGIN)
+        self.setup_label.config(wraplength=wrap)
+        self.punchline_label.config(wraplength=wrap)
+
+    # Show the next GIF frame (skipping `skip` frames if the animation fell behind).
+    # Frames come from the size variant for the window, or the nearest one while that is being made.
+    # Returns (shown, delay ms) for the AnimationScheduler, or None when there is no GIF.
+    def animate(self, skip=0):
+        if self.gif_variants is None:
+            return None
+        variant = self.gif_variants.variantFor(self.window_size)
+        if variant.loop:
+            # Short GIF fully cached: just cycle through the ready Tk images
+            variant.current = (variant.current + skip) % len(variant.loop)
+            photo, delay = variant.loop[variant.current]
+            self.bg_label.config(image=photo)
+            variant.current = (variant.current + 1) % len(variant.loop)
+            return True, delay
+
+        # Throw away frames we are too late to show
+        stream = variant.stream
+        for _ in range(skip):
+            if stream.nextFrame() is None:
+                break
+        item = stream.nextFrame()
+        if item is None:
+            # Decoder hasn't caught up yet, keep the current frame and check again shortly
+            return False, 10
+
+        index, frame, delay = item
+        photos = variant.photos
+        if index in photos:
+            photo, _ = photos[index]
+            photos.move_to_end(index)
+        else:
+            photo = ImageTk.PhotoImage(frame)
+            photos[index] = (photo, delay)
+            if len(photos) > FRAME_CACHE:
+                photos.popitem(last=False)     # Forget the least recently shown frame
+        self.bg_label.config(image=photo)
+
+        # Once every frame of a short GIF is cached the decoder isn't needed any more
+        count = stream.frame_count
+        if count and len(photos) == count:
+            stream.stop()
+            variant.loop = [photos[i] for i in range(count)]
+            variant.current = (index + 1) % count
+        return True, delay
+
+    # Put the animation counters in the title bar (and the console)
+    def show_animation_stats(self, event=None):
+        stats = self.animator.stats()
+        text = (f"{stats['fps']:.1f} fps, {stats['cpu_ms_per_frame']:.2f} ms CPU/frame, "
+                f"{stats['dropped']} dropped")
+        print("Animation:", text)
+        self.title(f"Alexa! Tell Me a Joke - {text}")
 
     # Read jokes from text file
+    # Worker thread: opens the jokes and hands back (jokes, joke order, error) with error = (title, message)
     def load_jokes(self, filepath):
-        if not os.path.exists(filepath):
-            messagebox.showerror("File not found", f"Could not find '{filepath}'.")
+        try:
+            result = self.open_jokes(filepath)
+        except Exception as e:
+            # Never leave the window waiting on "warming up" forever
+            result = None, None, ("Jokes", f"Could not load the jokes.\n{e}")
+        self.startup_results.put(("jokes", result))
+
+    def open_jokes(self, filepath):
+        if self.server:
+            # Client mode: jokes, punchlines and search all come from the joke server
+            try:
+                jokes = RemoteJokes(*self.server)
+            except (OSError, LookupError, ValueError) as e:
+                return None, None, ("Server", f"Could not connect to the joke server: {e}")
+            return jokes, ShuffleBag(len(jokes)), None
+
+        try:
+            corpus = open_corpus(filepath)
+        except FileNotFoundError:
+            return None, None, ("File not found", f"Could not find '{filepath}'.")
+        except OSError as e:
+            return None, None, ("File not readable", f"Could not read '{filepath}'.\n{e}")
+
+        if not len(corpus):
+            return None, None, ("No jokes", "No jokes found.")
+
+        # Carry on with the order from last time if it was saved
+        return corpus, ShuffleBag.load(BAG_FILE, len(corpus)), None
+
+    # Tk thread: start using the loaded jokes, or report why there are none. Returns False if the window closed.
+    def jokes_ready(self, jokes, joke_bag, error):
+        if error:
+            messagebox.showerror(*error)
             self.destroy()
+            return False
+        self.jokes = jokes
+        self.joke_bag = joke_bag
+        self.setup_label.config(text="Press 'Alexa tell me a Joke' to begin.")
+        self.tell_btn.config(state="normal")
+        self.interactive_time = time.perf_counter()
+        return True
+
+    # Remember which jokes are left so a restart doesn't repeat them
+    def save_joke_order(self):
+        if self.joke_bag is None or self.server:
             return
-
-         # Read lines without blank ones
-        with open(filepath, "r", encoding="utf-8") as f:
-            lines = [ln.rstrip("\n") for ln in f if ln.strip()]
-
-        parsed = []
-        # Split jokes into setup and punchline
-        for ln in lines:
-            if "?" in ln:
-                setup, _, punch = ln.partition("?")
-                parsed.append((setup.strip() + "?", punch.strip()))
+        try:
+            self.joke_bag.save(BAG_FILE)
+        except OSError as e:
+            print("Could not save the joke order.", e)
+
+    # Start reloading the jokes in the background if the file was edited
+    def check_jokes_file(self):
+        if not self.reloading and isinstance(self.jokes, (JokeCorpus, PackedCorpus)) and self.jokes.changed():
+            self.reloading = True
+            # The reload thread also brings the search index up to date, so it has the index until
+            # it is done (unless a worker thread is still building it)
+            index, self.joke_index = self.joke_index, None
+            threading.Thread(target=self.reload_jokes, args=(self.jokes, index, self.current_index), daemon=True).start()
+            self.after(50, self.finish_reload)
+        self.after(RELOAD_POLL_MS, self.check_jokes_file)
+
+    # Background thread: map the edited file again. Only appended lines are scanned
+    # (or the whole file if earlier lines changed), the saved index covers the rest.
+    # Then works out everything that depends on the changed lines, so the Tk thread only swaps it in.
+    # Hands back (corpus, index, changed joke indexes, (current, where it moved to)), corpus = None if there is nothing to swap.
+    def reload_jokes(self, old, index, current):
+        try:
+            corpus = open_corpus(JOKES_FILE)
+        except OSError as e:
+            print("Could not reload jokes.", e)
+            self.reloaded_jokes.put((None, index, None, None))
+            return
+        if not len(corpus):
+            # Probably caught half way through saving, keep the jokes we have
+            corpus.close()
+            self.reloaded_jokes.put((None, index, None, None))
+            return
+        if not (isinstance(old, JokeCorpus) and isinstance(corpus, JokeCorpus)):
+            # To or from the packed corpus: its jokes are numbered differently, so everything counts as
+            # changed and the search index is built again on the next search
+            changed = set(range(len(corpus)))
+            moved = current if current is not None and current < len(corpus) and corpus[current] == old[current] else None
+            self.reloaded_jokes.put((corpus, None if index is None else JokeIndex(), changed, (current, moved)))
+            return
+        changed = corpus.changedSince(old)
+
+        # Search index: take out the old text of changed or removed jokes, index the new text
+        if index is not None:
+            indexed = len(index)
+            if not old.intact():
+                # The file was rewritten in place, so the old jokes' text is gone: index everything again on the next search
+                index = JokeIndex()
             else:
-                parsed.append((ln.strip(), ""))
-
-        if not parsed:
-            messagebox.showerror("No jokes", "No jokes found.")
-            self.destroy()
+                for i in changed + list(range(len(corpus), indexed)):
+                    if i < indexed:
+                        index.remove(i, *old[i])
+                for i in changed:
+                    if i < min(indexed, len(corpus)):
+                        index.add(i, *corpus[i])
+
+        # Follow the joke being shown if its line moved
+        changed = set(changed)
+        moved = current
+        if current is not None and (current in changed or current >= len(corpus)):
+            found = corpus.find(old.crc(current)) if current < old.indexed_count else None
+            if found is not None:
+                moved = found
+            elif current >= len(corpus):
+                moved = None
+        self.reloaded_jokes.put((corpus, index, changed, (current, moved)))
+
+    # Back on the Tk thread: swap the new jokes in once they are ready
+    def finish_reload(self):
+        try:
+            corpus, index, changed, move = self.reloaded_jokes.get_nowait()
+        except queue.Empty:
+            self.after(50, self.finish_reload)
             return
+        self.reloading = False
+        if index is not None:
+            self.joke_index = index
+        elif self.joke_index is not None and corpus is not None:
+            self.joke_index = JokeIndex()       # Finished for the old jokes while they were reloading
+        if corpus is not None:
+            self.swap_jokes(corpus, changed, move)
+        if self.pending_search and self.joke_index is not None:
+            query, self.pending_search = self.pending_search, None
+            self.search_jokes(query)
+
+    # Replace the jokes with a newer version of the file (see reload_jokes for the rest)
+    def swap_jokes(self, corpus, changed, move):
+        old = self.jokes
+
+        # Random order: new jokes join the current round, start over if jokes were removed
+        if len(corpus) >= len(old):
+            self.joke_bag.grow(len(corpus))
+        else:
+            self.joke_bag = ShuffleBag(len(corpus))
+
+        # Keep current_index on the joke being shown. If another joke came up while the file was
+        # reloading and its line changed, stop offering its punchline.
+        shown, moved = move
+        if self.current_index is not None:
+            if self.current_index == shown:
+                self.current_index = moved
+            elif self.current_index in changed or self.current_index >= len(corpus):
+                self.current_index = None
+        if self.current_index is None:
+            self.punch_btn.config(state="disabled")
+        self.search_results = [i for i in self.search_results if i < len(corpus)]
+        self.search_position = 0
 
-        self.jokes = parsed
+        self.jokes = corpus
+        if old is not self.index_corpus:
+            old.close()     # Otherwise closed once the worker thread indexing it is done
 
     # Create all the labels and buttons
     def create_widgets(self):
@@ -131,9 +426,9 @@ class randomJokes(tk.Tk):
         # Setup joke text label
         self.setup_label = tk.Label(
             display_frame,
-            text="Press 'Alexa tell me a Joke' to begin.",
+            text="Alexa is warming up...",
             font=normal_font,
-            wraplength=560,
+            wraplength=WINDOW_SIZE[0] - TEXT_MARGIN,
             justify="center",
             fg=self.fg_color, bg="black"
         )
@@ -144,21 +439,35 @@ class randomJokes(tk.Tk):
             display_frame,
             text="",
             font=italic_font,
-            wraplength=560,
+            wraplength=WINDOW_SIZE[0] - TEXT_MARGIN,
             justify="center",
             fg="#ffd700",
             bg="black"
         )
         self.punchline_label.pack(pady=(6, 10))
 
+        # Search box: find jokes about a topic
+        search_frame = tk.Frame(self, bg="black")
+        search_frame.pack(pady=(0, 2))
+        tk.Label(search_frame, text="Joke about:", font=("Comic Sans MS", 11),
+                 fg=self.fg_color, bg="black").grid(row=0, column=0, padx=4)
+        self.search_entry = tk.Entry(search_frame, width=24, font=("Comic Sans MS", 11))
+        self.search_entry.grid(row=0, column=1, padx=4)
+        self.search_entry.bind("<Return>", lambda event: self.search_jokes())
+        self.search_btn = tk.Button(search_frame, text="Search",
+                                    width=8, font=("Comic Sans MS", 10),
+                                    command=self.search_jokes, bg=self.button_color)
+        self.search_btn.grid(row=0, column=2, padx=4)
+
         # Button part
         btn_frame = tk.Frame(self, bg="black")
-        btn_frame.pack(pady=(6, 16))
+        btn_frame.pack(pady=(4, 12))
 
         # Button: tell a new joke
         self.tell_btn = tk.Button(btn_frame, text="Alexa tell me a Joke",
                                   width=18, font=("Comic Sans MS", 12),
-                                  command=self.tell_joke, bg=self.button_color)
+                                  command=self.tell_joke,
+                                  state="disabled", bg=self.button_color)
         self.tell_btn.grid(row=0, column=0, padx=6, pady=4)
 
         # Button: show punchline
@@ -186,16 +495,25 @@ class randomJokes(tk.Tk):
         if not self.jokes:
             return
 
-         # To avoid repeating the same joke twice in a row
-        if len(self.jokes) == 1:
-            idx = 0
+        # Every joke comes up once before any repeats, and never the same one twice in a row
+        idx = self.joke_bag.draw()
+        self.jokes_told += 1
+        if self.jokes_told % SAVE_ORDER_EVERY == 0:
+            self.save_joke_order()
+        self.search_results = []
+        self.pending_search = None
+        self.show_joke(idx)
+
+    # Show the setup of joke idx
+    def show_joke(self, idx):
+        if self.server:
+            # Only the setup is fetched now, the punchline when it is asked for
+            self.ask_server(lambda: self.jokes.setup(idx), lambda setup: self.setup_ready(idx, setup))
         else:
-            idx = random.randrange(len(self.jokes))
-            if self.current_index is not None and idx == self.current_index:
-                idx = random.randrange(len(self.jokes))
+            self.setup_ready(idx, self.jokes[idx][0])
 
+    def setup_ready(self, idx, setup):
         self.current_index = idx
-        setup, _ = self.jokes[idx]
         self.setup_label.config(text=setup)
         self.punchline_label.config(text="")
         # Enable the other buttons
@@ -204,19 +522,146 @@ class randomJokes(tk.Tk):
 
     # Display punchline of current joke
     def show_punchline(self):
-        if self.current_index is None:
+        idx = self.current_index
+        if idx is None:
             return
-        _, punch = self.jokes[self.current_index]
-        self.punchline_label.config(text=punch or "(No punchline provided.)")
+        if self.server:
+            self.ask_server(lambda: self.jokes.punchline(idx), lambda punch: self.punchline_ready(idx, punch),
+                            lambda e: self.punchline_ready(idx, f"(Couldn't get the punchline: {e})"))
+        else:
+            self.punchline_ready(idx, self.jokes[idx][1])
+
+    def punchline_ready(self, idx, punch):
+        if idx == self.current_index:     # Not for a joke that was replaced while waiting for the server
+            self.punchline_label.config(text=punch or "(No punchline provided.)")
+
+    # Server mode: run `request` (a call on the RemoteJokes) on the thread that talks to the joke
+    # server, then pass its result to `done` on the Tk thread, or the error to `failed`
+    def ask_server(self, request, done, failed=None):
+        if not self.server_waiting:
+            self.after(STARTUP_POLL_MS, self.finish_server_replies)
+        self.server_waiting += 1
+        self.server_requests.put((request, done, failed))
+
+    # Worker thread: make the requests one after another over the one connection to the server.
+    # Any error goes back to the Tk thread, the thread must keep running or later requests would hang.
+    def serve_requests(self):
+        while True:
+            request, done, failed = self.server_requests.get()
+            try:
+                self.server_replies.put((done, request()))
+            except Exception as e:
+                self.server_replies.put((failed or self.server_failed, e))
+
+    # Tk thread: hand the server's replies to whoever asked
+    def finish_server_replies(self):
+        while True:
+            try:
+                callback, result = self.server_replies.get_nowait()
+            except queue.Empty:
+                break
+            self.server_waiting -= 1
+            callback(result)
+        if self.server_waiting:
+            self.after(STARTUP_POLL_MS, self.finish_server_replies)
+
+    def server_failed(self, error):
+        self.setup_label.config(text=f"Alexa can't reach the joke server right now. ({error})")
+
+    # Find the jokes matching the search box (or `query`), best match first
+    def search_jokes(self, query=None):
+        query = query or self.search_entry.get().strip()
+        if not query or not self.jokes:
+            return
+        if not self.server and (self.joke_index is None or len(self.joke_index) < len(self.jokes)):
+            # Jokes not indexed yet (all of them on the first search): index them on a worker
+            # thread and search once that is done
+            self.pending_search = query
+            self.current_index = None
+            self.setup_label.config(text="Alexa is indexing the jokes...")
+            self.punchline_label.config(text="")
+            self.punch_btn.config(state="disabled")
+            self.start_indexing()
+            return
+        if self.server:
+            self.ask_server(lambda: self.jokes.search(query), lambda results: self.show_results(query, results))
+        else:
+            self.show_results(query, self.joke_index.search(query))
+
+    # Show the first of the jokes a search found ("Next Joke" walks through the rest)
+    def show_results(self, query, results):
+        self.search_results = results
+        self.search_position = 0
+        if not self.search_results:
+            self.current_index = None
+            self.setup_label.config(text=f"No jokes about '{query}', try another word!")
+            self.punchline_label.config(text="")
+            self.punch_btn.config(state="disabled")
+            return
+        self.show_joke(self.search_results[0])
+
+    # Hand the search index to a worker thread that adds the jokes it is missing
+    def start_indexing(self):
+        if self.joke_index is None:
+            return      # Already being indexed
+        index, self.joke_index = self.joke_index, None
+        self.index_corpus = self.jokes
+        threading.Thread(target=self.index_jokes, args=(index, self.jokes), daemon=True).start()
+        self.after(STARTUP_POLL_MS, self.finish_indexing)
+
+    # Worker thread: index the jokes, hands back (index, jokes) with index = None if it failed
+    def index_jokes(self, index, jokes):
+        try:
+            index.update(jokes)
+        except (OSError, ValueError) as e:
+            print("Could not index the jokes.", e)
+            index = None
+        self.index_results.put((index, jokes))
+
+    # Tk thread: take the index back once it is built and run the search that was waiting for it
+    def finish_indexing(self):
+        try:
+            index, jokes = self.index_results.get_nowait()
+        except queue.Empty:
+            self.after(STARTUP_POLL_MS, self.finish_indexing)
+            return
+        self.index_corpus = None
+        query, self.pending_search = self.pending_search, None
+        if jokes is not self.jokes:
+            # The jokes were reloaded meanwhile: start again on the new ones
+            jokes.close()
+            self.joke_index = JokeIndex()
+        elif index is None:
+            self.joke_index = JokeIndex()
+            self.setup_label.config(text="Alexa couldn't search the jokes, try again!")
+            return
+        else:
+            self.joke_index = index
+        if query:
+            self.search_jokes(query)
 
-    # Move to another joke
+    # Move to another joke (the next search result while there is a search)
     def next_joke(self):
-        self.tell_joke()
+        if len(self.search_results) > 1:
+            self.search_position = (self.search_position + 1) % len(self.search_results)
+            self.show_joke(self.search_results[self.search_position])
+        else:
+            self.tell_joke()
 
 # Start program
 if __name__ == "__main__":
-    app = randomJokes(JOKES_FILE)
+    # --server HOST:PORT takes the jokes from a joke_server.py instead of Jokes.txt
+    parser = argparse.ArgumentParser(description="Alexa! Tell Me a Joke")
+    parser.add_argument("--server", help="HOST:PORT of a running joke server")
+    args = parser.parse_args()
+    server = None
+    if args.server:
+        host, _, port = args.server.rpartition(":")
+        server = (host or "127.0.0.1", int(port))
+
+    app = randomJokes(JOKES_FILE, server)
     try:
         app.mainloop()
     except tk.TclError:
         pass
+    app.save_joke_order()
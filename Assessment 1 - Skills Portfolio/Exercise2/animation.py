@@ -0,0 +1,123 @@
+import time
+from collections import deque
+
+# Drives a frame-by-frame animation with Tk's after() without wasting CPU.
+# - Pauses while the window is minimised, unmapped or completely covered, resumes when it shows again
+# - Schedules against target times instead of plain "after(delay)", so the time spent inside
+#   the frame callback doesn't make the animation drift slower than its intended rate
+# - When it falls more than a frame behind it tells the callback how many frames to skip
+#   instead of running a burst of late frames to catch up
+# - Keeps measured FPS, CPU time per frame and dropped-frame counters
+#
+# step(skip) shows the next frame (after skipping `skip` frames) and returns (shown, delay_ms):
+# whether a frame was actually drawn and how long until the next one. It returns None when there
+# is nothing to animate, and the scheduler then stops until resume() is called.
+
+FPS_WINDOW = 1.0      # Seconds of frames the FPS counter averages over
+
+class AnimationScheduler:
+    def __init__(self, window, step):
+        self.window = window
+        self.step = step
+        self.after_id = None
+        self.paused = False             # Window hidden or covered
+        self.next_due = None            # perf_counter() time the next frame should show
+        self.last_delay = None          # Seconds between the last two frames' due times
+        self.frames_shown = 0
+        self.frames_dropped = 0
+        self.cpu_time = 0.0             # Total CPU seconds spent in step()
+        self._recent = deque()          # perf_counter() times of recently shown frames
+
+        window.bind("<Map>", self._onMap, add="+")
+        window.bind("<Unmap>", self._onUnmap, add="+")
+        window.bind("<Visibility>", self._onVisibility, add="+")
+
+    # Starts (or restarts) the animation straight away
+    def start(self):
+        self.stop()
+        self.next_due = time.perf_counter()
+        self.after_id = self.window.after_idle(self._tick)
+
+    # Cancels the pending frame
+    def stop(self):
+        if self.after_id is not None:
+            self.window.after_cancel(self.after_id)
+            self.after_id = None
+
+    # Restarts after a pause or after step() returned None
+    def resume(self):
+        if not self.paused:
+            self.start()
+
+    # <Map>/<Unmap> also fire for child widgets, only the window itself matters
+    def _onMap(self, event):
+        if event.widget is self.window and self.paused:
+            self.paused = False
+            self.start()
+
+    def _onUnmap(self, event):
+        if event.widget is self.window:
+            self.paused = True
+            self.stop()
+
+    # Fully covered windows get no visible updates, so don't draw them
+    def _onVisibility(self, event):
+        if event.widget is not self.window:
+            return
+        if event.state == "VisibilityFullyObscured":
+            self.paused = True
+            self.stop()
+        elif self.paused:
+            self.paused = False
+            self.start()
+
+    def _tick(self):
+        self.after_id = None
+        if self.paused:
+            return
+        now = time.perf_counter()
+        skip = 0
+        if self.last_delay and now - self.next_due > self.last_delay:
+            # More than a whole frame late: drop the frames we missed and start timing again from now
+            skip = int((now - self.next_due) / self.last_delay)
+            self.frames_dropped += skip
+            self.next_due = now
+
+        cpu_start = time.process_time()
+        result = self.step(skip)
+        if result is None:
+            return      # Nothing to animate
+        shown, delay = result
+        if not shown:
+            # No frame was ready, try again after the given delay without counting it as a frame
+            self.next_due = now + delay / 1000
+            self.after_id = self.window.after(delay, self._tick)
+            return
+
+        self.cpu_time += time.process_time() - cpu_start
+        self.frames_shown += 1
+        self._recent.append(now)
+        while now - self._recent[0] > FPS_WINDOW:
+            self._recent.popleft()
+
+        # Aim for the due time of the next frame, whatever this one cost
+        self.last_delay = delay / 1000
+        self.next_due += self.last_delay
+        wait = max(0, round((self.next_due - time.perf_counter()) * 1000))
+        self.after_id = self.window.after(wait, self._tick)
+
+    # Frames shown per second over the last FPS_WINDOW seconds
+    def fps(self):
+        if len(self._recent) < 2:
+            return 0.0
+        span = self._recent[-1] - self._recent[0]
+        return (len(self._recent) - 1) / span if span > 0 else 0.0
+
+    # Average CPU milliseconds spent showing one frame
+    def cpuPerFrame(self):
+        return self.cpu_time / self.frames_shown * 1000 if self.frames_shown else 0.0
+
+    # Counters as a dictionary, e.g. for printing or a debug label
+    def stats(self):
+        return {"fps": self.fps(), "cpu_ms_per_frame": self.cpuPerFrame(),
+                "shown": self.frames_shown, "dropped": self.frames_dropped, "paused": self.paused}
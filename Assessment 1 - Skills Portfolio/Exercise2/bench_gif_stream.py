@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from PIL import Image, ImageDraw
+
+# Compares the old eager GIF loader with GifFrameStream for a short and a long GIF.
+# Each case runs in its own process so peak RSS is measured on its own.
+# Reported: startup latency (until the first frame can be shown) and peak resident memory.
+# Tk PhotoImages need a display, so frames are prepared up to the PIL image the app converts.
+#   python bench_gif_stream.py      (Linux, memory is read from /proc)
+
+GIF_SIZE = (600, 300)
+CASES = (("short", 12), ("long", 600))
+
+# Writes a synthetic animated GIF with `frames` frames of moving noise-free shapes
+def makeGif(path, frames, size=(800, 400)):
+    images = []
+    for n in range(frames):
+        img = Image.new("P", size, n % 200)
+        draw = ImageDraw.Draw(img)
+        draw.ellipse((n % size[0], 50, n % size[0] + 120, 170), fill=(n * 7) % 255)
+        images.append(img)
+    images[0].save(path, save_all=True, append_images=images[1:], duration=60, loop=0)
+
+# Old behaviour: decode and resize every frame before the window appears
+def eager(path):
+    start = time.perf_counter()
+    gif = Image.open(path)
+    frames = []
+    try:
+        while True:
+            frames.append(gif.copy().resize(GIF_SIZE))
+            gif.seek(len(frames))
+    except EOFError:
+        pass
+    first = time.perf_counter() - start
+    return first, len(frames)
+
+# New behaviour: first frame as soon as it's decoded, then play one loop from the stream
+def streaming(path):
+    from gif_stream import GifFrameStream
+    start = time.perf_counter()
+    stream = GifFrameStream(path, GIF_SIZE)
+    item = None
+    while item is None:
+        item = stream.nextFrame()
+        time.sleep(0.0005)
+    first = time.perf_counter() - start
+    shown = 1
+    while stream.frame_count is None or shown < stream.frame_count:
+        if stream.nextFrame() is not None:
+            shown += 1
+        else:
+            time.sleep(0.0005)
+    stream.stop()
+    return first, shown
+
+# Peak resident memory of this process in MB. VmHWM starts fresh with each new program,
+# unlike ru_maxrss which Linux carries over from the parent process.
+def peakRss():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+# Runs one case in this process and prints "startup_ms peak_rss_mb frames"
+def runCase(mode, path):
+    first, frames = (eager if mode == "eager" else streaming)(path)
+    peak_mb = peakRss()
+    print(f"{first * 1000:.1f} {peak_mb:.1f} {frames}")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'GIF':<7}{'frames':>7}{'loader':>11}{'startup ms':>12}{'peak RSS MB':>13}")
+        for name, frames in CASES:
+            path = os.path.join(tmp, f"{name}.gif")
+            makeGif(path, frames)
+            for mode in ("eager", "streaming"):
+                out = subprocess.run([sys.executable, __file__, mode, path], capture_output=True,
+                                     text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+                first, peak, count = out.stdout.split()
+                print(f"{name:<7}{count:>7}{mode:>11}{float(first):>12.1f}{float(peak):>13.1f}")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        runCase(sys.argv[1], sys.argv[2])
+    else:
+        main()
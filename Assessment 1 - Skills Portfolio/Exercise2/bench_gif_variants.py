@@ -0,0 +1,88 @@
+import argparse
+import os
+import tempfile
+import time
+
+from PIL import Image
+
+from bench_gif_stream import makeGif
+from gif_variants import GifVariants, bucketSize
+
+# Resizing the jokes window while the background animates, one window size per animation frame
+# (a drag from 600x300 out to --to and back):
+# - rescale all: every frame of the GIF scaled again on the Tk thread whenever the size changes
+# - variants: GifVariants, frames come from size buckets scaled on background threads, the
+#   nearest ready bucket stands in while a new one starts
+# Reported: time the Tk thread spends per animation frame (p50 / max), and for variants how often
+# a stand-in bucket was drawn and how many buckets were built.
+#   python bench_gif_variants.py --frames 12 --to 1400x800
+
+FRAME_MS = 60
+
+def parseSize(text):
+    width, _, height = text.partition("x")
+    return int(width), int(height)
+
+def dragSizes(start, end, steps):
+    there = [(start[0] + (end[0] - start[0]) * i // steps, start[1] + (end[1] - start[1]) * i // steps)
+             for i in range(steps + 1)]
+    return there + there[::-1]
+
+def summary(times):
+    ms = sorted(t * 1000 for t in times)
+    return ms[len(ms) // 2], ms[-1]
+
+def rescaleAll(frames, sizes):
+    times, scaled, last = [], None, None
+    for n, size in enumerate(sizes):
+        start = time.perf_counter()
+        if size != last:
+            scaled = [frame.resize(size) for frame, _ in frames]
+            last = size
+        scaled[n % len(scaled)].tobytes()     # Stands in for handing the frame to Tk
+        times.append(time.perf_counter() - start)
+        time.sleep(FRAME_MS / 1000)
+    return times
+
+def withVariants(frames, sizes):
+    variants = GifVariants(frames)
+    times, stand_ins = [], 0
+    for size in sizes:
+        start = time.perf_counter()
+        variant = variants.variantFor(size)
+        item = variant.stream.nextFrame()
+        if item is not None:
+            item[1].tobytes()
+        times.append(time.perf_counter() - start)
+        stand_ins += variant.size != bucketSize(size)
+        time.sleep(FRAME_MS / 1000)
+    variants.stop()
+    return times, stand_ins, variants.built
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resizing the animated jokes background.")
+    parser.add_argument("--frames", type=int, default=12)
+    parser.add_argument("--to", type=parseSize, default=(1400, 800), help="Largest window size WxH")
+    parser.add_argument("--steps", type=int, default=40, help="Animation frames to drag across")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.gif")
+        makeGif(path, args.frames)
+        gif = Image.open(path)
+        frames = []
+        for index in range(args.frames):
+            gif.seek(index)
+            frames.append((gif.convert("RGBA"), 60))
+
+    sizes = dragSizes((600, 300), args.to, args.steps)
+    print(f"{args.frames} frame GIF, {len(sizes)} animation frames while resizing to {args.to[0]}x{args.to[1]} and back")
+    print(f"{'':<14}{'p50 ms':>10}{'max ms':>10}")
+    p50, worst = summary(rescaleAll(frames, sizes))
+    print(f"{'rescale all':<14}{p50:>10.2f}{worst:>10.2f}")
+    times, stand_ins, built = withVariants(frames, sizes)
+    p50, worst = summary(times)
+    print(f"{'variants':<14}{p50:>10.2f}{worst:>10.2f}   {stand_ins} frames from a stand-in bucket, {built} buckets built")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from joke_ingest import PackedCorpus, ingest
+
+# Benchmarks joke_ingest.py on a large synthetic corpus split over several files, with
+# duplicates (some differing only in case, spacing or quote style) and multi-"?" jokes, then
+# compares opening the packed result with the app's old way of parsing the raw text.
+#   python bench_ingest.py --lines 1200000 --files 3
+
+SUBJECTS = ("chicken", "skeleton", "cow", "programmer", "teacher", "banana", "ghost", "robot")
+THINGS = ("road", "ladder", "party", "library", "ocean", "bakery", "garden", "museum")
+
+# Writes `lines` jokes over `files` files. About a fifth are re-spelled copies of earlier jokes.
+def makeCorpus(folder, lines, files, seed=1):
+    rng = random.Random(seed)
+    jokes = []
+    paths = [os.path.join(folder, f"jokes{n}.txt") for n in range(files)]
+    handles = [open(path, "w", encoding="utf-8") for path in paths]
+    for n in range(lines):
+        if jokes and rng.random() < 0.2:
+            joke = rng.choice(jokes)
+            joke = rng.choice((joke.upper(), "  " + joke.replace(" ", "   "), joke.replace("'", "’")))
+        else:
+            joke = (f"Why didn't the {rng.choice(SUBJECTS)} {n} visit the {rng.choice(THINGS)}? "
+                    f"{'Really? ' if n % 7 == 0 else ''}Because it was {rng.choice(THINGS)} number {n}.")
+            jokes.append(joke)
+        handles[n % files].write(joke + "\n")
+    for handle in handles:
+        handle.close()
+    return paths
+
+# The app's original loader: read every line and split it at the first "?"
+def parseRaw(paths):
+    parsed = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for ln in f:
+                if ln.strip():
+                    setup, _, punch = ln.rstrip("\n").partition("?")
+                    parsed.append((setup.strip() + "?", punch.strip()))
+    return parsed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the joke ingest pipeline.")
+    parser.add_argument("--lines", type=int, default=1_200_000)
+    parser.add_argument("--files", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = makeCorpus(folder, args.lines, args.files)
+        output = os.path.join(folder, "jokes.corpus")
+        size = sum(os.path.getsize(path) for path in paths) / 1e6
+        print(f"{args.lines:,} lines in {args.files} files ({size:.0f} MB), {os.cpu_count()} CPU(s)")
+        print(f"{'workers':<10}{'seconds':>9}{'lines/s':>12}{'kept':>12}{'dropped':>10}")
+        for workers in sorted({1, os.cpu_count() or 1}):
+            result = ingest(paths, output, workers=workers)
+            print(f"{workers:<10}{result['seconds']:>9.2f}{result['lines'] / result['seconds']:>12,.0f}"
+                  f"{result['jokes']:>12,}{result['duplicates']:>10,}")
+
+        start = time.perf_counter()
+        raw = parseRaw(paths)
+        raw_time = time.perf_counter() - start
+        start = time.perf_counter()
+        packed = PackedCorpus(output)
+        open_time = time.perf_counter() - start
+        rng = random.Random(2)
+        start = time.perf_counter()
+        for _ in range(10000):
+            packed[rng.randrange(len(packed))]
+        get_time = (time.perf_counter() - start) / 10000
+        print(f"Parse raw text ({len(raw):,} jokes): {raw_time * 1000:.0f} ms")
+        print(f"Open packed corpus ({len(packed):,} jokes): {open_time * 1000:.2f} ms, then {get_time * 1e6:.1f} us per joke")
+        packed.close()
@@ -0,0 +1,78 @@
+import argparse
+import random
+import time
+
+from joke_search import JokeIndex, tokenize
+
+# Compares searching the jokes with JokeIndex against a plain scan of the (setup, punchline) list,
+# the way the app would have to do it with only self.jokes, on a large synthetic corpus.
+#   python bench_joke_search.py --jokes 200000 --queries 200
+
+SUBJECTS = ("chicken", "skeleton", "cow", "programmer", "teacher", "banana", "ghost", "robot",
+            "penguin", "scarecrow", "computer", "pirate", "dinosaur", "vampire", "astronaut")
+VERBS = ("cross", "bring", "eat", "call", "fix", "sing", "paint", "stop", "climb", "open")
+THINGS = ("road", "ladder", "party", "library", "ocean", "bakery", "garden", "museum", "moon")
+
+# Makes `count` made-up jokes with a few random filler words so the vocabulary is realistic
+def makeCorpus(count, seed=1):
+    rng = random.Random(seed)
+    filler = [f"w{n}" for n in range(20000)]
+    jokes = []
+    for _ in range(count):
+        setup = (f"Why did the {rng.choice(SUBJECTS)} {rng.choice(VERBS)} the {rng.choice(THINGS)} "
+                 f"{' '.join(rng.choices(filler, k=3))}?")
+        punch = f"Because the {rng.choice(THINGS)} was {' '.join(rng.choices(filler, k=4))}"
+        jokes.append((setup, punch))
+    return jokes
+
+# What the app could do without an index: check every joke for every query word (as a prefix)
+def naiveSearch(jokes, query, limit=20):
+    words = tokenize(query)
+    results = []
+    for index, (setup, punch) in enumerate(jokes):
+        tokens = tokenize(setup + " " + punch)
+        matched = sum(any(token.startswith(word) for token in tokens) for word in words)
+        if matched:
+            results.append((-matched, index))
+    results.sort()
+    return [index for _, index in results[:limit]]
+
+def timeQueries(search, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return sum(times) / len(times), times[int(len(times) * 0.99) - 1] if len(times) > 1 else times[0]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark inverted-index joke search against a full scan.")
+    parser.add_argument("--jokes", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--naive-queries", type=int, default=5, help="the scan is slow, time fewer queries")
+    args = parser.parse_args()
+
+    jokes = makeCorpus(args.jokes)
+    rng = random.Random(2)
+    queries = [rng.choice((f"{rng.choice(SUBJECTS)} {rng.choice(THINGS)}", rng.choice(SUBJECTS)[:4],
+                           f"w{rng.randrange(20000)}")) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index = JokeIndex()
+    index.update(jokes)
+    build = time.perf_counter() - start
+    extra = makeCorpus(1000, seed=3)
+    start = time.perf_counter()
+    for n, (setup, punch) in enumerate(extra):
+        index.add(len(jokes) + n, setup, punch)
+    add_per_joke = (time.perf_counter() - start) / len(extra)
+
+    index_mean, index_p99 = timeQueries(index.search, queries)
+    naive_mean, naive_p99 = timeQueries(lambda q: naiveSearch(jokes, q), queries[:args.naive_queries])
+
+    print(f"{args.jokes:,} jokes, index built in {build:.2f}s, adding a joke takes {add_per_joke * 1e6:.0f}us")
+    print(f"{'method':<12}{'queries':>9}{'mean ms':>10}{'p99 ms':>10}")
+    print(f"{'index':<12}{len(queries):>9}{index_mean * 1000:>10.2f}{index_p99 * 1000:>10.2f}")
+    print(f"{'full scan':<12}{args.naive_queries:>9}{naive_mean * 1000:>10.1f}{naive_p99 * 1000:>10.1f}")
+    print(f"Speed-up: {naive_mean / index_mean:.0f}x")
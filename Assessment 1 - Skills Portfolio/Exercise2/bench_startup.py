@@ -0,0 +1,50 @@
+import importlib.util
+import os
+import time
+
+START = time.perf_counter()
+
+import tkinter as tk
+
+# Startup benchmark for AlexaJokes. Reports:
+# - import time: loading "02 - AlexaJokes.py" and the modules it imports
+# - time to first paint: until the window has been drawn for the first time
+# - time to interactive: until "Alexa tell me a Joke" is enabled (the jokes are loaded)
+# - time to fully loaded: until the music, the GIF stream and the jokes have all finished loading
+# Run from any folder: python "Assessment 1 - Skills Portfolio/Exercise2/bench_startup.py"
+
+JOKES_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "02 - AlexaJokes.py")
+
+def main():
+    import_start = time.perf_counter()
+    spec = importlib.util.spec_from_file_location("alexa_jokes", JOKES_APP)
+    jokes = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(jokes)
+    import_done = time.perf_counter()
+
+    app = jokes.randomJokes(jokes.JOKES_FILE)
+    painted = []
+
+    # <Map> on the window fires once it is on screen, update_idletasks then finishes drawing it
+    def on_map(event):
+        if event.widget is app and not painted:
+            painted.append(time.perf_counter())
+    app.bind('<Map>', on_map, add='+')
+    while not painted:
+        app.update()
+    app.update_idletasks()
+    first_paint = time.perf_counter()
+
+    # Keep the event loop running until every startup thread has reported in
+    while app.loaded_time is None:
+        app.update()
+        time.sleep(0.001)
+
+    print(f"Import time:            {(import_done - import_start) * 1000:8.1f} ms")
+    print(f"Time to first paint:    {(first_paint - START) * 1000:8.1f} ms")
+    print(f"Time to interactive:    {(app.interactive_time - START) * 1000:8.1f} ms")
+    print(f"Time to fully loaded:   {(app.loaded_time - START) * 1000:8.1f} ms")
+    app.destroy()
+
+if __name__ == "__main__":
+    main()
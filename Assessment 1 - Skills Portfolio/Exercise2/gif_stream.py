@@ -0,0 +1,80 @@
+import queue
+import threading
+
+from PIL import Image
+
+# Streams the frames of an animated GIF instead of decoding them all up front.
+# A background thread decodes frames in order (looping back to the start at the end),
+# resizes them for the window and puts them in a small bounded queue, so only `ahead`
+# frames are ever waiting in memory however long the GIF is. Each frame keeps its own
+# GIF duration. If the consumer falls behind, the decoder simply waits for space.
+
+DEFAULT_DURATION = 80     # Used when a frame has no duration of its own (ms)
+
+class GifFrameStream:
+    # frames_source can be a GIF path or a list of (PIL image, duration) already decoded (e.g. from the asset pack)
+    def __init__(self, frames_source, size, ahead=8):
+        self.size = size
+        self.ready = queue.Queue(maxsize=ahead)     # (frame index, PIL image, duration ms)
+        self.frame_count = None                     # Known once the decoder has reached the end once
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(frames_source,), daemon=True)
+        self._thread.start()
+
+    # Decoder thread: produce frames forever (looping) until stopped
+    def _run(self, frames_source):
+        try:
+            if isinstance(frames_source, str):
+                frames = self._decodeGif(frames_source)
+            else:
+                frames = self._replay(frames_source)
+            for item in frames:
+                # Wait for room in the queue, checking regularly whether we were stopped
+                while not self._stop.is_set():
+                    try:
+                        self.ready.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if self._stop.is_set():
+                    return
+        except Exception as e:
+            self.error = e
+            print("Could not load GIF background.", e)
+
+    # Yields (index, frame, duration) from a GIF file, looping forever
+    def _decodeGif(self, path):
+        gif = Image.open(path)
+        while not self._stop.is_set():
+            index = 0
+            gif.seek(0)
+            while True:
+                duration = gif.info.get("duration") or DEFAULT_DURATION
+                yield index, gif.convert("RGBA").resize(self.size), duration
+                index += 1
+                try:
+                    gif.seek(index)
+                except EOFError:
+                    self.frame_count = index
+                    break
+
+    # Yields (index, frame, duration) from already decoded frames, looping forever
+    def _replay(self, frames):
+        self.frame_count = len(frames)
+        while frames and not self._stop.is_set():
+            for index, (frame, duration) in enumerate(frames):
+                if frame.size != self.size:
+                    frame = frame.resize(self.size)
+                yield index, frame, duration or DEFAULT_DURATION
+
+    # Returns the next (index, PIL image, duration) if one is ready, else None (never blocks)
+    def nextFrame(self):
+        try:
+            return self.ready.get_nowait()
+        except queue.Empty:
+            return None
+
+    # Stops the decoder thread
+    def stop(self):
+        self._stop.set()
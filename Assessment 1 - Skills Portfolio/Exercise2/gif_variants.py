@@ -0,0 +1,79 @@
+import math
+from collections import OrderedDict
+
+from gif_stream import GifFrameStream
+
+# Pre-scaled variants of an animated GIF for a window that can be resized.
+# - Window sizes are rounded up to a size bucket (multiples of BUCKET_STEP pixels), so a drag
+#   across a few pixels doesn't need new frames. Each bucket gets its own GifFrameStream that
+#   decodes and scales the frames for that size on a background thread, started the first time
+#   the window is in that bucket.
+# - Only `cached` buckets are kept. The least recently wanted one is dropped first (its decoder is
+#   stopped and the images the app cached for it go with it).
+# - Until a new bucket has its first frame ready, the nearest bucket that has frames is drawn from
+#   instead, so a resize never makes the animation wait.
+
+BUCKET_STEP = 100         # Pixels between size buckets
+VARIANTS_CACHED = 3       # Buckets kept at most
+
+# Smallest bucket that covers a (width, height)
+def bucketSize(size, step=BUCKET_STEP):
+    return tuple(max(step, math.ceil(n / step) * step) for n in size)
+
+# One size bucket: its frame stream plus whatever the app keeps for it
+class FrameVariant:
+    def __init__(self, size, stream):
+        self.size = size
+        self.stream = stream
+        self.photos = OrderedDict()    # Frame index -> (PhotoImage, duration ms) made by the app
+        self.loop = None               # Every frame's (PhotoImage, duration) once a short GIF is fully cached
+        self.current = 0               # Next frame to show from loop
+
+    # True once there is a frame to draw
+    @property
+    def ready(self):
+        return bool(self.loop or self.photos) or not self.stream.ready.empty()
+
+class GifVariants:
+    # frames_source is a GIF path or already decoded frames, as for GifFrameStream
+    def __init__(self, frames_source, ahead=8, cached=VARIANTS_CACHED, step=BUCKET_STEP):
+        self.frames_source = frames_source
+        self.ahead = ahead
+        self.cached = cached
+        self.step = step
+        self.variants = OrderedDict()    # Bucket size -> FrameVariant, least recently wanted first
+        self.shown = None                # Variant frames were last drawn from
+        self.built = 0                   # Variants started so far
+
+    # The variant to draw from for a window size: its own bucket when it has frames, otherwise the
+    # nearest bucket that has (its own bucket starts building if it isn't already)
+    def variantFor(self, size):
+        bucket = bucketSize(size, self.step)
+        wanted = self.variants.get(bucket)
+        if wanted is None:
+            wanted = self.variants[bucket] = FrameVariant(bucket, GifFrameStream(self.frames_source, bucket, self.ahead))
+            self.built += 1
+        self.variants.move_to_end(bucket)
+        if wanted.ready:
+            self.shown = wanted
+        else:
+            ready = [v for v in self.variants.values() if v.ready]
+            if ready:
+                self.shown = min(ready, key=lambda v: abs(v.size[0] - bucket[0]) + abs(v.size[1] - bucket[1]))
+        self._trim(wanted)
+        return self.shown or wanted
+
+    # Drops the least recently wanted variants over the limit, never the wanted or shown one
+    def _trim(self, wanted):
+        for bucket in list(self.variants):
+            if len(self.variants) <= self.cached:
+                break
+            variant = self.variants[bucket]
+            if variant is not wanted and variant is not self.shown:
+                variant.stream.stop()
+                del self.variants[bucket]
+
+    # Stops every decoder
+    def stop(self):
+        for variant in self.variants.values():
+            variant.stream.stop()
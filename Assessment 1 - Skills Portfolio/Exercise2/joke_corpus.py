@@ -0,0 +1,268 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from array import array
+
+# Random access to a jokes file of any size without reading it all into memory.
+# - A line index ("<jokes file>.idx") is built once and saved: a small header followed by the
+#   byte offset and CRC of every non-blank line. Later runs memory-map it as it is.
+# - The jokes file itself is memory-mapped, and only the joke being shown is parsed,
+#   so getting joke i is O(1) and memory stays almost flat however big the corpus is.
+# - When the file has only grown since the index was built (checked with a CRC of everything
+#   indexed so far), just the new lines are scanned and appended to the index. Any other change
+#   rescans the line offsets, and the per-line CRCs tell which jokes were actually modified.
+# - If the index can't be written (read-only folder, file in use) it is kept in memory instead.
+# A JokeCorpus behaves like the old list of (setup, punchline) tuples: len(corpus), corpus[i].
+# It can be shared between threads: re-mapping the file and reading from the mappings take a lock,
+# so a refresh on one thread never closes a mapping another thread is reading.
+
+# magic, bytes of the jokes file covered, number of lines, CRC of all the covered bytes
+HEADER = struct.Struct("<8sQQI")
+MAGIC = b"JOKEIDX2"
+RECORD = struct.Struct("<QQ")       # Line start offset, CRC of the line
+SCAN_CHUNK = 1 << 20
+
+# Splits one line into (setup, punchline) on the first "?", like the original loader
+def parse_joke(line):
+    if "?" in line:
+        setup, _, punch = line.partition("?")
+        return setup.strip() + "?", punch.strip()
+    return line.strip(), ""
+
+class JokeCorpus:
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self.text_file = None         # The jokes file that is mapped (kept open to notice it being cut short)
+        self.text_map = None          # mmap of the jokes file
+        self.offsets = None           # Start of each indexed line (view of the saved index, or an array)
+        self.crcs = None              # CRC of each indexed line
+        self.index_map = None
+        self.in_memory = False        # True when the index couldn't be saved
+        self.indexed_size = 0         # Bytes of the jokes file covered by the index
+        self.indexed_count = 0
+        self.covered_crc = 0          # CRC of those bytes
+        self.tail_offsets = []        # Start of a last line with no newline yet (not saved, it may still grow)
+        self.stamp = None             # (size, mtime) of the jokes file when it was mapped
+        self.rebuilt = False          # True if the last refresh had to rescan the whole file
+        self.lock = threading.RLock()  # Held while the mappings are replaced or read
+        self.refresh()
+
+    def __len__(self):
+        return self.indexed_count + len(self.tail_offsets)
+
+    # Returns (setup, punchline) for joke i, parsing only that line
+    def __getitem__(self, i):
+        with self.lock:
+            if i < 0:
+                i += len(self)
+            if not 0 <= i < len(self):
+                raise IndexError("joke index out of range")
+            return parse_joke(self.line(i))
+
+    # Returns the raw text of line i
+    def line(self, i):
+        with self.lock:
+            # Reading a mapping past the end of a file that was cut short crashes, so re-map first
+            if self.truncated():
+                self.refresh()
+                if i >= len(self):
+                    return ""
+            start = self.offsets[i] if i < self.indexed_count else self.tail_offsets[i - self.indexed_count]
+            end = self.text_map.find(b"\n", start)
+            if end == -1:
+                end = len(self.text_map)
+            return self.text_map[start:end].decode("utf-8", errors="replace").rstrip("\r")
+
+    # True if the mapped file is now shorter than the mapping (it was cut short in place)
+    def truncated(self):
+        return os.fstat(self.text_file.fileno()).st_size < len(self.text_map)
+
+    # True if the mapped text is still what was indexed. A file rewritten in place (rather than
+    # replaced by a new file) changes under the mapping, and the old text is gone.
+    def intact(self):
+        with self.lock:
+            return not self.truncated() and self._crc(0, self.indexed_size) == self.covered_crc
+
+    # True if the jokes file was written since it was last mapped
+    def changed(self):
+        try:
+            info = os.stat(self.path)
+        except OSError:
+            return self.stamp is None
+        return (info.st_size, info.st_mtime_ns) != self.stamp
+
+    # Joke indexes whose text differs from `previous` (an older JokeCorpus of the same file), new ones included
+    def changedSince(self, previous):
+        if not self.rebuilt:
+            # Only appended: the previous unfinished last line and everything after it
+            return list(range(min(previous.indexed_count, len(self)), len(self)))
+        with previous.lock, self.lock:
+            common = min(previous.indexed_count, self.indexed_count)
+            changed = [i for i in range(common) if previous.crcs[i] != self.crcs[i]]
+        return changed + list(range(common, len(self)))
+
+    # CRC of indexed line i
+    def crc(self, i):
+        with self.lock:
+            return self.crcs[i]
+
+    # Index of the first line with this CRC, or None
+    def find(self, crc):
+        with self.lock:
+            for i in range(self.indexed_count):
+                if self.crcs[i] == crc:
+                    return i
+        return None
+
+    # CRC of a range of the jokes file, continuing from `value` (read in place, without copying it)
+    def _crc(self, start, end, value=0):
+        if isinstance(self.text_map, bytes):
+            return zlib.crc32(self.text_map[start:end], value)
+        with memoryview(self.text_map) as view:
+            return zlib.crc32(view[start:end], value)
+
+    # Finds every non-blank line in [start, end).
+    # Returns (offsets, CRCs, end of the last complete line, start of the unfinished line after it).
+    def _scan(self, start, end):
+        offsets, crcs = array("Q"), array("Q")
+        complete = start
+        line_start = start
+        position = start
+        while position < end:
+            chunk_end = min(end, position + SCAN_CHUNK)
+            newline = self.text_map.find(b"\n", position, chunk_end)
+            if newline == -1:
+                position = chunk_end
+                continue
+            line = self.text_map[line_start:newline]
+            if line.strip():
+                offsets.append(line_start)
+                crcs.append(zlib.crc32(line))
+            line_start = position = complete = newline + 1
+        return offsets, crcs, complete, line_start
+
+    # Re-maps the jokes file and brings the index up to date. Returns True if anything changed.
+    def refresh(self):
+        with self.lock:
+            return self._refresh()
+
+    def _refresh(self):
+        if not self.changed():
+            return False
+        self._closeText()
+        self.text_file = open(self.path, "rb")
+        info = os.fstat(self.text_file.fileno())
+        stamp, size = (info.st_size, info.st_mtime_ns), info.st_size
+        # mmap can't map an empty file, an empty bytes object reads the same way
+        self.text_map = mmap.mmap(self.text_file.fileno(), size, access=mmap.ACCESS_READ) if size else b""
+
+        if self.offsets is not None:
+            header = (MAGIC, self.indexed_size, self.indexed_count, self.covered_crc)
+        else:
+            header = self._readIndexHeader()
+        if header and header[1] <= size and header[3] == self._crc(0, header[1]):
+            # Everything indexed is unchanged: only scan what was appended
+            if self.offsets is None:
+                self._openIndex()
+            offsets, crcs, complete, tail_start = self._scan(self.indexed_size, size)
+            self._appendIndex(offsets, crcs, complete)
+            self.rebuilt = False
+        else:
+            # No index yet, or the file was edited: rescan every line
+            offsets, crcs, complete, tail_start = self._scan(0, size)
+            self._writeIndex(offsets, crcs, complete)
+            self.rebuilt = True
+        # A last line without a newline is usable now but isn't indexed until it's finished
+        self.tail_offsets = [tail_start] if tail_start < size and self.text_map[tail_start:size].strip() else []
+        self.stamp = stamp
+        return True
+
+    def _readIndexHeader(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                header = HEADER.unpack(f.read(HEADER.size))
+        except (OSError, struct.error):
+            return None
+        return header if header[0] == MAGIC else None
+
+    # Writes a fresh index (to a temporary file first so a crash never leaves half an index)
+    def _writeIndex(self, offsets, crcs, covered):
+        self._closeIndex()
+        self.indexed_size, self.indexed_count = covered, len(offsets)
+        self.covered_crc = self._crc(0, covered)
+        records = array("Q", bytes(len(offsets) * RECORD.size))
+        records[0::2], records[1::2] = offsets, crcs
+        tmp = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(HEADER.pack(MAGIC, covered, len(offsets), self.covered_crc))
+                f.write(records.tobytes())
+            os.replace(tmp, self.index_path)
+            self._openIndex()
+        except OSError as e:
+            print("Keeping the joke index in memory.", e)
+            self.offsets, self.crcs = offsets, crcs
+            self.in_memory = True
+
+    # Adds the lines appended to the file to the end of the index
+    def _appendIndex(self, offsets, crcs, covered):
+        if covered == self.indexed_size:
+            return
+        self.covered_crc = self._crc(self.indexed_size, covered, self.covered_crc)
+        self.indexed_size = covered
+        if self.in_memory:
+            self.offsets.extend(offsets)
+            self.crcs.extend(crcs)
+            self.indexed_count = len(self.offsets)
+            return
+        count = self.indexed_count + len(offsets)
+        records = array("Q", bytes(len(offsets) * RECORD.size))
+        records[0::2], records[1::2] = offsets, crcs
+        self._closeIndex()
+        try:
+            with open(self.index_path, "r+b") as f:
+                f.seek(HEADER.size + self.indexed_count * RECORD.size)
+                f.write(records.tobytes())
+                f.seek(0)
+                f.write(HEADER.pack(MAGIC, covered, count, self.covered_crc))
+            self._openIndex()
+        except OSError:
+            # Rebuild it in memory from the text instead
+            self.offsets = None
+            self._writeIndex(*self._scan(0, covered)[:2], covered)
+
+    # Memory-maps the saved index
+    def _openIndex(self):
+        self._closeIndex()
+        _, covered, count, covered_crc = self._readIndexHeader()
+        self.indexed_size, self.indexed_count, self.covered_crc = covered, count, covered_crc
+        if count:
+            with open(self.index_path, "rb") as f:
+                self.index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            records = memoryview(self.index_map)[HEADER.size:HEADER.size + count * RECORD.size].cast("Q")
+            self.offsets, self.crcs = records[0::2], records[1::2]
+        else:
+            self.offsets, self.crcs = array("Q"), array("Q")
+
+    def _closeIndex(self):
+        for view in (self.offsets, self.crcs):
+            if isinstance(view, memoryview):
+                view.release()
+        self.offsets = self.crcs = None
+        if self.index_map is not None:
+            self.index_map.close()
+            self.index_map = None
+
+    def _closeText(self):
+        if isinstance(self.text_map, mmap.mmap):
+            self.text_map.close()
+        if self.text_file is not None:
+            self.text_file.close()
+
+    def close(self):
+        with self.lock:
+            self._closeIndex()
+            self._closeText()
@@ -0,0 +1,208 @@
+import argparse
+import hashlib
+import mmap
+import os
+import re
+import struct
+import time
+import unicodedata
+from array import array
+from multiprocessing import Pool
+
+# Ingest pipeline for big, merged joke collections. Turns any number of raw "setup?punchline"
+# text files into one compact, pre-parsed corpus file that AlexaJokes opens instantly.
+# - Files are cut into chunks on line boundaries and parsed in a process pool
+# - Every line is normalised (Unicode NFKC, curly quotes straightened, control characters
+#   dropped, runs of whitespace collapsed) before it is split, so spacing variants compare equal
+# - The setup/punchline split is configurable (SPLIT_RULES). The default, "first", splits at the
+#   first "?" like the app does when it reads Jokes.txt (joke_corpus.parse_joke), so both give
+#   the same jokes. "last" splits after the last "?" that still has text after it, so
+#   "Why? Why not? Because." keeps its whole question.
+# - Duplicates are dropped by a 64-bit hash of the case-folded joke, keeping the first one seen
+#
+# Output layout: b"JOKEPAK1", joke count (uint64), count + 1 record offsets (uint64, relative to
+# the end of the offset table), then each joke's UTF-8 setup, a 0x1F separator and its punchline.
+#   python joke_ingest.py Jokes.txt more_jokes/*.txt -o Jokes.corpus --workers 4
+# PackedCorpus reads the file through mmap with the same len()/[i]/changed() interface as JokeCorpus.
+
+HEADER = struct.Struct("<8sQ")
+MAGIC = b"JOKEPAK1"
+SEPARATOR = "\x1f"
+CHUNK_BYTES = 4 << 20
+SPLIT_RULES = ("first", "last", "tab")   # Or "sep:<text>" to split on any other separator
+
+QUOTES = str.maketrans({"‘": "'", "’": "'", "“": '"', "”": '"', "–": "-", "—": "-"})
+
+# Control and zero-width characters (whitespace is handled by split())
+INVISIBLE = re.compile("[\x00-\x08\x0e-\x1f\x7f-\x9f\u200b-\u200d\u2060\ufeff]")
+
+# Normalises one line of text (see above)
+def normalize(text):
+    if not text.isascii():
+        text = unicodedata.normalize("NFKC", text).translate(QUOTES)
+    return " ".join(INVISIBLE.sub("", text).split())
+
+# Splits a line into (setup, punchline) with one of the split rules
+def split_joke(line, rule="first"):
+    if rule == "first":
+        setup, mark, punch = line.partition("?")
+    elif rule == "last":
+        # The last "?" with a punchline after it (a line ending in "?" has no punchline)
+        position = line.rfind("?", 0, len(line.rstrip("?")))
+        if position == -1:
+            return line, ""
+        setup, mark, punch = line[:position], "?", line[position + 1:]
+    else:
+        separator = "\t" if rule == "tab" else rule[len("sep:"):]
+        setup, found, punch = line.partition(separator)
+        return (setup.strip(), punch.strip()) if found else (line, "")
+    if not mark:
+        return line, ""
+    return setup.strip() + "?", punch.strip()
+
+# Content hash used to spot duplicates: case and spacing don't matter
+def joke_hash(setup, punch):
+    digest = hashlib.blake2b(f"{setup.casefold()}{SEPARATOR}{punch.casefold()}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+# Pool worker: parses the lines in bytes [start, end) of one file. Returns [(hash, setup, punchline)].
+def parse_chunk(job):
+    path, start, end, rule = job
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    jokes = []
+    question_rule = rule in ("first", "last")
+    for raw in data.decode("utf-8", errors="replace").splitlines():
+        # "?" rules split the normalised line. Separators such as tabs would be lost by
+        # normalising first, so those lines are split first and each half normalised.
+        # Either way the text can't contain the record separator, normalize() drops control characters.
+        if question_rule:
+            line = normalize(raw)
+            setup, punch = split_joke(line, rule) if line else ("", "")
+        else:
+            setup, punch = (normalize(part) for part in split_joke(raw, rule))
+        if setup or punch:
+            jokes.append((joke_hash(setup, punch), setup, punch))
+    return jokes
+
+# Cuts a file into (path, start, end, rule) jobs of about CHUNK_BYTES, ending on line breaks
+def plan_chunks(path, rule, chunk_bytes=CHUNK_BYTES):
+    size = os.path.getsize(path)
+    jobs = []
+    start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            end = min(size, start + chunk_bytes)
+            if end < size:
+                f.seek(end)
+                rest = f.readline()
+                end += len(rest)
+            jobs.append((path, start, end, rule))
+            start = end
+    return jobs
+
+# Parses, normalises and de-duplicates the input files and writes a packed corpus.
+# Returns a dictionary of counts and timings.
+def ingest(paths, output, rule="first", workers=None, chunk_bytes=CHUNK_BYTES):
+    if rule not in SPLIT_RULES and not rule.startswith("sep:"):
+        raise ValueError(f"Unknown split rule: {rule}")
+    start = time.perf_counter()
+    jobs = [job for path in paths for job in plan_chunks(path, rule, chunk_bytes)]
+    seen = set()
+    lines = 0
+    records = []
+    offsets = [0]
+
+    def collect(chunks):
+        nonlocal lines
+        for jokes in chunks:
+            lines += len(jokes)
+            for digest, setup, punch in jokes:
+                if digest in seen:
+                    continue
+                seen.add(digest)
+                record = f"{setup}{SEPARATOR}{punch}".encode()
+                records.append(record)
+                offsets.append(offsets[-1] + len(record))
+
+    if workers == 1:
+        collect(map(parse_chunk, jobs))
+    else:
+        with Pool(workers) as pool:
+            # imap keeps the chunks in file order, so the first copy of a joke is the one kept
+            collect(pool.imap(parse_chunk, jobs))
+
+    tmp = output + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(records)))
+        f.write(array("Q", offsets).tobytes())
+        f.writelines(records)
+    os.replace(tmp, output)
+    return {"lines": lines, "jokes": len(records), "duplicates": lines - len(records),
+            "seconds": time.perf_counter() - start}
+
+# Read-only view of a packed corpus file. `source` is the raw file it was built from:
+# changed() reports an edit to it (or a rebuilt packed file) so the caller can reload.
+class PackedCorpus:
+    def __init__(self, path, source=None):
+        self.path = path
+        self.source = source
+        self.stamp = self._stamp()
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < HEADER.size or HEADER.unpack_from(self.map, 0)[0] != MAGIC:
+            self.map.close()
+            raise ValueError(f"Not a packed joke corpus: {path}")
+        self.count = HEADER.unpack_from(self.map, 0)[1]
+        table_end = HEADER.size + (self.count + 1) * 8
+        # A file cut short (a copy or a build that didn't finish) would fail later, on some joke
+        if table_end > len(self.map) or table_end + struct.unpack_from("<Q", self.map, table_end - 8)[0] > len(self.map):
+            self.map.close()
+            raise ValueError(f"Packed joke corpus is truncated: {path}")
+        self.offsets = memoryview(self.map)[HEADER.size:table_end].cast("Q")
+        self.data_start = table_end
+
+    def __len__(self):
+        return self.count
+
+    # Returns (setup, punchline) for joke i
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("joke index out of range")
+        record = self.map[self.data_start + self.offsets[i]:self.data_start + self.offsets[i + 1]]
+        setup, _, punch = record.decode("utf-8").partition(SEPARATOR)
+        return setup, punch
+
+    # True if the packed file or its source was written since this corpus was opened
+    def changed(self):
+        return self._stamp() != self.stamp
+
+    # (size, mtime) of the packed file and of the source, None for a file that doesn't exist
+    def _stamp(self):
+        stamps = []
+        for path in (self.path, self.source):
+            try:
+                info = os.stat(path) if path else None
+            except OSError:
+                info = None
+            stamps.append(info and (info.st_size, info.st_mtime_ns))
+        return stamps
+
+    def close(self):
+        self.offsets.release()
+        self.map.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a packed, de-duplicated joke corpus from raw joke files.")
+    parser.add_argument("inputs", nargs="+", help="Raw joke text files, one joke per line")
+    parser.add_argument("-o", "--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "Jokes.corpus"))
+    parser.add_argument("--split", default="first", help=f"Split rule: {', '.join(SPLIT_RULES)} or sep:<text>")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: one per CPU)")
+    args = parser.parse_args()
+    result = ingest(args.inputs, args.output, args.split, args.workers)
+    print(f"{result['lines']:,} jokes read, {result['duplicates']:,} duplicates dropped, "
+          f"{result['jokes']:,} written to {args.output} in {result['seconds']:.2f}s "
+          f"({result['lines'] / result['seconds']:,.0f} lines/s)")
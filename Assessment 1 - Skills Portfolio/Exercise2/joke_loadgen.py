@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from joke_server import DEFAULT_HOST, DEFAULT_PORT, JOKES_FILE, JokeServer
+
+# Load generator for joke_server.py. Many stand-in displays each keep one connection open and
+# send a mix of random-joke, punchline and search requests back to back. Reports requests per
+# second, latency percentiles and the server's cache hit rate.
+#   python joke_loadgen.py --clients 200 --requests 200
+# Without --port a server is started inside this process on a free port.
+
+SEARCH_WORDS = ("chicken", "cow", "skeleton", "road", "why", "cross", "comp", "tea")
+
+# Sends one GET on an open connection and reads the whole response. Returns the body.
+async def get(reader, writer, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    return await reader.readexactly(length)
+
+# One stand-in display: `requests` requests over a single kept-alive connection
+async def client(host, port, requests, jokes, seed, latencies):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            roll = rng.random()
+            if roll < 0.5:
+                path = "/joke/random"
+            elif roll < 0.9:
+                path = f"/joke/{rng.randrange(jokes)}/punchline"
+            else:
+                path = f"/search?q={rng.choice(SEARCH_WORDS)}&limit=5"
+            start = time.perf_counter()
+            await get(reader, writer, path)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+# Returns the pct percentile of a sorted list
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+async def main(args):
+    server = listener = None
+    host, port = args.host, args.port
+    if port is None:
+        server = JokeServer(args.jokes)
+        listener = await server.start(host, 0)
+        port = listener.sockets[0].getsockname()[1]
+
+    reader, writer = await asyncio.open_connection(host, port)
+    jokes = json.loads(await get(reader, writer, "/stats"))["jokes"]
+    writer.close()
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, args.requests, jokes, args.seed + i, latencies)
+                           for i in range(args.clients)))
+    elapsed = time.perf_counter() - start
+
+    if listener:
+        listener.close()
+        await listener.wait_closed()
+
+    ms = sorted(t * 1000 for t in latencies)
+    print(f"Clients: {args.clients:,}   Requests: {len(ms):,}   Time: {elapsed:.2f}s   Requests/s: {len(ms) / elapsed:,.0f}")
+    print(f"Latency  p50 {percentile(ms, 50):.2f} ms   p95 {percentile(ms, 95):.2f} ms   "
+          f"p99 {percentile(ms, 99):.2f} ms   max {ms[-1]:.2f} ms")
+    if server:
+        total = server.cache_hits + server.cache_misses
+        print(f"Cache hit rate: {server.cache_hits / total:.0%}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the joke server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=None, help=f"Server port (e.g. {DEFAULT_PORT}), omit to run one in-process")
+    parser.add_argument("--jokes", default=JOKES_FILE, help="Jokes file for the in-process server")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=200, help="Requests sent by each client")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
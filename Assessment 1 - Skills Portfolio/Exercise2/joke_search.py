@@ -0,0 +1,101 @@
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+# Full-text search over the jokes' setups and punchlines.
+# An inverted index maps every word to the jokes containing it (and how often), so a query only
+# looks at the jokes that share a word with it instead of scanning the whole corpus.
+# - Results are ranked with BM25: rare words count more than common ones, and a word in a
+#   short joke counts more than the same word in a long one
+# - Each query word also matches longer words starting with it ("chick" finds "chicken"),
+#   using a sorted word list, and jokes matching more of the query words come first
+# - Jokes can be added, removed or re-indexed at any time (add() / remove() / update()),
+#   the index never has to be rebuilt
+
+K1 = 1.2                # BM25 term-frequency saturation
+B = 0.75                # BM25 length normalisation
+PREFIX_FACTOR = 0.7     # A prefix match counts a bit less than the whole word
+MAX_EXPANSIONS = 50     # Longer words tried for one prefix at most
+
+WORD = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+
+# Lower-case words of a piece of text
+def tokenize(text):
+    return WORD.findall(text.lower())
+
+class JokeIndex:
+    def __init__(self):
+        self.postings = defaultdict(dict)     # Word -> {joke index: times it appears}
+        self.lengths = {}                     # Joke index -> number of words
+        self.total_length = 0
+        self._vocabulary = []                 # Sorted words, for prefix lookups
+        self._vocabulary_dirty = False
+
+    def __len__(self):
+        return len(self.lengths)
+
+    # Indexes one joke
+    def add(self, index, setup, punchline=""):
+        words = tokenize(setup) + tokenize(punchline)
+        for word in words:
+            postings = self.postings[word]
+            if not postings:
+                self._vocabulary_dirty = True
+            postings[index] = postings.get(index, 0) + 1
+        self.lengths[index] = len(words)
+        self.total_length += len(words)
+
+    # Takes a joke out of the index again (given the text it was indexed with)
+    def remove(self, index, setup, punchline=""):
+        if index not in self.lengths:
+            return
+        for word in set(tokenize(setup) + tokenize(punchline)):
+            postings = self.postings.get(word)
+            if postings and postings.pop(index, None) is not None and not postings:
+                del self.postings[word]
+                self._vocabulary_dirty = True
+        self.total_length -= self.lengths.pop(index)
+
+    # Indexes the jokes a corpus has gained since the last call (anything with len() and [i])
+    def update(self, corpus):
+        for index in range(len(self.lengths), len(corpus)):
+            self.add(index, *corpus[index])
+
+    # Words in the index starting with `prefix` (the word itself first if present)
+    def expand(self, prefix):
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self.postings)
+            self._vocabulary_dirty = False
+        words = []
+        position = bisect_left(self._vocabulary, prefix)
+        while position < len(self._vocabulary) and len(words) < MAX_EXPANSIONS:
+            word = self._vocabulary[position]
+            if not word.startswith(prefix):
+                break
+            words.append(word)
+            position += 1
+        return words
+
+    # Returns up to `limit` joke indexes best matching the query, best first
+    def search(self, query, limit=20):
+        if not self.lengths:
+            return []
+        count = len(self.lengths)
+        average_length = self.total_length / count
+        scores = defaultdict(float)
+        matched = defaultdict(int)            # Joke index -> how many query words it matched
+        for query_word in dict.fromkeys(tokenize(query)):
+            seen = set()
+            for word in self.expand(query_word):
+                postings = self.postings[word]
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                factor = 1.0 if word == query_word else PREFIX_FACTOR
+                for index, frequency in postings.items():
+                    norm = K1 * (1 - B + B * self.lengths[index] / average_length)
+                    scores[index] += factor * idf * frequency * (K1 + 1) / (frequency + norm)
+                    seen.add(index)
+            for index in seen:
+                matched[index] += 1
+        return heapq.nsmallest(limit, scores, key=lambda index: (-matched[index], -scores[index], index))
@@ -0,0 +1,245 @@
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import random
+from collections import OrderedDict
+from urllib.parse import parse_qs, quote, urlsplit
+
+from joke_corpus import JokeCorpus
+from joke_search import JokeIndex
+
+# "Alexa" joke service: serves the AlexaJokes corpus over HTTP on localhost so many displays
+# can pull jokes from one source. It uses the same JokeCorpus (and its "?" split) and
+# JokeIndex as the Tk app.
+#   GET /joke/random              -> {"id": 12, "setup": "Why ...?"}
+#   GET /joke/<id>                -> {"id": 12, "setup": "Why ...?"}
+#   GET /joke/<id>/punchline      -> {"id": 12, "punchline": "..."}
+#   GET /search?q=chicken&limit=5 -> {"results": [{"id": 3, "setup": "..."}, ...]}
+#   GET /stats                    -> {"jokes": 36, "cache_hits": ..., "cache_misses": ...}
+# Connections are kept alive (HTTP/1.1 style) so a display reuses one connection for all its
+# requests. Encoded responses for jokes, punchlines and searches are kept in an LRU cache,
+# which is emptied when Jokes.txt changes on disk.
+#   python joke_server.py --port 8766
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+JOKES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Jokes.txt")
+CACHE_SIZE = 4096           # Cached responses
+KEEPALIVE_TIMEOUT = 30      # Seconds an idle connection is kept open
+RELOAD_INTERVAL = 1.0       # Seconds between checks for an edited jokes file
+MAX_LINE = 8192
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+class JokeServer:
+    def __init__(self, jokes_file=JOKES_FILE, cache_size=CACHE_SIZE):
+        self.jokes_file = jokes_file
+        self.corpus = JokeCorpus(jokes_file)
+        self.index = JokeIndex()
+        self.index.update(self.corpus)
+        self.cache = OrderedDict()     # Request path -> encoded response
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.requests = 0
+        self.active = 0                # Open connections
+
+    # Picks up edits to the jokes file. Mapping the file again and indexing it runs in a worker
+    # thread (see loadJokes), requests keep being served from the old jokes until they are swapped in.
+    async def reload(self):
+        if not self.corpus.changed():
+            return False
+        corpus, index = await asyncio.get_running_loop().run_in_executor(None, self.loadJokes)
+        old, self.corpus, self.index = self.corpus, corpus, index
+        self.cache.clear()
+        old.close()
+        return True
+
+    # Worker thread: the edited jokes file and a search index for it. The live index is being
+    # searched meanwhile, so the new one is built separately (only the file scan is incremental).
+    def loadJokes(self):
+        corpus = JokeCorpus(self.jokes_file)
+        index = JokeIndex()
+        index.update(corpus)
+        return corpus, index
+
+    async def watchFile(self):
+        while True:
+            await asyncio.sleep(RELOAD_INTERVAL)
+            try:
+                await self.reload()
+            except OSError as e:
+                print("Could not reload jokes.", e)
+
+    # Returns (status, reply object) for a GET path
+    def route(self, path):
+        url = urlsplit(path)
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["stats"]:
+            return 200, {"jokes": len(self.corpus), "requests": self.requests, "connections": self.active,
+                         "cache_hits": self.cache_hits, "cache_misses": self.cache_misses}
+        if parts == ["search"]:
+            query = parse_qs(url.query)
+            try:
+                limit = max(1, min(100, int(query.get("limit", ["20"])[0])))
+            except ValueError:
+                return 400, {"error": "Bad limit"}
+            results = self.index.search(query.get("q", [""])[0], limit)
+            return 200, {"results": [{"id": i, "setup": self.corpus[i][0]} for i in results]}
+        if len(parts) in (2, 3) and parts[0] == "joke" and parts[1].isdigit():
+            joke_id = int(parts[1])
+            if joke_id >= len(self.corpus):
+                return 404, {"error": "No such joke"}
+            setup, punchline = self.corpus[joke_id]
+            if len(parts) == 2:
+                return 200, {"id": joke_id, "setup": setup}
+            if parts[2] == "punchline":
+                return 200, {"id": joke_id, "punchline": punchline}
+        return 404, {"error": "Not found"}
+
+    # Full encoded response for a GET path, from the cache when possible
+    def respond(self, path, keep_alive):
+        self.requests += 1
+        if path == "/joke/random" and len(self.corpus):
+            # A random joke is the same response as that joke by id, so it can come from the cache too
+            path = f"/joke/{random.randrange(len(self.corpus))}"
+        key = (path, keep_alive)
+        response = self.cache.get(key)
+        if response is not None:
+            self.cache_hits += 1
+            self.cache.move_to_end(key)
+            return response
+        self.cache_misses += 1
+        status, reply = self.route(path)
+        response = encodeResponse(status, reply, keep_alive)
+        # Stats change every time, everything else can be reused
+        if status == 200 and not path.startswith("/stats"):
+            self.cache[key] = response
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return response
+
+    # Serves one client connection, request after request, until it closes or goes idle
+    async def handleClient(self, reader, writer):
+        self.active += 1
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip().lower()
+
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    writer.write(encodeResponse(400, {"error": "Bad request line"}, False))
+                    break
+                # HTTP/1.1 keeps the connection open unless told otherwise, HTTP/1.0 only if asked
+                if version == "HTTP/1.0":
+                    keep_alive = headers.get("connection") == "keep-alive"
+                else:
+                    keep_alive = headers.get("connection") != "close"
+                if method != "GET":
+                    writer.write(encodeResponse(405, {"error": "Only GET is supported"}, keep_alive))
+                else:
+                    writer.write(self.respond(path, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self.active -= 1
+            writer.close()
+
+    # Starts listening and returns the asyncio server
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handleClient, host, port, backlog=4096, limit=MAX_LINE)
+
+# Builds an HTTP response with a JSON body
+def encodeResponse(status, reply, keep_alive):
+    body = json.dumps(reply).encode()
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + body
+
+# Blocking client used by the Tk app's client mode. It looks like the local JokeCorpus
+# (len(jokes), jokes[i] -> (setup, punchline)) plus setup(i), punchline(i) and search(), and
+# keeps one connection open for all its requests. Every call waits for the server, so the app
+# makes them from a worker thread (one at a time, the connection can't be shared).
+class RemoteJokes:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=5):
+        self.connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        self.count = self._get("/stats")["jokes"]
+
+    # One GET request, retried once on a fresh connection if the server closed the old one
+    def _get(self, path):
+        for attempt in range(2):
+            try:
+                self.connection.request("GET", path)
+                response = self.connection.getresponse()
+                reply = json.loads(response.read())
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.connection.close()
+                if attempt:
+                    raise
+                continue
+            if response.status != 200:
+                raise LookupError(reply.get("error", f"HTTP {response.status}"))
+            return reply
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return self.setup(i), self.punchline(i)
+
+    def setup(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError("joke index out of range")
+        return self._get(f"/joke/{i}")["setup"]
+
+    def punchline(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError("joke index out of range")
+        return self._get(f"/joke/{i}/punchline")["punchline"]
+
+    # Joke ids best matching a query, best first
+    def search(self, query, limit=20):
+        return [result["id"] for result in self._get(f"/search?q={quote(query)}&limit={limit}")["results"]]
+
+    def close(self):
+        self.connection.close()
+
+async def main(host, port, jokes_file):
+    server = JokeServer(jokes_file)
+    listener = await server.start(host, port)
+    print(f"Joke server listening on http://{host}:{port} with {len(server.corpus)} jokes")
+    watcher = asyncio.create_task(server.watchFile())
+    async with listener:
+        await listener.serve_forever()
+    watcher.cancel()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve AlexaJokes over HTTP for many displays.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--jokes", default=JOKES_FILE, help="Jokes file to serve")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.host, args.port, args.jokes))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,112 @@
+import json
+import os
+import random
+
+# Picks jokes in a random order without repeating any until every joke has been told.
+# It is a Fisher-Yates shuffle done one draw at a time: the jokes not told yet are the first
+# `remaining` slots of a virtual array, and each draw takes a random slot and moves the last one
+# into its place. Only slots that were actually moved are stored (in `moved`), so a draw is O(1)
+# and the state stays small however big the corpus is. Nothing is ever laid out for the whole corpus.
+#
+# - When the round is used up a new one starts, never beginning with the joke just told
+# - Jokes added to the corpus join the current round straight away (grow())
+# - An optional weight(index) function biases the order (e.g. newer jokes or some categories
+#   first) by rejection sampling on the draw, still without building the permutation
+# - save()/load() keep the round going across restarts
+
+MAX_TRIES = 32      # Weighted draws give up rejecting after this many tries and take the last candidate
+
+class ShuffleBag:
+    def __init__(self, size, weight=None, max_weight=1.0, rng=None):
+        self.size = size              # Number of jokes in the bag
+        self.remaining = size         # Jokes left in this round
+        self.moved = {}               # Slot -> joke index, only for slots that don't hold their own index
+        self.last = None              # Joke drawn most recently
+        self.weight = weight
+        self.max_weight = max_weight
+        self.rng = rng or random.Random()
+
+    def __len__(self):
+        return self.size
+
+    def _slot(self, position):
+        return self.moved.get(position, position)
+
+    def _setSlot(self, position, value):
+        if value == position:
+            self.moved.pop(position, None)
+        else:
+            self.moved[position] = value
+
+    # Starts a new round with every joke back in the bag
+    def reset(self):
+        self.remaining = self.size
+        self.moved = {}
+
+    # Adds jokes size..new_size-1 (new lines in the file) to the current round
+    def grow(self, new_size):
+        for index in range(self.size, new_size):
+            self._setSlot(self.remaining, index)
+            self.remaining += 1
+        self.size = max(self.size, new_size)
+
+    # Picks a slot still in the round, honouring the weights if there are any
+    def _pickSlot(self):
+        position = self.rng.randrange(self.remaining)
+        if self.weight is not None:
+            for _ in range(MAX_TRIES):
+                if self.rng.random() * self.max_weight < self.weight(self._slot(position)):
+                    break
+                position = self.rng.randrange(self.remaining)
+        return position
+
+    # Returns the next joke index, or None if the bag is empty
+    def draw(self):
+        if not self.size:
+            return None
+        if not self.remaining:
+            self.reset()
+        position = self._pickSlot()
+        if self._slot(position) == self.last and self.remaining > 1:
+            # First draw of a new round hit the joke that ended the last one: pick again
+            position = (position + 1 + self.rng.randrange(self.remaining - 1)) % self.remaining
+        value = self._slot(position)
+        last = self.remaining - 1
+        self._setSlot(position, self.moved.pop(last, last))
+        self.moved.pop(last, None)
+        self.remaining = last
+        self.last = value
+        return value
+
+    # Writes the round's state (written to a temporary file first so a crash never leaves half a file)
+    def save(self, path):
+        state = {"size": self.size, "remaining": self.remaining, "last": self.last,
+                 "moved": [[position, value] for position, value in self.moved.items()]}
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    # Restores a saved round for a corpus of `size` jokes. Starts a fresh round if there is no
+    # usable state or the corpus got smaller (jokes were edited or removed).
+    @classmethod
+    def load(cls, path, size, **kwargs):
+        bag = cls(size, **kwargs)
+        try:
+            with open(path) as f:
+                state = json.load(f)
+            saved_size = state["size"]
+            moved = {position: value for position, value in state["moved"]}
+            remaining = state["remaining"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return bag
+        if saved_size > size or not 0 <= remaining <= saved_size:
+            return bag
+        bag.size, bag.remaining, bag.moved, bag.last = saved_size, remaining, moved, state.get("last")
+        bag.grow(size)
+        return bag
+
+# Makes the newest jokes (the end of the file) up to `boost` times as likely to come early in a round
+def weight_by_recency(bag, boost=2.0):
+    bag.weight = lambda index: 1 + (boost - 1) * index / max(1, bag.size - 1)
+    bag.max_weight = boost
@@ -3,17 +3,36 @@ from tkinter import messagebox, simpledialog, ttk
 from PIL import Image, ImageTk
 import os
 
+# The shared asset pack reader (asset_pack.py, one folder up) is on the path when the app is
+# started through run.py. Started on its own, the app decodes its images from disk instead.
+try:
+    import asset_pack
+except ImportError:
+    asset_pack = None
+import grading
+import cohort_store
+import edit_history
+
 # File paths for background images, data storage, and the application icon.
-MENU_BG = "Assessment 1 - Skills Portfolio/Exercise3/smbackground2.png"      # Background image for the menu
-MAIN_BG = "Assessment 1 - Skills Portfolio/Exercise3/smbackground.png"       # Background image for other windows
-STUDENT_FILE = "Assessment 1 - Skills Portfolio/Exercise3/studentmarks.txt"  # File storing the student data
-ICON_IMG = "Assessment 1 - Skills Portfolio/Exercise3/student.png"           # Application icon
+# They sit next to this script, so the app runs from any folder.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MENU_BG = os.path.join(BASE_DIR, "smbackground2.png")      # Background image for the menu
+MAIN_BG = os.path.join(BASE_DIR, "smbackground.png")       # Background image for other windows
+STUDENT_FILE = os.path.join(BASE_DIR, "studentmarks.txt")  # File storing the student data
+ICON_IMG = os.path.join(BASE_DIR, "student.png")           # Application icon
+GRADING_FILE = os.path.join(BASE_DIR, "grading_schemes.json")  # Grading schemes and the one in use
+COHORTS_DIR = os.path.join(BASE_DIR, "cohorts")            # Partitioned cohorts (see cohort_store.py), if set up
 
 # Sets a background image for a Tkinter window that resizes to cover the window area while maintaining aspect ratio
 def add_responsive_background(win, image_path):
     try:
-        # Load the original image only if it hasn't been loaded before for this path
-        if not hasattr(win, "_bg_original") or win._bg_original_path != image_path:
+        # Use the pre-downscaled images in the asset pack when there is one, it needs no decoding
+        pack = asset_pack.openPack() if asset_pack else None
+        if pack and image_path in pack:
+            win._bg_original = None
+            win._bg_original_path = image_path
+        # Otherwise load the original image only if it hasn't been loaded before for this path
+        elif not hasattr(win, "_bg_original") or win._bg_original_path != image_path:
             win._bg_original = Image.open(image_path).convert("RGBA")
             win._bg_original_path = image_path
 
@@ -22,6 +41,8 @@ def add_responsive_background(win, image_path):
             w = max(1, win.winfo_width())
             h = max(1, win.winfo_height())
             orig = win._bg_original
+            if orig is None:
+                orig = pack.image(image_path, (w, h))    # Smallest packed variant that still covers the window
             ow, oh = orig.size
             # Calculate the scale factor
             scale = max(w / ow, h / oh)
@@ -68,107 +89,146 @@ def create_center_card(parent, relwidth=0.78, relheight=0.78, shadow_offset=(0.0
 
 # Loads student records from the specified file, calculates totals, percentages,
 # and grades for each student, and stores them in a list of dictionaries.
+# The file format is read by cohort_store.read_roster (it is the same for every cohort partition).
 def load_student_data(filename=STUDENT_FILE):
-    students = []
-    # Check if the first line is the student count
     try:
-        with open(filename, "r", encoding="utf-8") as file:
-            first = file.readline().strip()
-            try:
-                count = int(first)
-            except:
-                # If first line is not an integer, assume old format and reload all lines excluding the first read line
-                file.seek(0)
-                lines = [line.strip() for line in file if line.strip()]
-            else:
-                lines = []
-                for _ in range(count):
-                    line = file.readline().strip()
-                    if line:
-                        lines.append(line)
-
-           # Process each line of student data
-            for ln in lines:
-                parts = [p.strip() for p in ln.split(",")]
-                if len(parts) < 6:
-                    continue
-                code = parts[0]
-                name = parts[1]
-                # Convert marks to integers
-                try:
-                    c1, c2, c3 = int(parts[2]), int(parts[3]), int(parts[4])
-                    exam = int(parts[5])
-                except:
-                    continue     # Skip record if marks are not valid integers
-
-                # Calculate marks and percentages
-                coursework_total = c1 + c2 + c3
-                overall = coursework_total + exam
-                percentage = (overall / 160) * 100
-
-                # Determine the grade based on percentage using elif statement
-                if percentage >= 70:
-                    grade = "A"
-                elif percentage >= 60:
-                    grade = "B"
-                elif percentage >= 50:
-                    grade = "C"
-                elif percentage >= 40:
-                    grade = "D"
-                else:
-                    grade = "F"
-
-                students.append({
-                    "code": code,
-                    "name": name,
-                    "c1": c1,
-                    "c2": c2,
-                    "c3": c3,
-                    "coursework": coursework_total,
-                    "exam": exam,
-                    "percentage": percentage,
-                    "grade": grade
-                })
+        students = cohort_store.read_roster(filename)
     except FileNotFoundError:
         messagebox.showerror("Error", f"Student file not found:\n{filename}")
+        students = []
+    grade_roster(students)
     return students
 
+# Calculates coursework totals, percentages and grades for a whole roster in one pass
+def grade_roster(students):
+    grading.CohortGrader(students).apply(grading_scheme)
+
 # Writes the list of student dictionaries back to the file
 # Uses the new format (count on the first line)
 # Only saves the raw input fields (code, name, c1, c2, c3, exam)
 def save_students_to_file(students, filename=STUDENT_FILE):
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(f"{len(students)}\n")     # Write the count first
-            for s in students:
-                # Write only the fields needed for loading later
-                line = f"{s['code']},{s['name']},{s['c1']},{s['c2']},{s['c3']},{s['exam']}\n"
-                f.write(line)
+        cohort_store.write_roster(students, filename)
     except Exception as e:
         messagebox.showerror("Error", f"Failed to save file: {e}")
 
+# Grading schemes (marks per component, weights, grade boundaries) and the one in use
+grading_schemes, active_scheme = grading.load_schemes(GRADING_FILE)
+grading_scheme = grading_schemes[active_scheme]
+
+# With a cohorts folder, students are kept in one partition per cohort and term and only the
+# partition being looked at is loaded. Without one, everyone is in the single student file.
+store = None
+active_partition = None
+if cohort_store.CohortStore.exists(COHORTS_DIR):
+    store = cohort_store.CohortStore(COHORTS_DIR, grade=grade_roster)
+    active_partition = store.names()[0] if store.names() else None
+    if active_partition is None:
+        store = None
+
 # Load initial data when the script starts
-students = load_student_data()
+students = store.load(active_partition, pin=True) if store else load_student_data()
+# Re-grades the whole roster at once, with cached results per scheme
+grader = grading.CohortGrader(students)
+
+# Tags partition summaries with the grading weights their percentages were worked out with
+def grading_tag():
+    return list(grading_scheme.weighting_key())
+
+# Makes another cohort partition the one every window works on
+def select_partition(name):
+    global students, grader, active_partition
+    students = store.load(name, pin=True)
+    grader = grading.CohortGrader(students)
+    active_partition = name
+
+# Undo/redo of adds, edits and deletes, kept as the fields that changed
+history = edit_history.EditHistory()
+
+# The roster of a partition (the one being worked on is already loaded)
+def roster_of(partition):
+    return students if store is None or partition == active_partition else store.load(partition)
+
+# Where a student a window was opened on is now in its partition's roster, or None if they were removed.
+# Undo and redo can insert or remove students while the window is open, so its index may be out of date.
+# A partition dropped from memory and loaded again has new records, so those are matched by student number.
+def index_of_student(partition, student):
+    roster = roster_of(partition)
+    for i, other in enumerate(roster):
+        if other is student:
+            return i
+    for i, other in enumerate(roster):
+        if other['code'].lower() == student['code'].lower():
+            return i
+    return None
+
+# Partitions other than `partition` that already have a student number (student numbers are unique across all of them)
+def partitions_with_code(code, partition):
+    if store is None:
+        return []
+    return [name for name in store.partitions_with(code) if name != partition]
+
+# Saves a partition's roster (or the single student file). With changes (see cohort_store.save_changes)
+# only the records they touched are written, otherwise the whole roster is.
+def save_roster(changes=None, partition=None):
+    partition = partition or active_partition
+    roster = roster_of(partition)
+    if store is None and changes is None:
+        save_students_to_file(students)
+        return
+    try:
+        if store is None:
+            cohort_store.save_changes(STUDENT_FILE, students, changes)
+        elif changes is None:
+            store.save(partition, roster, grading_tag())
+        else:
+            store.save_changes(partition, roster, changes, grading_tag())
+    except OSError as e:
+        messagebox.showerror("Error", f"Failed to save file: {e}")
+
+# Carries out a step of changes (see edit_history.py) on a partition's roster, or undoes it,
+# then re-grades the students it touched and saves only their records
+def apply_step(partition, changes, undo=False):
+    saves = edit_history.apply_changes(roster_of(partition), changes, undo)
+    for _, _, s in saves:
+        if s is not None:
+            recalc_student(s)
+    grader.invalidate()
+    save_roster(saves, partition)
+
+# Makes one change to a partition's roster (the one being worked on by default) and remembers it for undo.
+# Windows pass the partition they were opened on, the cohort picker may have moved on since.
+def change_roster(change, label, partition=None):
+    partition = partition or active_partition
+    apply_step(partition, [change])
+    history.record(partition, [change], label)
+
+# Switches every student to another grading scheme (or new boundaries for one) and remembers the choice
+def set_grading_scheme(scheme):
+    global grading_scheme, active_scheme
+    grading_scheme, active_scheme = scheme, scheme.name
+    grading_schemes[scheme.name] = scheme
+    grader.apply(scheme)
+    if store is not None:
+        store.regraded()    # Other loaded partitions are re-graded when next loaded
+    try:
+        grading.save_schemes(GRADING_FILE, grading_schemes, active_scheme)
+    except OSError as e:
+        messagebox.showerror("Error", f"Failed to save grading schemes: {e}")
 
 # Recalculates the coursework total, overall percentage, and final grade for a single student dictionary 's'.
 # This is called after adding or updating marks
 def recalc_student(s):
-    # Use .get() with default 0 in case a key is missing
-    s['coursework'] = s.get('c1', 0) + s.get('c2', 0) + s.get('c3', 0)
-    overall = s['coursework'] + s.get('exam', 0)
-    # Recalculate percentage
-    s['percentage'] = (overall / 160) * 100 if overall >= 0 else 0
-    pct = s['percentage']
-    # Recalculate grade
-    s['grade'] = "F"
-    if pct >= 70:
-        s['grade'] = "A"
-    elif pct >= 60:
-        s['grade'] = "B"
-    elif pct >= 50:
-        s['grade'] = "C"
-    elif pct >= 40:
-        s['grade'] = "D"
+    # The active grading scheme decides the percentage and grade
+    grading_scheme.apply(s)
+    # The roster changed, so cached whole-cohort grades are out of date
+    grader.invalidate()
+
+# Labels for the add/update forms, showing the mark ranges of the active grading scheme
+def form_labels():
+    m = grading_scheme.maxima
+    return ["Student Number:", "Name:", f"Coursework 1 (0-{m['c1']}):", f"Coursework 2 (0-{m['c2']}):",
+            f"Coursework 3 (0-{m['c3']}):", f"Exam (0-{m['exam']}):"]
 
 # Window to display individual student details in a simple format
 class ShowStudentWindow(tk.Toplevel):
@@ -191,8 +251,8 @@ class ShowStudentWindow(tk.Toplevel):
         txt = (
             f"Student Name: {student['name']}\n"
             f"Student Number: {student['code']}\n\n"
-            f"Coursework: {student['c1']}, {student['c2']}, {student['c3']}  (Total: {student['coursework']} / 60)\n"
-            f"Exam Mark: {student['exam']} / 100\n"
+            f"Coursework: {student['c1']}, {student['c2']}, {student['c3']}  (Total: {student['coursework']} / {grading_scheme.coursework_max})\n"
+            f"Exam Mark: {student['exam']} / {grading_scheme.maxima['exam']}\n"
             f"Overall Percentage: {student['percentage']:.2f}%\n"
             f"Grade: {student['grade']}\n"
         )
@@ -230,7 +290,7 @@ class TableWindowBase(tk.Toplevel):
         cols = ("code", "name", "coursework", "exam", "percentage", "grade")
         self.tree = ttk.Treeview(self.table_frame, columns=cols, show="headings")
         for c in cols:
-            text = c.title() if c != "coursework" else "Coursework (/60)"
+            text = c.title() if c != "coursework" else f"Coursework (/{grading_scheme.coursework_max})"
             self.tree.heading(c, text=text)
         # Define column widths and alignment
         self.tree.column("code", width=110, anchor="center")
@@ -269,7 +329,8 @@ class ViewAllWindow(TableWindowBase):
         for s in students:
             # Format coursework marks into a single string
             rows.append((s["code"], s["name"], f"{s['c1']},{s['c2']},{s['c3']}", str(s["exam"]), f"{s['percentage']:.2f}", s["grade"]))
-        super().__init__(parent, "All Student Records", rows)
+        title = f"All Student Records ({active_partition})" if active_partition else "All Student Records"
+        super().__init__(parent, title, rows)
         
 # Specific window to display sorted student records
 class SortedWindow(TableWindowBase):
@@ -280,9 +341,12 @@ class SortedWindow(TableWindowBase):
         super().__init__(parent, f"Sorted Student Records ({order_label})", rows)
 
 # A generic window that displays all students in a Treeview and allows the user to select one record to perform an action (delete or update)
+# callback(idx, student, partition) gets the partition the window was opened on.
 class SelectionWindow(tk.Toplevel):
     def __init__(self, parent, title, callback):
         super().__init__(parent)
+        self.partition = active_partition
+        self.roster = students
         self.title(title)
         self.geometry("900x500")
         add_responsive_background(self, MAIN_BG)
@@ -315,7 +379,7 @@ class SelectionWindow(tk.Toplevel):
         self.tree.pack(fill="both", expand=True, side="left")
 
         # Populate the treeview, using the list index as the Item ID
-        for idx, s in enumerate(students):
+        for idx, s in enumerate(self.roster):
             self.tree.insert("", "end", iid=str(idx), values=(
                 s["code"], s["name"], f"{s['c1']},{s['c2']},{s['c3']}", s["exam"],
                 f"{s['percentage']:.2f}", s['grade']
@@ -330,10 +394,10 @@ class SelectionWindow(tk.Toplevel):
             if not sel:
                 messagebox.showinfo("Select", "Please select a student first.")
                 return
-            # The iid is the index in the global 'students' list
+            # The iid is the index in the roster shown
             idx = int(sel[0])
             self.destroy()
-            callback(idx, students[idx]) # Execute the action function(delete or update)
+            callback(idx, self.roster[idx], self.partition) # Execute the action function(delete or update)
 
         # Action buttons
         tk.Button(btn_frame, text="Select", bg="#1f3a5f", fg="white", font=("Segoe UI", 11, "bold"),
@@ -348,6 +412,7 @@ class SelectionWindow(tk.Toplevel):
 class AddStudentWindow(tk.Toplevel):
     def __init__(self, parent, on_added=None):
         super().__init__(parent)
+        self.partition = active_partition    # The student joins the partition shown when the window opened
         self.title("Add Student")
         self.geometry("420x420")
         add_responsive_background(self, MAIN_BG)
@@ -363,7 +428,7 @@ class AddStudentWindow(tk.Toplevel):
         form.columnconfigure(1, weight=1)
 
         # Create input fields and labels
-        labels = ["Student Number:", "Name:", "Coursework 1 (0-20):", "Coursework 2 (0-20):", "Coursework 3 (0-20):", "Exam (0-100):"]
+        labels = form_labels()
         keys = ["code", "name", "c1", "c2", "c3", "exam"]
         self.entries = {}
         for i, (lbl, key) in enumerate(zip(labels, keys)):
@@ -389,18 +454,21 @@ class AddStudentWindow(tk.Toplevel):
             if not code or not name:
                 messagebox.showerror("Error", "Code and name required.")
                 return
-            if any(other['code'].lower() == code.lower() for other in students):
+            roster = roster_of(self.partition)
+            if any(other['code'].lower() == code.lower() for other in roster):
                 messagebox.showerror("Error", "A student with this number already exists.")
                 return
-            if not (0 <= c1 <= 20 and 0 <= c2 <= 20 and 0 <= c3 <= 20 and 0 <= exam <= 100):
+            elsewhere = partitions_with_code(code, self.partition)
+            if elsewhere:
+                messagebox.showerror("Error", f"A student with this number already exists in {', '.join(elsewhere)}.")
+                return
+            if not grading_scheme.in_range({"c1": c1, "c2": c2, "c3": c3, "exam": exam}):
                 messagebox.showerror("Error", "Marks out of range.")
                 return
             
-            # Create new student record
+            # Add the new student record at the end and save it
             new = {"code": code, "name": name, "c1": c1, "c2": c2, "c3": c3, "exam": exam}
-            recalc_student(new)
-            students.append(new)
-            save_students_to_file(students)    # Save updated list
+            change_roster(("insert", len(roster), new), f"adding {name}", self.partition)
             messagebox.showinfo("Added", f"Student {name} added.")
             if callable(on_added):
                 on_added()
@@ -419,13 +487,14 @@ class AddStudentWindow(tk.Toplevel):
 
 # Window for editing marks and details of an existing student record
 class EditStudentWindow(tk.Toplevel):
-    def __init__(self, parent, idx, student, on_saved=None):
+    def __init__(self, parent, partition, idx, student, on_saved=None):
         super().__init__(parent)
         self.title(f"Update: {student['name']} ({student['code']})")
         self.geometry("420x420")
         add_responsive_background(self, MAIN_BG)
 
-        self.idx = idx           # Index in the global students list
+        self.partition = partition   # Partition the student is in (not necessarily the one shown now)
+        self.idx = idx               # Index in that partition's roster when the window opened
         self.student = student
         self.on_saved = on_saved
 
@@ -440,7 +509,7 @@ class EditStudentWindow(tk.Toplevel):
         form.columnconfigure(1, weight=1)
 
         # Create input fields and labels
-        labels = ["Student Number:", "Name:", "Coursework 1 (0-20):", "Coursework 2 (0-20):", "Coursework 3 (0-20):", "Exam (0-100):"]
+        labels = form_labels()
         keys = ["code", "name", "c1", "c2", "c3", "exam"]
         self.entries = {}
         for i, (lbl, key) in enumerate(zip(labels, keys)):
@@ -459,6 +528,13 @@ class EditStudentWindow(tk.Toplevel):
 
        # Verify input, update student record in the list, and save to file
         def on_save():
+            # Find the student again, an undo or redo since the window opened may have moved them
+            idx = index_of_student(self.partition, self.student)
+            if idx is None:
+                messagebox.showerror("Error", f"Student {self.student['name']} is no longer in the records.")
+                self.destroy()
+                return
+            student = roster_of(self.partition)[idx]
             new_code = self.entries["code"].get().strip()
             new_name = self.entries["name"].get().strip()
             # Check for valid integers and range
@@ -474,23 +550,23 @@ class EditStudentWindow(tk.Toplevel):
                 messagebox.showerror("Error", "Code and name required.")
                 return
             # Check for duplicate student code
-            for i, other in enumerate(students):
-                if i != self.idx and other['code'].lower() == new_code.lower():
+            for i, other in enumerate(roster_of(self.partition)):
+                if i != idx and other['code'].lower() == new_code.lower():
                     messagebox.showerror("Error", "Another student already has that code.")
                     return
-            if not (0 <= nc1 <= 20 and 0 <= nc2 <= 20 and 0 <= nc3 <= 20 and 0 <= ne <= 100):
+            elsewhere = partitions_with_code(new_code, self.partition) if new_code.lower() != student['code'].lower() else []
+            if elsewhere:
+                messagebox.showerror("Error", f"Another student in {', '.join(elsewhere)} already has that code.")
+                return
+            if not grading_scheme.in_range({"c1": nc1, "c2": nc2, "c3": nc3, "exam": ne}):
                 messagebox.showerror("Error", "Marks out of range.")
                 return
             
-            # Update the student dictionary in the global list
-            student['code'] = new_code
-            student['name'] = new_name
-            student['c1'] = nc1
-            student['c2'] = nc2
-            student['c3'] = nc3
-            student['exam'] = ne
-            recalc_student(student)   # Recalculate derived fields(percentage, grade)
-            save_students_to_file(students)
+            # Update the student in the global list, keeping just the fields that changed for undo
+            delta = edit_history.field_delta(student, {"code": new_code, "name": new_name,
+                                                       "c1": nc1, "c2": nc2, "c3": nc3, "exam": ne})
+            if delta:
+                change_roster(("edit", idx, delta), f"the update of {new_name}", self.partition)
             messagebox.showinfo("Saved", f"Student {student['name']} updated.")
             if callable(self.on_saved):
                 self.on_saved()
@@ -507,6 +583,101 @@ class EditStudentWindow(tk.Toplevel):
         if hasattr(self, "_bg_label"):
             self._bg_label.lower()
 
+# Window for switching grading scheme. Shows the grade spread of the whole roster under the
+# chosen scheme and boundaries before anything is changed, so "what-if" boundaries can be tried out.
+class GradingSchemeWindow(tk.Toplevel):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Grading Scheme")
+        self.geometry("480x400")
+        add_responsive_background(self, MAIN_BG)
+
+        shadow, card = create_center_card(self, relwidth=0.92, relheight=0.92)
+
+        header = tk.Label(card, text="Grading Scheme", bg="white", fg="#1f3a5f",
+                          font=("Segoe UI", 14, "bold"))
+        header.pack(pady=(10,6))
+
+        form = tk.Frame(card, bg="white")
+        form.pack(padx=12, pady=6, fill="x")
+        form.columnconfigure(1, weight=1)
+
+        tk.Label(form, text="Scheme:", bg="white", anchor="w").grid(row=0, column=0, sticky="w", pady=6)
+        self.scheme_box = ttk.Combobox(form, values=list(grading_schemes), state="readonly")
+        self.scheme_box.grid(row=0, column=1, sticky="ew", pady=6, padx=(8,0))
+        self.scheme_box.set(active_scheme)
+        self.scheme_box.bind("<<ComboboxSelected>>", self.on_scheme_selected)
+
+        tk.Label(form, text="Boundaries:", bg="white", anchor="w").grid(row=1, column=0, sticky="w", pady=6)
+        self.boundaries_entry = tk.Entry(form)
+        self.boundaries_entry.grid(row=1, column=1, sticky="ew", pady=6, padx=(8,0))
+        self.boundaries_entry.bind("<Return>", lambda event: self.preview())
+
+        # Grade spread of every student under the scheme being looked at
+        self.summary = tk.Label(card, text="", justify="left", anchor="nw", bg="white",
+                                fg="#222222", font=("Segoe UI", 11))
+        self.summary.pack(fill="both", expand=True, padx=16, pady=6)
+
+        btns = tk.Frame(card, bg="white")
+        btns.pack(pady=8)
+        tk.Button(btns, text="Preview", bg="#1f3a5f", fg="white", bd=0, font=("Segoe UI", 11, "bold"),
+                  command=self.preview).pack(side="left", padx=6)
+        tk.Button(btns, text="Apply", bg="#1f3a5f", fg="white", bd=0, font=("Segoe UI", 11, "bold"),
+                  command=self.on_apply).pack(side="left", padx=6)
+        tk.Button(btns, text="Cancel", bg="#999", fg="white", bd=0, font=("Segoe UI", 11),
+                  command=self.destroy).pack(side="left", padx=6)
+
+        self.on_scheme_selected()
+
+        if hasattr(self, "_bg_label"):
+            self._bg_label.lower()
+
+    # Fills in the chosen scheme's boundaries and previews it
+    def on_scheme_selected(self, event=None):
+        self.boundaries_entry.delete(0, tk.END)
+        self.boundaries_entry.insert(0, grading_schemes[self.scheme_box.get()].boundaries_text())
+        self.preview()
+
+    # The chosen scheme with the boundaries typed in, or None (after saying why) if they don't parse
+    def chosen_scheme(self):
+        try:
+            boundaries = grading.parse_boundaries(self.boundaries_entry.get())
+        except ValueError as e:
+            messagebox.showerror("Error", f"Boundaries must look like A=70, B=60, C=50: {e}")
+            return None
+        return grading_schemes[self.scheme_box.get()].with_boundaries(boundaries)
+
+    def preview(self):
+        scheme = self.chosen_scheme()
+        if scheme is None:
+            return
+        counts = grader.distribution(scheme)
+        m = scheme.maxima
+        lines = [f"Marks: coursework {m['c1']} + {m['c2']} + {m['c3']}, exam {m['exam']}",
+                 f"Students: {len(students)}    Average %: {grader.average(scheme):.2f}", ""]
+        lines += [f"{grade}: {count}" for grade, count in counts.items()]
+        self.summary.config(text="\n".join(lines))
+
+    # Makes the chosen scheme the active one for every student
+    def on_apply(self):
+        scheme = self.chosen_scheme()
+        if scheme is None:
+            return
+        # Every partition is graded with the scheme, the others are checked from the manifest
+        outside = [active_partition or "Students"] if any(not scheme.in_range(s) for s in students) else []
+        if store is not None:
+            for name in store.names():
+                span = store.mark_span(name) if name != active_partition else None
+                if span is not None and not scheme.span_in_range(span):
+                    outside.append(name)
+        if outside:
+            messagebox.showerror("Error", "Some students have marks above this scheme's maximum in: "
+                                 + ", ".join(outside))
+            return
+        set_grading_scheme(scheme)
+        messagebox.showinfo("Grading", f"Everyone is now graded with {scheme.name}.")
+        self.destroy()
+
 # The main application window and primary menu
 class StudentManagerApp(tk.Tk):
     def __init__(self):
@@ -517,7 +688,8 @@ class StudentManagerApp(tk.Tk):
 
         # Set application icon
         try:
-            icon_img = Image.open(ICON_IMG)
+            pack = asset_pack.openPack() if asset_pack else None
+            icon_img = pack.image(ICON_IMG) if pack and ICON_IMG in pack else Image.open(ICON_IMG)
             icon_photo = ImageTk.PhotoImage(icon_img)
             self.iconphoto(True, icon_photo)
         except Exception as e:
@@ -534,6 +706,16 @@ class StudentManagerApp(tk.Tk):
                          font=("Segoe UI", 20, "bold"))
         title.pack(pady=(18,12))
 
+        # Cohort/term picker when the students are partitioned
+        if store is not None:
+            cohort_frame = tk.Frame(card_main, bg="white")
+            cohort_frame.pack(pady=(0,4))
+            tk.Label(cohort_frame, text="Cohort:", bg="white", font=("Segoe UI", 11)).pack(side="left", padx=(0,6))
+            self.cohort_box = ttk.Combobox(cohort_frame, values=store.names(), state="readonly", width=24)
+            self.cohort_box.set(active_partition)
+            self.cohort_box.pack(side="left")
+            self.cohort_box.bind("<<ComboboxSelected>>", lambda event: select_partition(self.cohort_box.get()))
+
         btn_frame = tk.Frame(card_main, bg="white")
         btn_frame.pack(pady=8, fill="both", expand=True)
   
@@ -550,8 +732,18 @@ class StudentManagerApp(tk.Tk):
         tk.Button(btn_frame, text=" + Add Student Record", command=self.on_add, **btn_cfg).pack(pady=6)
         tk.Button(btn_frame, text=" Delete Student Record", command=self.on_delete, **btn_cfg).pack(pady=6)
         tk.Button(btn_frame, text=" Update Student Record", command=self.on_update, **btn_cfg).pack(pady=6)
-
-        tk.Button(btn_frame, text=" Exit", command=self.quit, **btn_cfg).pack(pady=(12,6))
+        tk.Button(btn_frame, text=" Grading Scheme", command=self.on_grading, **btn_cfg).pack(pady=6)
+
+        # Undo and redo share the bottom row with Exit, they are also on Ctrl+Z and Ctrl+Y
+        last_row = tk.Frame(btn_frame, bg="white")
+        last_row.pack(pady=(12,6))
+        small_cfg = dict(btn_cfg, width=8)
+        tk.Button(last_row, text=" ↶ Undo", command=self.on_undo, **small_cfg).pack(side="left", padx=(0,4))
+        tk.Button(last_row, text=" ↷ Redo", command=self.on_redo, **small_cfg).pack(side="left", padx=4)
+        tk.Button(last_row, text=" Exit", command=self.quit, **small_cfg).pack(side="left", padx=(4,0))
+        # Bound on the main window only, so they don't fire while typing in an add or update form
+        self.bind("<Control-z>", lambda event: self.on_undo())
+        self.bind("<Control-y>", lambda event: self.on_redo())
 
         if hasattr(self, "_bg_label"):
             self._bg_label.lower()
@@ -566,6 +758,13 @@ class StudentManagerApp(tk.Tk):
         if not q:
             return
         ql = q.lower()
+        # An exact student number is looked up in every partition through their code indexes
+        if store is not None:
+            found = store.find_code(q.strip())
+            if found:
+                name, _, student = found
+                ShowStudentWindow(self, f"Student Record ({name})", student)
+                return
         # Linear search for the student
         for s in students:
             if ql in s['code'].lower() or ql in s['name'].lower():
@@ -575,6 +774,9 @@ class StudentManagerApp(tk.Tk):
 
     # Finds and displays the student with the highest overall percentage
     def on_highest(self):
+        if store is not None:
+            self.show_extreme("Highest Overall Score", highest=True)
+            return
         if not students:
             messagebox.showinfo("No data", "No student records loaded.")
             return
@@ -584,6 +786,9 @@ class StudentManagerApp(tk.Tk):
 
     # Finds and displays the student with the lowest overall percentage
     def on_lowest(self):
+        if store is not None:
+            self.show_extreme("Lowest Overall Score", highest=False)
+            return
         if not students:
             messagebox.showinfo("No data", "No student records loaded.")
             return
@@ -591,6 +796,17 @@ class StudentManagerApp(tk.Tk):
         low = min(students, key=lambda x: x['percentage'])
         ShowStudentWindow(self, "Lowest Overall Score", low)
 
+    # Shows the best or worst student across all partitions, found from the partition summaries
+    def show_extreme(self, title, highest):
+        found = store.extreme(grading_tag(), highest)
+        if found is None:
+            messagebox.showinfo("No data", "No student records loaded.")
+            return
+        name, record = found
+        student = dict(record)
+        grading_scheme.apply(student)    # The summary keeps the marks, the grade comes from the active scheme
+        ShowStudentWindow(self, f"{title} ({name})", student)
+
     # Prompts for sort order and opens a window with the sorted table
     def on_sort(self):
         if not students:
@@ -605,28 +821,52 @@ class StudentManagerApp(tk.Tk):
         sorted_students = sorted(students, key=lambda x: x['percentage'], reverse=reverse)
         SortedWindow(self, sorted_students, order.lower())
 
+    # Opens the window for switching grading scheme
+    def on_grading(self):
+        GradingSchemeWindow(self)
+
     # Opens the AddStudentWindow
     def on_add(self):
         AddStudentWindow(self)
 
     # Opens the selection window to choose a student, then prompts for delete confirmation
     def on_delete(self):
-        def do_delete(idx, student):
+        def do_delete(idx, student, partition):
             # The callback function executed after selection
             confirm = messagebox.askyesno("Confirm Delete", f"Delete student {student['name']} ({student['code']})?")
             if confirm:
-                students.pop(idx)      # Remove student from the global list
-                save_students_to_file(students)   # Save the modified list
+                # Remove student from the partition's roster and save
+                change_roster(("remove", idx, edit_history.raw_record(student)), f"deleting {student['name']}", partition)
                 messagebox.showinfo("Deleted", f"Student {student['name']} deleted.")
         SelectionWindow(self, "Select student to DELETE", do_delete)
 
+    # Undoes the last add, update or delete (in whichever cohort it was made)
+    def on_undo(self):
+        step = history.undo()
+        if step is None:
+            messagebox.showinfo("Undo", "Nothing to undo.")
+            return
+        partition, changes, label = step
+        apply_step(partition, changes, undo=True)
+        messagebox.showinfo("Undo", f"Undid {label}.")
+
+    # Carries out the last undone change again
+    def on_redo(self):
+        step = history.redo()
+        if step is None:
+            messagebox.showinfo("Redo", "Nothing to redo.")
+            return
+        partition, changes, label = step
+        apply_step(partition, changes)
+        messagebox.showinfo("Redo", f"Redid {label}.")
+
     # Opens the selection window to choose a student, then opens the EditStudentWindow
     def on_update(self):
-        def open_edit(idx, student):
+        def open_edit(idx, student, partition):
             # The callback function executed after selection
             def refresh_callback():
                 pass     # A placeholder refresh callback if required later
-            EditStudentWindow(self, idx, student, on_saved=refresh_callback)
+            EditStudentWindow(self, partition, idx, student, on_saved=refresh_callback)
         SelectionWindow(self, "Select student to UPDATE", open_edit)
 
 if __name__ == "__main__":
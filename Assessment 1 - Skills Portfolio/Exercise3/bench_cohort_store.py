@@ -0,0 +1,73 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import cohort_store
+import grading
+
+# Flat roster versus partitioned cohorts, for a deployment with many cohorts and terms:
+# - open: load the single student file, or open the store and load the partition being looked at
+# - highest: best student overall from the full roster, or from the partition summaries
+# - find code: scan the full roster, or find the partition through the .codes files and load it
+#   ("again" is the same lookup with the partition already loaded)
+#   python bench_cohort_store.py --partitions 40 --students 25000
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark partitioned cohort storage.")
+    parser.add_argument("--partitions", type=int, default=40)
+    parser.add_argument("--students", type=int, default=25000, help="Students per partition")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    scheme = grading.GradingScheme.from_dict("Standard", grading.DEFAULT_SCHEMES["Standard"])
+    grade = lambda students: grading.CohortGrader(students).apply(scheme)
+    tag = list(scheme.weighting_key())
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        flat_file = os.path.join(work_dir, "studentmarks.txt")
+        store = cohort_store.CohortStore(os.path.join(work_dir, "cohorts"))
+        everyone = []
+        for p in range(args.partitions):
+            roster = [{"code": f"{p:03d}{i:06d}", "name": f"Student {p}-{i}", "c1": rng.randint(0, 20),
+                       "c2": rng.randint(0, 20), "c3": rng.randint(0, 20), "exam": rng.randint(0, 100)}
+                      for i in range(args.students)]
+            grade(roster)
+            store.save(store.add(2000 + p // 3, ("Autumn", "Spring", "Summer")[p % 3]), roster, tag)
+            everyone += roster
+        cohort_store.write_roster(everyone, flat_file)
+        del everyone
+        target = f"{args.partitions // 2:03d}{args.students // 2:06d}"
+
+        def load_flat():
+            roster = cohort_store.read_roster(flat_file)
+            grade(roster)
+            return roster
+
+        flat_ms, flat = timed(load_flat)
+        store = cohort_store.CohortStore(store.directory, grade=grade)
+        open_ms, _ = timed(lambda: store.load(store.names()[0], pin=True))
+        rows = [("open", flat_ms, open_ms)]
+        rows.append(("highest",
+                     timed(lambda: max(flat, key=lambda s: s["percentage"]))[0],
+                     timed(lambda: store.extreme(tag, highest=True))[0]))
+        flat_find = lambda: next(s for s in flat if s["code"].lower() == target)
+        rows.append(("find code", timed(flat_find)[0], timed(lambda: store.find_code(target))[0]))
+        rows.append(("again", timed(flat_find)[0], timed(lambda: store.find_code(target))[0]))
+
+        total = args.partitions * args.students
+        print(f"{total:,} students in {args.partitions} partitions of {args.students:,}")
+        print(f"{'':<12}{'flat':>12}{'partitioned':>14}   ms")
+        for name, flat_time, store_time in rows:
+            print(f"{name:<12}{flat_time:>12.1f}{store_time:>14.1f}")
+        print(f"Segments loaded: {store.loads}   resident: {store.resident_bytes / 1e6:.1f} MB of {store.memory_cap / 1e6:.0f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import random
+import time
+
+import grading
+
+# Re-grading a whole cohort under different grading schemes:
+# - per-student loop: GradingScheme.apply on every record, the way recalc_student grades one student
+# - CohortGrader, first scheme: copies the marks into columns, then one vectorized pass
+# - CohortGrader, what-if boundaries: same weights, new boundaries, so only the grades are redone
+# - CohortGrader, cached: a scheme that was already graded
+#   python bench_grading.py --students 1000000
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark whole-cohort re-grading.")
+    parser.add_argument("--students", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    students = [{"c1": rng.randint(0, 20), "c2": rng.randint(0, 20), "c3": rng.randint(0, 20),
+                 "exam": rng.randint(0, 100)} for _ in range(args.students)]
+    standard = grading.GradingScheme.from_dict("Standard", grading.DEFAULT_SCHEMES["Standard"])
+    strict = standard.with_boundaries({"A": 80, "B": 70, "C": 60, "D": 50})
+
+    print(f"{args.students:,} students, numpy available: {grading.np is not None}")
+    print(f"{'':<34}{'python':>12}{'numpy':>12}   ms")
+    loop = timed(lambda: [standard.apply(s) for s in students])
+    print(f"{'per-student loop':<34}{loop:>12.1f}{'':>12}")
+    rows = {"first scheme (columns + grades)": [], "what-if boundaries": [], "cached scheme": []}
+    for use_numpy in (False, True):
+        if use_numpy and grading.np is None:
+            for times in rows.values():
+                times.append(None)
+            break
+        grader = grading.CohortGrader(students, use_numpy=use_numpy)
+        rows["first scheme (columns + grades)"].append(timed(lambda: grader.distribution(standard)))
+        rows["what-if boundaries"].append(timed(lambda: grader.distribution(strict)))
+        rows["cached scheme"].append(timed(lambda: grader.distribution(standard)))
+    for name, times in rows.items():
+        print(f"{name:<34}" + "".join(f"{t:>12.1f}" if t is not None else f"{'n/a':>12}" for t in times))
+
+if __name__ == "__main__":
+    main()
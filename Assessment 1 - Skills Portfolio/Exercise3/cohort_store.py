@@ -0,0 +1,431 @@
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+from collections import OrderedDict
+
+# Student records split into one partition per cohort and term, loaded only when needed.
+#   cohorts/manifest.json           the partitions, their segment files and a summary of each
+#   cohorts/<cohort>-<term>.txt     one segment per partition, in the studentmarks.txt format
+#   cohorts/<cohort>-<term>.codes   sorted student numbers of that segment
+# - Partitions are loaded on demand and kept in an LRU. When the resident ones go over the memory
+#   cap the least recently used are dropped (the one being worked on is pinned and never dropped).
+# - Each partition's summary in the manifest holds its count and its highest and lowest student,
+#   so the best and worst student overall are found without loading any segment. It also keeps
+#   the lowest and highest mark of each component, to check a grading scheme against every
+#   partition without loading them. Summaries are
+#   tagged with the grading weights they were worked out under, and a stale one is redone once.
+# - The .codes files answer "which partition has student number X" without loading segments.
+#   The manifest also keeps each partition's lowest and highest number, so most .codes files
+#   don't even need reading.
+# - Small changes (see edit_history.py) are appended to a roster's journal, <roster>.journal, as
+#   "set|insert|remove <index> [record]" lines instead of rewriting the whole roster. Reading a
+#   roster replays its journal, and the next full write folds it in. Every full write ends the
+#   roster with a "generation <id>" line after its records (readers stop at the count, so they
+#   never see it), and the journal's first line names the generation it applies to. That survives
+#   a checkout, a copy or a touch, unlike the file's size and time. A journal that doesn't match
+#   its roster is never replayed or thrown away: it is moved to <roster>.journal.unmatched with a
+#   warning, so the changes in it can still be recovered by hand.
+#   python cohort_store.py import studentmarks.txt --cohort 2024 --term Autumn
+#   python cohort_store.py list
+
+MANIFEST = "manifest.json"
+MEMORY_CAP = 64 << 20       # Estimated bytes of resident partitions before old ones are dropped
+MARK_FIELDS = ("c1", "c2", "c3", "exam")
+JOURNAL = ".journal"
+JOURNAL_MIN = 64            # Journal lines always allowed before a save rewrites the whole roster
+
+# Reads a roster file: a count line then "code,name,c1,c2,c3,exam" lines (or, in the old
+# format, no count line). Records with missing fields or marks that aren't integers are skipped.
+# Returns a list of {code, name, c1, c2, c3, exam} dictionaries.
+def read_roster(filename):
+    students = []
+    with open(filename, "r", encoding="utf-8") as file:
+        # Check if the first line is the student count
+        first = file.readline().strip()
+        try:
+            count = int(first)
+        except ValueError:
+            # If first line is not an integer, assume old format and reload all lines
+            file.seek(0)
+            lines = [line.strip() for line in file if line.strip()]
+        else:
+            lines = []
+            for _ in range(count):
+                line = file.readline().strip()
+                if line:
+                    lines.append(line)
+
+    # Process each line of student data
+    for ln in lines:
+        student = _parse_record(ln)
+        if student is not None:
+            students.append(student)
+    _replay_journal(filename, students)
+    return students
+
+# One "code,name,c1,c2,c3,exam" line as a student dictionary, or None if it isn't valid
+def _parse_record(line):
+    parts = [p.strip() for p in line.split(",")]
+    if len(parts) < 6:
+        return None
+    # Convert marks to integers
+    try:
+        c1, c2, c3, exam = int(parts[2]), int(parts[3]), int(parts[4]), int(parts[5])
+    except ValueError:
+        return None      # Skip record if marks are not valid integers
+    return {"code": parts[0], "name": parts[1], "c1": c1, "c2": c2, "c3": c3, "exam": exam}
+
+def _record_line(s):
+    return f"{s['code']},{s['name']},{s['c1']},{s['c2']},{s['c3']},{s['exam']}"
+
+# {mark field: [lowest, highest]} over a roster, None for an empty one
+def _mark_span(students):
+    if not students:
+        return None
+    return {f: [min(s[f] for s in students), max(s[f] for s in students)] for f in MARK_FIELDS}
+
+# The generation id at the end of a roster file, or None if it has none (never written by write_roster)
+def _generation(filename):
+    with open(filename, "rb") as f:
+        f.seek(max(0, os.fstat(f.fileno()).st_size - 128))
+        tail = f.read().decode("utf-8", errors="replace").split()
+    if len(tail) >= 2 and tail[-2] == "generation":
+        return tail[-1]
+    return None
+
+# "base <generation>" for the roster file as it is now, or None if it has no generation
+def _journal_base(filename):
+    generation = _generation(filename)
+    return f"base {generation}" if generation else None
+
+# Moves a journal that doesn't belong to its roster out of the way, keeping what is in it
+def _set_aside_journal(filename):
+    target, n = filename + JOURNAL + ".unmatched", 2
+    while os.path.exists(target):
+        target, n = f"{filename}{JOURNAL}.unmatched.{n}", n + 1
+    os.replace(filename + JOURNAL, target)
+    print(f"Warning: {filename + JOURNAL} doesn't match {filename} (it was changed outside the app), "
+          f"the edits in it were moved to {target}")
+
+# Applies a roster's journal (if it has one that belongs to it) to the students read from it
+def _replay_journal(filename, students):
+    try:
+        with open(filename + JOURNAL, encoding="utf-8") as f:
+            base = _journal_base(filename)
+            if base is None or f.readline().strip() != base:
+                f.close()
+                _set_aside_journal(filename)
+                return
+            for line in f:
+                op, _, rest = line.rstrip("\n").partition(" ")
+                index, _, record = rest.partition(" ")
+                try:
+                    index = int(index)
+                except ValueError:
+                    continue
+                if op == "remove":
+                    if 0 <= index < len(students):
+                        students.pop(index)
+                    continue
+                student = _parse_record(record)
+                if student is None:
+                    continue     # Half-written line at the end
+                if op == "set" and 0 <= index < len(students):
+                    students[index] = student
+                elif op == "insert":
+                    students.insert(min(index, len(students)), student)
+    except FileNotFoundError:
+        pass
+
+# Lines in a roster's journal, not counting its base line, or None if it has no journal that belongs to it
+def journal_length(filename):
+    try:
+        with open(filename + JOURNAL, encoding="utf-8") as f:
+            base = _journal_base(filename)
+            if base is None or f.readline().strip() != base:
+                return None
+            return sum(1 for _ in f)
+    except FileNotFoundError:
+        return None
+
+# Saves positional changes to a roster: ("set", index, student), ("insert", index, student) or
+# ("remove", index, None), each on the roster as it is after the changes before it.
+# They are appended to the journal while it is short compared with the roster, otherwise the whole
+# roster is written (and the journal folded in). Returns True if only the journal was written.
+def save_changes(filename, students, changes):
+    # A roster without a generation (not written by write_roster yet) is written in full first
+    if not os.path.exists(filename) or _journal_base(filename) is None:
+        write_roster(students, filename)
+        return False
+    length = journal_length(filename)
+    if (length or 0) + len(changes) > max(JOURNAL_MIN, len(students) // 10):
+        write_roster(students, filename)
+        return False
+    if length is None and os.path.exists(filename + JOURNAL):
+        _set_aside_journal(filename)
+    # A new journal starts with the base line
+    with open(filename + JOURNAL, "a" if length is not None else "w", encoding="utf-8") as f:
+        if length is None:
+            f.write(_journal_base(filename) + "\n")
+        for op, index, student in changes:
+            f.write(f"{op} {index} {_record_line(student)}\n" if student is not None else f"{op} {index}\n")
+    return True
+
+# Writes a roster file with the count first and a new generation id last (random, so rosters
+# written separately never share one). Only the raw input
+# fields are saved. It goes to a temporary file first, so a failed save never leaves half a
+# roster behind. The roster's journal is removed, it is part of the new file (one that didn't
+# belong to the old roster was never read, so it is set aside instead).
+def write_roster(students, filename):
+    matched = os.path.exists(filename) and journal_length(filename) is not None
+    tmp = filename + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(f"{len(students)}\n")
+        for s in students:
+            f.write(_record_line(s) + "\n")
+        f.write(f"generation {os.urandom(8).hex()}\n")
+    os.replace(tmp, filename)
+    if matched:
+        os.remove(filename + JOURNAL)
+    elif os.path.exists(filename + JOURNAL):
+        _set_aside_journal(filename)
+
+# Rough bytes of memory a loaded roster takes (its dictionaries and strings)
+def estimate_bytes(students):
+    size = sys.getsizeof(students)
+    for s in students:
+        size += sys.getsizeof(s) + sys.getsizeof(s["code"]) + sys.getsizeof(s["name"])
+    return size
+
+# The fields kept in a summary for one student, plus where they are in the partition
+def _summary_record(students, index):
+    s = students[index]
+    record = {key: s[key] for key in ("code", "name") + MARK_FIELDS}
+    record["percentage"] = s.get("percentage", 0.0)
+    record["index"] = index
+    return record
+
+class CohortStore:
+    # grade(students) fills in the percentages and grades of a freshly loaded roster
+    def __init__(self, directory, grade=None, memory_cap=MEMORY_CAP):
+        self.directory = directory
+        self.grade = grade
+        self.memory_cap = memory_cap
+        self.resident = OrderedDict()    # Partition name -> (students, estimated bytes), least recent first
+        self.resident_bytes = 0
+        self.pinned = None               # Partition the app is working on, never dropped
+        self.codes = {}                  # Partition name -> sorted lower-case student numbers
+        self.loads = 0                   # Segments read from disk so far
+        self.manifest = {"partitions": {}}
+        try:
+            with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except FileNotFoundError:
+            pass
+
+    # True if a directory holds a partitioned store
+    @staticmethod
+    def exists(directory):
+        return os.path.exists(os.path.join(directory, MANIFEST))
+
+    # Partition names, in order
+    def names(self):
+        return sorted(self.manifest["partitions"])
+
+    def __contains__(self, name):
+        return name in self.manifest["partitions"]
+
+    def count(self, name):
+        return self.manifest["partitions"][name]["count"]
+
+    def _path(self, name, suffix=".txt"):
+        return os.path.join(self.directory, self.manifest["partitions"][name]["file"] + suffix)
+
+    def _writeManifest(self):
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(path + ".tmp", path)
+
+    # Creates an empty partition for a cohort and term (or returns the existing one's name)
+    def add(self, cohort, term):
+        name = f"{cohort} {term}".strip()
+        if name not in self:
+            os.makedirs(self.directory, exist_ok=True)
+            slug = re.sub(r"[^A-Za-z0-9]+", "-", name).strip("-").lower() or "partition"
+            taken = {p["file"] for p in self.manifest["partitions"].values()}
+            file, n = slug, 2
+            while file in taken:
+                file, n = f"{slug}-{n}", n + 1
+            self.manifest["partitions"][name] = {"cohort": str(cohort), "term": str(term), "file": file,
+                                                 "count": 0, "codes": None, "summary": None}
+            self.save(name, [])
+        return name
+
+    # The students of a partition, loading its segment if it isn't resident.
+    # pin=True keeps it loaded until another partition is pinned.
+    def load(self, name, pin=False):
+        if pin:
+            self.pinned = name
+        if name in self.resident:
+            self.resident.move_to_end(name)
+            return self.resident[name][0]
+        students = read_roster(self._path(name))
+        self.loads += 1
+        if self.grade is not None:
+            self.grade(students)
+        self._remember(name, students)
+        return students
+
+    def _remember(self, name, students):
+        if name in self.resident:
+            self.resident_bytes -= self.resident.pop(name)[1]
+        size = estimate_bytes(students)
+        self.resident[name] = (students, size)
+        self.resident_bytes += size
+        # Drop the least recently used partitions until back under the cap
+        for old in list(self.resident):
+            if self.resident_bytes <= self.memory_cap:
+                break
+            if old not in (name, self.pinned):
+                self.resident_bytes -= self.resident.pop(old)[1]
+
+    # Writes a partition's students to its segment and brings its summary and codes up to date.
+    # tag identifies the grading weights the students' percentages were worked out with.
+    def save(self, name, students, tag=None):
+        write_roster(students, self._path(name))
+        codes = sorted(s["code"].lower() for s in students)
+        self._writeCodes(name, codes)
+        self._updated(name, students, codes, tag)
+
+    # Saves a few positional changes to a partition (see save_changes) through its journal.
+    # The .codes file is dropped rather than rewritten and is made again when it is next needed.
+    def save_changes(self, name, students, changes, tag=None):
+        if not save_changes(self._path(name), students, changes):
+            self.save(name, students, tag)
+            return
+        try:
+            os.remove(self._path(name, ".codes"))
+        except FileNotFoundError:
+            pass
+        self._updated(name, students, sorted(s["code"].lower() for s in students), tag)
+
+    def _writeCodes(self, name, codes):
+        with open(self._path(name, ".codes") + ".tmp", "w", encoding="utf-8") as f:
+            f.write("\n".join(codes))
+        os.replace(self._path(name, ".codes") + ".tmp", self._path(name, ".codes"))
+
+    def _updated(self, name, students, codes, tag):
+        self.codes[name] = codes
+        entry = self.manifest["partitions"][name]
+        entry["count"] = len(students)
+        entry["codes"] = [codes[0], codes[-1]] if codes else None
+        entry["summary"] = self._summarize(students, tag) if tag is not None else None
+        entry["marks"] = _mark_span(students)
+        self._writeManifest()
+        self._remember(name, students)
+
+    # Lowest and highest marks of a partition (see _mark_span), worked out from the segment (and
+    # saved) for a manifest written before they were kept
+    def mark_span(self, name):
+        entry = self.manifest["partitions"][name]
+        if "marks" not in entry:
+            entry["marks"] = _mark_span(self.load(name))
+            self._writeManifest()
+        return entry["marks"]
+
+    def _summarize(self, students, tag):
+        if not students:
+            return {"grading": tag, "highest": None, "lowest": None}
+        by_percentage = lambda i: students[i].get("percentage", 0.0)
+        indexes = range(len(students))
+        return {"grading": tag,
+                "highest": _summary_record(students, max(indexes, key=by_percentage)),
+                "lowest": _summary_record(students, min(indexes, key=by_percentage))}
+
+    # A partition's summary under the given grading tag, worked out again (and saved) if it is stale
+    def summary(self, name, tag):
+        entry = self.manifest["partitions"][name]
+        summary = entry.get("summary")
+        if summary is None or summary["grading"] != tag:
+            summary = entry["summary"] = self._summarize(self.load(name), tag)
+            self._writeManifest()
+        return summary
+
+    # (partition name, summary record) of the best or worst student across every partition
+    def extreme(self, tag, highest=True):
+        best = None
+        for name in self.names():
+            record = self.summary(name, tag)["highest" if highest else "lowest"]
+            if record is None:
+                continue
+            if best is None:
+                best = (name, record)
+            elif highest and record["percentage"] > best[1]["percentage"]:
+                best = (name, record)
+            elif not highest and record["percentage"] < best[1]["percentage"]:
+                best = (name, record)
+        return best
+
+    # Sorted lower-case student numbers of a partition, from its .codes file
+    def _codes(self, name):
+        if name not in self.codes:
+            try:
+                with open(self._path(name, ".codes"), encoding="utf-8") as f:
+                    self.codes[name] = f.read().split("\n") if self.count(name) else []
+            except FileNotFoundError:
+                self.codes[name] = sorted(s["code"].lower() for s in self.load(name))
+                self._writeCodes(name, self.codes[name])
+        return self.codes[name]
+
+    # Partition names holding a student number (case doesn't matter), without loading any segment
+    def partitions_with(self, code):
+        code = code.lower()
+        found = []
+        for name in self.names():
+            span = self.manifest["partitions"][name].get("codes", ())
+            if span is None or span and not span[0] <= code <= span[1]:
+                continue
+            codes = self._codes(name)
+            i = bisect.bisect_left(codes, code)
+            if i < len(codes) and codes[i] == code:
+                found.append(name)
+        return found
+
+    # (partition name, index, student) for a student number, loading only the partition that has it
+    def find_code(self, code):
+        for name in self.partitions_with(code):
+            for i, s in enumerate(self.load(name)):
+                if s["code"].lower() == code.lower():
+                    return name, i, s
+        return None
+
+    # Forgets every resident partition except the pinned one (their percentages are out of date)
+    def regraded(self):
+        for name in list(self.resident):
+            if name != self.pinned:
+                self.resident_bytes -= self.resident.pop(name)[1]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage partitioned StudentManager cohorts.")
+    parser.add_argument("--dir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "cohorts"))
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="Copy a roster file into a cohort/term partition")
+    importer.add_argument("roster")
+    importer.add_argument("--cohort", required=True)
+    importer.add_argument("--term", required=True)
+    commands.add_parser("list", help="List the partitions")
+    args = parser.parse_args()
+
+    store = CohortStore(args.dir)
+    if args.command == "import":
+        name = store.add(args.cohort, args.term)
+        students = read_roster(args.roster)
+        store.save(name, students)
+        print(f"Imported {len(students)} students into {name}")
+    else:
+        for name in store.names():
+            print(f"{name:<30}{store.count(name):>8} students")
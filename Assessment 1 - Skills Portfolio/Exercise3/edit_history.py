@@ -0,0 +1,91 @@
+import sys
+from collections import deque
+
+# Undo/redo history for StudentManager that keeps what changed, never copies of the roster.
+# A step is a list of changes made to one partition's roster (None when there are no partitions):
+#   ("edit", index, {field: (old, new)})    the fields of one student that changed
+#   ("insert", index, student)              a student added at index (raw fields only)
+#   ("remove", index, student)              a student taken out from index (raw fields only)
+# apply_changes() carries a step out, or its opposite to undo it, and returns the positional
+# changes for cohort_store.save_changes, so only the records it touched are saved.
+# The history is capped by its estimated size in memory and forgets its oldest steps first.
+
+HISTORY_CAP = 1 << 20       # Estimated bytes of undo and redo steps kept
+RAW_FIELDS = ("code", "name", "c1", "c2", "c3", "exam")
+
+# A student's raw input fields, without the worked out percentage and grade
+def raw_record(student):
+    return {key: student[key] for key in RAW_FIELDS}
+
+# The fields that differ between a student and new values, as {field: (old, new)}
+def field_delta(student, values):
+    return {key: (student[key], value) for key, value in values.items() if student[key] != value}
+
+# Carries out a step's changes on a roster, or undoes them (in reverse order).
+# Returns [(op, index, student)] with op "set", "insert" or "remove" (student is None for a removal).
+def apply_changes(students, changes, undo=False):
+    saves = []
+    for kind, index, data in (reversed(changes) if undo else changes):
+        if kind == "edit":
+            student = students[index]
+            for key, (old, new) in data.items():
+                student[key] = old if undo else new
+            saves.append(("set", index, student))
+        elif (kind == "insert") != undo:     # An insert, or undoing a removal
+            student = dict(data)
+            students.insert(index, student)
+            saves.append(("insert", index, student))
+        else:
+            students.pop(index)
+            saves.append(("remove", index, None))
+    return saves
+
+# Rough bytes of memory a step takes
+def estimate_bytes(changes):
+    size = sys.getsizeof(changes)
+    for change in changes:
+        size += sys.getsizeof(change) + sys.getsizeof(change[2])
+        values = change[2].values()
+        if change[0] == "edit":
+            values = [v for pair in values for v in pair]
+        size += sum(sys.getsizeof(v) for v in values)
+    return size
+
+class EditHistory:
+    def __init__(self, memory_cap=HISTORY_CAP):
+        self.memory_cap = memory_cap
+        self.undo_steps = deque()    # (partition, changes, label, bytes), oldest first
+        self.redo_steps = []         # Undone steps, most recently undone last
+        self.used = 0                # Estimated bytes of every step kept
+
+    def can_undo(self):
+        return bool(self.undo_steps)
+
+    def can_redo(self):
+        return bool(self.redo_steps)
+
+    # Remembers a step that was just carried out. Anything undone before it can't be redone now.
+    def record(self, partition, changes, label):
+        size = estimate_bytes(changes)
+        self.used += size - sum(step[3] for step in self.redo_steps)
+        self.redo_steps.clear()
+        self.undo_steps.append((partition, changes, label, size))
+        # Forget the oldest steps until back under the cap (the newest is always kept)
+        while self.used > self.memory_cap and len(self.undo_steps) > 1:
+            self.used -= self.undo_steps.popleft()[3]
+
+    # The step to undo, as (partition, changes, label), or None. It moves over to the redo list.
+    def undo(self):
+        if not self.undo_steps:
+            return None
+        step = self.undo_steps.pop()
+        self.redo_steps.append(step)
+        return step[:3]
+
+    # The step to carry out again, as (partition, changes, label), or None
+    def redo(self):
+        if not self.redo_steps:
+            return None
+        step = self.redo_steps.pop()
+        self.undo_steps.append(step)
+        return step[:3]
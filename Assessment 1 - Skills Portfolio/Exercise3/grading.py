@@ -0,0 +1,228 @@
+import bisect
+import json
+from collections import OrderedDict
+
+# Grading schemes kept as data instead of code. A scheme gives:
+# - maxima:     the most marks each component (c1, c2, c3, exam) can have
+# - weights:    how much each component counts towards the percentage. Leave it out to count
+#               every mark the same, which is the classic "total marks out of 160"
+# - boundaries: the lowest percentage for each grade, anything below them all gets `fail`
+# Schemes are saved in grading_schemes.json with the one in use, so policy can change without code.
+# CohortGrader re-grades a whole roster in one pass over columns of marks (numpy when it is
+# installed), and caches the result per scheme so flicking between "what-if" boundaries is instant.
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+COMPONENTS = ("c1", "c2", "c3", "exam")     # Mark fields of a student record
+COURSEWORK = ("c1", "c2", "c3")
+CACHED_SCHEMES = 8                          # Results kept per grader (a million students is ~8 MB each)
+
+DEFAULT_SCHEMES = {
+    "Standard": {
+        "maxima": {"c1": 20, "c2": 20, "c3": 20, "exam": 100},
+        "boundaries": {"A": 70, "B": 60, "C": 50, "D": 40},
+        "fail": "F",
+    },
+}
+DEFAULT_SCHEME = "Standard"
+
+class GradingScheme:
+    # Raises ValueError if a maximum isn't positive or the weights don't add up to more than nothing
+    def __init__(self, name, maxima, weights=None, boundaries=None, fail="F"):
+        self.name = name
+        self.maxima = {c: int(maxima[c]) for c in COMPONENTS}
+        if any(m <= 0 for m in self.maxima.values()):
+            raise ValueError(f"Scheme {name!r}: every maximum must be above 0")
+        self.raw_weights = dict(weights) if weights else None
+        weights = weights or self.maxima
+        total = sum(weights[c] for c in COMPONENTS)
+        if any(weights[c] < 0 for c in COMPONENTS) or total <= 0:
+            raise ValueError(f"Scheme {name!r}: weights can't be negative and must add up to more than 0")
+        # Percentage points given by each mark of a component
+        self.factors = {c: 100 * weights[c] / total / self.maxima[c] for c in COMPONENTS}
+        ordered = sorted((boundaries or DEFAULT_SCHEMES[DEFAULT_SCHEME]["boundaries"]).items(), key=lambda item: item[1])
+        self.thresholds = [float(lowest) for _, lowest in ordered]     # Ascending
+        self.labels = [fail] + [grade for grade, _ in ordered]         # labels[i]: below thresholds[i]
+        self.fail = fail
+
+    @classmethod
+    def from_dict(cls, name, data):
+        return cls(name, data["maxima"], data.get("weights"), data.get("boundaries"), data.get("fail", "F"))
+
+    def to_dict(self):
+        data = {"maxima": dict(self.maxima),
+                "boundaries": dict(zip(self.labels[1:], self.thresholds)),
+                "fail": self.fail}
+        if self.raw_weights:
+            data["weights"] = self.raw_weights
+        return data
+
+    # The same scheme with other grade boundaries ({"A": 70, ...})
+    def with_boundaries(self, boundaries):
+        return GradingScheme(self.name, self.maxima, self.raw_weights, boundaries, self.fail)
+
+    # Identifies what the percentages depend on, and what the grades depend on (for caching)
+    def weighting_key(self):
+        return tuple(self.factors[c] for c in COMPONENTS)
+
+    def key(self):
+        return self.weighting_key() + tuple(self.thresholds) + tuple(self.labels)
+
+    @property
+    def coursework_max(self):
+        return sum(self.maxima[c] for c in COURSEWORK)
+
+    def boundaries_text(self):
+        return ", ".join(f"{grade}={lowest:g}" for grade, lowest in zip(reversed(self.labels[1:]), reversed(self.thresholds)))
+
+    # True if every mark is between 0 and its maximum
+    def in_range(self, marks):
+        return all(0 <= marks[c] <= self.maxima[c] for c in COMPONENTS)
+
+    # True if every mark of a roster is, given its {component: [lowest, highest]} (see CohortStore.mark_span)
+    def span_in_range(self, span):
+        return all(0 <= span[c][0] and span[c][1] <= self.maxima[c] for c in COMPONENTS)
+
+    def percentage(self, student):
+        return sum(student.get(c, 0) * self.factors[c] for c in COMPONENTS)
+
+    def grade(self, percentage):
+        # Rounded so a percentage sitting exactly on a boundary isn't pushed under it by float error
+        return self.labels[bisect.bisect_right(self.thresholds, round(percentage, 6))]
+
+    # Fills in the coursework total, percentage and grade of one student record
+    def apply(self, student):
+        student['coursework'] = sum(student.get(c, 0) for c in COURSEWORK)
+        student['percentage'] = max(0.0, self.percentage(student))
+        student['grade'] = self.grade(student['percentage'])
+
+# Reads "A=70, B=60, C=50" into {"A": 70.0, ...}. Raises ValueError if it can't.
+def parse_boundaries(text):
+    boundaries = {}
+    for part in text.split(","):
+        grade, sep, lowest = part.partition("=")
+        if not sep or not grade.strip():
+            raise ValueError(f"Expected GRADE=PERCENT, got {part.strip()!r}")
+        boundaries[grade.strip()] = float(lowest)
+    return boundaries
+
+# Returns ({name: GradingScheme}, active scheme name). A missing or broken file gives the defaults,
+# a broken scheme in it is left out.
+def load_schemes(path):
+    schemes = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for name, scheme in data["schemes"].items():
+            try:
+                schemes[name] = GradingScheme.from_dict(name, scheme)
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                print(f"Skipping grading scheme {name!r} in {path}: {e}")
+        active = data.get("active", DEFAULT_SCHEME)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"Using the default grading scheme, couldn't read {path}: {e}")
+    if not schemes:
+        schemes = {name: GradingScheme.from_dict(name, scheme) for name, scheme in DEFAULT_SCHEMES.items()}
+        active = DEFAULT_SCHEME
+    if active not in schemes:
+        active = next(iter(schemes))
+    return schemes, active
+
+def save_schemes(path, schemes, active):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"active": active, "schemes": {name: s.to_dict() for name, s in schemes.items()}}, f, indent=2)
+
+# Grades a whole roster (a list of student dictionaries) under any scheme.
+# The marks are copied into one column per component the first time they are needed; call
+# invalidate() after the roster changes. Results are cached per scheme (LRU, CACHED_SCHEMES).
+class CohortGrader:
+    def __init__(self, students, use_numpy=True):
+        self.students = students
+        self.use_numpy = use_numpy and np is not None
+        self.columns = None
+        self.percentages = OrderedDict()     # scheme.weighting_key() -> percentage of every student
+        self.grades = OrderedDict()          # scheme.key() -> grade index of every student
+
+    def invalidate(self):
+        self.columns = None
+        self.percentages.clear()
+        self.grades.clear()
+
+    def _columns(self):
+        if self.columns is None:
+            self.columns = {c: [s.get(c, 0) for s in self.students] for c in COMPONENTS}
+            if self.use_numpy:
+                self.columns = {c: np.asarray(values, dtype=np.float64) for c, values in self.columns.items()}
+        return self.columns
+
+    @staticmethod
+    def _remember(cache, key, value):
+        cache[key] = value
+        if len(cache) > CACHED_SCHEMES:
+            cache.popitem(last=False)
+        return value
+
+    # Percentage of every student under a scheme
+    def percentages_for(self, scheme):
+        key = scheme.weighting_key()
+        if key in self.percentages:
+            self.percentages.move_to_end(key)
+            return self.percentages[key]
+        columns = self._columns()
+        if self.use_numpy:
+            result = np.zeros(len(self.students))
+            for c in COMPONENTS:
+                result += columns[c] * scheme.factors[c]
+            np.maximum(result, 0.0, out=result)
+        else:
+            factors = [scheme.factors[c] for c in COMPONENTS]
+            result = [max(0.0, sum(m * f for m, f in zip(marks, factors)))
+                      for marks in zip(*(columns[c] for c in COMPONENTS))]
+        return self._remember(self.percentages, key, result)
+
+    # Grade of every student under a scheme, as indexes into scheme.labels
+    def grade_indexes(self, scheme):
+        key = scheme.key()
+        if key in self.grades:
+            self.grades.move_to_end(key)
+            return self.grades[key]
+        percentages = self.percentages_for(scheme)
+        if self.use_numpy:
+            result = np.searchsorted(scheme.thresholds, np.round(percentages, 6), side="right")
+        else:
+            result = [bisect.bisect_right(scheme.thresholds, round(p, 6)) for p in percentages]
+        return self._remember(self.grades, key, result)
+
+    # {grade: number of students} under a scheme, best grade first
+    def distribution(self, scheme):
+        indexes = self.grade_indexes(scheme)
+        if self.use_numpy:
+            counts = np.bincount(indexes, minlength=len(scheme.labels)).tolist()
+        else:
+            counts = [0] * len(scheme.labels)
+            for i in indexes:
+                counts[i] += 1
+        return {scheme.labels[i]: counts[i] for i in reversed(range(len(scheme.labels)))}
+
+    # Average percentage under a scheme
+    def average(self, scheme):
+        percentages = self.percentages_for(scheme)
+        if not len(percentages):
+            return 0.0
+        return float(percentages.mean()) if self.use_numpy else sum(percentages) / len(percentages)
+
+    # Writes the coursework total, percentage and grade under a scheme into every student record
+    def apply(self, scheme):
+        percentages = self.percentages_for(scheme)
+        indexes = self.grade_indexes(scheme)
+        if self.use_numpy:
+            percentages, indexes = percentages.tolist(), indexes.tolist()
+        labels = scheme.labels
+        for s, percentage, i in zip(self.students, percentages, indexes):
+            s['coursework'] = s['c1'] + s['c2'] + s['c3']
+            s['percentage'] = percentage
+            s['grade'] = labels[i]
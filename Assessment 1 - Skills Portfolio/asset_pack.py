@@ -0,0 +1,210 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+
+from PIL import Image
+
+# Packed asset bundle shared by the three apps.
+# The builder decodes every background image once, stores a few pre-downscaled variants as raw
+# RGBA pixels (and every frame of animated GIFs) in one file, and the reader memory-maps that file
+# so the apps get PIL images that point straight at the mapped pixels, with no PNG/GIF decoding.
+#
+# File layout: b"APK1", index length (uint32), JSON index, then the pixel data. Every pixel block
+# starts on a 64 byte boundary. Assets are keyed by "<exercise folder>/<file name>".
+# Each entry also records the size and modification time its source file had when it was packed.
+# An entry whose source has changed since is skipped (with a warning), and the app loads that
+# image from disk until the pack is built again.
+#
+#   python asset_pack.py build       (run again whenever an image changes)
+#   python asset_pack.py info
+# Apps call openPack() and fall back to loading from disk when it returns None.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PACK_FILE = os.path.join(BASE_DIR, "assets.pack")
+MAGIC = b"APK1"
+HEADER = struct.Struct("<4sI")
+ALIGN = 64
+
+# Longest side of each pre-downscaled variant (the original is only kept if it's smaller)
+VARIANT_SIDES = (1920, 1280, 640)
+
+# Images packed by default, relative to this folder: (path, fixed frame size for animations)
+SOURCES = (
+    ("Exercise1/menu_bg.png", None),
+    ("Exercise1/quiz_bg.png", None),
+    ("Exercise1/results_bg.png", None),
+    ("Exercise2/jokesbg.gif", (600, 300)),       # AlexaJokes shows its frames at 600x300
+    ("Exercise3/smbackground.png", None),
+    ("Exercise3/smbackground2.png", None),
+    ("Exercise3/student.png", None),
+)
+
+# Key for an image path: its exercise folder and file name, however the app spelled the path
+def packKey(path):
+    folder, name = os.path.split(os.path.normpath(path))
+    return f"{os.path.basename(folder)}/{name}"
+
+# (size, modification time) of a source file, as stored in the index
+def sourceStamp(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+# Builds the pack file from the given (path, frame_size) sources. Missing files are skipped.
+def buildPack(sources=SOURCES, pack_file=PACK_FILE, base_dir=BASE_DIR):
+    index = {}
+    blocks = []            # (relative offset, bytes)
+    position = 0
+
+    def addBlock(img):
+        nonlocal position
+        data = img.tobytes()
+        position += -position % ALIGN
+        blocks.append((position, data))
+        entry = {"offset": position, "width": img.width, "height": img.height}
+        position += len(data)
+        return entry
+
+    for rel_path, frame_size in sources:
+        path = os.path.join(base_dir, rel_path)
+        if not os.path.exists(path):
+            print(f"Skipping missing asset: {rel_path}")
+            continue
+        img = Image.open(path)
+        if getattr(img, "n_frames", 1) > 1 or frame_size:
+            # Animation: every frame at the size the app shows it, with its own duration
+            frames = []
+            for n in range(getattr(img, "n_frames", 1)):
+                img.seek(n)
+                frame = img.convert("RGBA")
+                if frame_size:
+                    frame = frame.resize(frame_size, Image.LANCZOS)
+                entry = addBlock(frame)
+                entry["duration"] = img.info.get("duration", 80) or 80
+                frames.append(entry)
+            index[packKey(rel_path)] = {"frames": frames, "source": sourceStamp(path)}
+        else:
+            # Still image: a few aspect-preserving variants, largest first
+            rgba = img.convert("RGBA")
+            variants = []
+            for side in VARIANT_SIDES:
+                scale = min(1.0, side / max(rgba.size))
+                size = (max(1, round(rgba.width * scale)), max(1, round(rgba.height * scale)))
+                if any((v["width"], v["height"]) == size for v in variants):
+                    continue
+                variant = rgba if size == rgba.size else rgba.resize(size, Image.LANCZOS)
+                variants.append(addBlock(variant))
+            index[packKey(rel_path)] = {"variants": variants, "source": sourceStamp(path)}
+
+    index_bytes = json.dumps(index).encode()
+    data_start = HEADER.size + len(index_bytes)
+    data_start += -data_start % ALIGN
+    tmp = pack_file + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for offset, data in blocks:
+            f.seek(data_start + offset)
+            f.write(data)
+    os.replace(tmp, pack_file)
+    return index
+
+# Read-only view of a pack file. Images returned share memory with the mapped file.
+class AssetPack:
+    def __init__(self, pack_file=PACK_FILE):
+        self.file = open(pack_file, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_length = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an asset pack: {pack_file}")
+        self.index = json.loads(self.map[HEADER.size:HEADER.size + index_length])
+        self.data_start = HEADER.size + index_length
+        self.data_start += -self.data_start % ALIGN
+        self.checked = {}      # Key -> True if its entry still matches the source file
+
+    # The index entry for a path, or None if it isn't packed or its source file has changed since
+    def _entry(self, path):
+        key = packKey(path)
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        if key not in self.checked:
+            try:
+                fresh = entry.get("source") == sourceStamp(path)
+            except OSError:
+                fresh = True        # No source file to compare with, the pack is all there is
+            if not fresh:
+                print(f"Asset pack is out of date for {key}, loading it from disk "
+                      "(rebuild with: python asset_pack.py build)")
+            self.checked[key] = fresh
+        return entry if self.checked[key] else None
+
+    def __contains__(self, path):
+        return self._entry(path) is not None
+
+    # Wraps one stored pixel block as a PIL image without copying it
+    def _image(self, entry):
+        start = self.data_start + entry["offset"]
+        size = (entry["width"], entry["height"])
+        length = size[0] * size[1] * 4
+        return Image.frombuffer("RGBA", size, memoryview(self.map)[start:start + length], "raw", "RGBA", 0, 1)
+
+    # Returns the smallest stored variant at least min_size big (or the largest one), or None.
+    # The caller still resizes it to the exact size, but from a much smaller source.
+    def image(self, path, min_size=(0, 0)):
+        entry = self._entry(path)
+        if not entry or "variants" not in entry:
+            return None
+        chosen = entry["variants"][0]
+        for variant in entry["variants"]:
+            if variant["width"] >= min_size[0] and variant["height"] >= min_size[1]:
+                chosen = variant
+        return self._image(chosen)
+
+    # Returns [(PIL image, duration in ms)] for an animation, or None if it isn't packed
+    def frames(self, path):
+        entry = self._entry(path)
+        if not entry or "frames" not in entry:
+            return None
+        return [(self._image(frame), frame["duration"]) for frame in entry["frames"]]
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+_pack = None
+
+# Returns the shared AssetPack, or None when no pack has been built (apps then load from disk).
+def openPack(pack_file=PACK_FILE):
+    global _pack
+    if _pack is None and os.path.exists(pack_file):
+        try:
+            _pack = AssetPack(pack_file)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable asset pack: {e}")
+    return _pack
+
+# Prints what a pack contains
+def describe(pack_file=PACK_FILE):
+    pack = AssetPack(pack_file)
+    print(f"{pack_file}: {os.path.getsize(pack_file) / 1e6:.1f} MB")
+    for key, entry in pack.index.items():
+        if "frames" in entry:
+            first = entry["frames"][0]
+            print(f"  {key}: {len(entry['frames'])} frames at {first['width']}x{first['height']}")
+        else:
+            sizes = ", ".join(f"{v['width']}x{v['height']}" for v in entry["variants"])
+            print(f"  {key}: {sizes}")
+    pack.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or inspect the packed asset bundle.")
+    parser.add_argument("command", choices=("build", "info"))
+    args = parser.parse_args()
+    if args.command == "build":
+        start = time.perf_counter()
+        buildPack()
+        print(f"Built {PACK_FILE} in {time.perf_counter() - start:.1f}s")
+    describe()
@@ -0,0 +1,364 @@
+import argparse
+import importlib.util
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# End-to-end benchmark for the three apps. Each scenario starts the real app in its own process,
+# drives it with scripted clicks and key presses from inside its Tk event loop, and records:
+# - wall time and CPU time from importing the app to the end of the script
+# - peak resident memory of the process
+# - event-loop lag: how late a timer set every LAG_INTERVAL_MS actually fires (p95 and max)
+# Scenarios:
+# - mathquiz: start an Easy quiz and answer every question (10) correctly
+# - jokes:    wait for the jokes to load, then tell 1,000 jokes and show each punchline
+# - students: load a large generated roster, open the full table, the sorted table and edit records
+# With no DISPLAY a virtual one is started with Xvfb, and audio goes to SDL's dummy driver.
+# Every run works on a fresh copy of this folder (the apps and asset_pack.py are imported from the
+# copy), so logs, saved joke orders and edited student files never touch the real ones.
+# Timings depend on the machine, so the baseline is recorded where the checks run: the first run
+# (or the first run of a new scenario) saves its numbers to bench_baseline.json and passes,
+# later runs are compared with them. An unreadable baseline is an error, not a fresh start.
+#   python bench_apps.py                    # compare against bench_baseline.json, exit 1 on a regression
+#   python bench_apps.py --update-baseline  # record the baseline numbers again
+#   python bench_apps.py --scenario jokes --repeat 5
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(BASE_DIR, "bench_baseline.json")
+SCENARIOS = ("mathquiz", "jokes", "students")
+
+LAG_INTERVAL_MS = 10
+POLL_MS = 5                 # How often a scenario waiting on the app checks again
+TIMEOUT = 120               # Seconds before a stuck scenario is abandoned
+JOKES_TOLD = 1000
+STUDENT_ROWS = 20000
+STUDENT_EDITS = 5
+
+# Metrics compared with the baseline. A run fails when a metric is both TOLERANCE worse
+# (relative) and more than its floor worse (absolute), so tiny numbers can't fail on noise.
+METRICS = ("wall_s", "cpu_s", "peak_rss_mb", "lag_p95_ms", "lag_max_ms")
+TOLERANCE = 0.25
+FLOORS = {"wall_s": 0.1, "cpu_s": 0.1, "peak_rss_mb": 10, "lag_p95_ms": 5, "lag_max_ms": 50}
+
+# ---------------------------------------------------------------------------------------------
+# Inside the scenario process
+
+# Peak resident memory of this process in MB
+def peakRss():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+# Imports an app script from its folder in the copied portfolio. The copy's root goes on the path
+# too, ahead of this folder, so the shared modules (asset_pack.py) are the copied ones as well.
+def loadApp(portfolio, folder, filename, name):
+    app_dir = os.path.join(portfolio, folder)
+    sys.path.insert(0, portfolio)
+    sys.path.insert(0, app_dir)
+    spec = importlib.util.spec_from_file_location(name, os.path.join(app_dir, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# Modal dialogs would wait for a person, so they answer straight away instead.
+# askstring takes its answers from the returned list, in order.
+def stubDialogs():
+    from tkinter import messagebox, simpledialog
+    answers = []
+    for name in ("showinfo", "showwarning", "showerror"):
+        setattr(messagebox, name, lambda *args, **kwargs: "ok")
+    messagebox.askyesno = lambda *args, **kwargs: True
+    simpledialog.askstring = lambda *args, **kwargs: answers.pop(0) if answers else None
+    return answers
+
+# Finds a button by its text anywhere inside a window
+def findButton(widget, text):
+    for child in widget.winfo_children():
+        if child.winfo_class() == "Button" and child.cget("text").strip() == text:
+            return child
+        found = findButton(child, text)
+        if found is not None:
+            return found
+    return None
+
+# The newest top-level window that isn't in `before`
+def newWindow(root, before):
+    for child in reversed(root.winfo_children()):
+        if child.winfo_class() == "Toplevel" and child not in before:
+            return child
+    raise RuntimeError("Expected a new window to open")
+
+# Runs a scenario script inside the app's event loop and measures it.
+# The script is a generator: each `yield` gives the event loop a turn (pending redraws included),
+# `yield condition` waits until condition() is true.
+def drive(root, script):
+    lags = []
+    state = {"error": None, "expected": None}
+
+    def probe():
+        now = time.perf_counter()
+        if state["expected"] is not None:
+            lags.append(max(0.0, now - state["expected"]))
+        state["expected"] = now + LAG_INTERVAL_MS / 1000
+        root.after(LAG_INTERVAL_MS, probe)
+
+    def step(condition=None):
+        if condition is not None and not condition():
+            root.after(POLL_MS, step, condition)
+            return
+        try:
+            condition = next(script)
+        except StopIteration:
+            root.quit()
+            return
+        except Exception as e:
+            state["error"] = repr(e)
+            root.quit()
+            return
+        # after_idle first, so the redraws queued by this step happen before the next one
+        root.after_idle(root.after, 0, step, condition)
+
+    def timeout():
+        state["error"] = f"Timed out after {TIMEOUT}s"
+        root.quit()
+
+    root.after(0, probe)
+    root.after(0, step)
+    root.after(TIMEOUT * 1000, timeout)
+    root.mainloop()
+    if state["error"]:
+        raise RuntimeError(state["error"])
+    lags.sort()
+    return lags
+
+def mathquizScenario(portfolio, options):
+    import tkinter as tk
+    quiz = loadApp(portfolio, "Exercise1", "01 - MathQuiz.py", "math_quiz")
+    root = tk.Tk()
+    app = quiz.MathQuiz(root)
+
+    def script():
+        yield root.winfo_ismapped
+        app.startQuiz('Easy')
+        for _ in range(quiz.NUM_QUESTIONS):
+            yield
+            problem = app.session.current_problem
+            app.answer_entry.delete(0, tk.END)
+            app.answer_entry.insert(0, str(problem['correct_answer']))
+            app.submitAnswer()
+            yield
+            # Enter again skips the rest of the answer feedback, like a quick player
+            if app.feedback_job is not None:
+                app.submitAnswer()
+            # Wait for the next question (or the results) to be on screen
+            yield lambda: app.feedback_job is None
+        yield lambda: app.current_screen == 'results'
+
+    return root, script()
+
+def jokesScenario(portfolio, options):
+    jokes = loadApp(portfolio, "Exercise2", "02 - AlexaJokes.py", "alexa_jokes")
+    app = jokes.randomJokes(jokes.JOKES_FILE)
+
+    def script():
+        yield lambda: app.interactive_time is not None
+        for _ in range(options.jokes):
+            app.tell_joke()
+            yield
+            app.show_punchline()
+            yield
+
+    return app, script()
+
+# Writes a roster of `rows` random students in studentmarks.txt format
+def writeStudents(path, rows, seed=0):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{rows}\n")
+        for i in range(rows):
+            marks = [rng.randint(0, 20) for _ in range(3)]
+            f.write(f"{1000 + i},Student {i},{marks[0]},{marks[1]},{marks[2]},{rng.randint(0, 100)}\n")
+
+def studentsScenario(portfolio, options):
+    writeStudents(os.path.join(portfolio, "Exercise3", "studentmarks.txt"), options.students)
+    # The roster is loaded when the module is imported
+    manager = loadApp(portfolio, "Exercise3", "03 - StudentManager.py", "student_manager")
+    app = manager.StudentManagerApp()
+    answers = options.answers
+
+    def script():
+        yield app.winfo_ismapped
+        for action in (app.on_view_all, lambda: (answers.append("desc"), app.on_sort())):
+            before = set(app.winfo_children())
+            action()
+            yield
+            newWindow(app, before).destroy()
+        rng = random.Random(1)
+        for _ in range(options.edits):
+            idx = rng.randrange(len(manager.students))
+            before = set(app.winfo_children())
+            app.on_update()
+            yield
+            chooser = newWindow(app, before)
+            chooser.tree.selection_set(str(idx))
+            before = set(app.winfo_children())
+            findButton(chooser, "Select").invoke()
+            yield
+            editor = newWindow(app, before)
+            editor.entries["exam"].delete(0, "end")
+            editor.entries["exam"].insert(0, str(rng.randint(0, 100)))
+            findButton(editor, "Save Changes").invoke()
+            yield
+
+    return app, script()
+
+def runScenario(name, portfolio, options):
+    options.answers = stubDialogs()
+    wall, cpu = time.perf_counter(), time.process_time()
+    root, script = globals()[f"{name}Scenario"](portfolio, options)
+    lags = drive(root, script)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    try:
+        root.destroy()
+    except Exception:
+        pass
+    lag_ms = [lag * 1000 for lag in lags] or [0.0]
+    return {"wall_s": wall, "cpu_s": cpu, "peak_rss_mb": peakRss(),
+            "lag_p95_ms": lag_ms[min(len(lag_ms) - 1, int(len(lag_ms) * 0.95))], "lag_max_ms": lag_ms[-1]}
+
+# ---------------------------------------------------------------------------------------------
+# Controlling process
+
+# Starts Xvfb on a free display number. Returns (process, display name).
+def startXvfb():
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        sys.exit("No DISPLAY is set and Xvfb isn't installed (apt install xvfb), or pass --no-xvfb with a display.")
+    number = next(n for n in range(99, 199) if not os.path.exists(f"/tmp/.X{n}-lock"))
+    process = subprocess.Popen([xvfb, f":{number}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            sys.exit("Xvfb didn't start")
+        time.sleep(0.05)
+    return process, f":{number}"
+
+# Copies the portfolio folder for one run. The asset pack is only read, so it is linked, not copied.
+def copyPortfolio(work_dir):
+    portfolio = os.path.join(work_dir, "portfolio")
+    shutil.copytree(BASE_DIR, portfolio, ignore=shutil.ignore_patterns(
+        "__pycache__", "assets.pack*", "*.log", "*.log.*", "*.idx", "*.idx.*",
+        "joke_order.json*", "Jokes.corpus*", "*.review*", "*.journal", "bench_baseline.json"))
+    pack = os.path.join(BASE_DIR, "assets.pack")
+    if os.path.exists(pack):
+        os.symlink(pack, os.path.join(portfolio, "assets.pack"))
+    return portfolio
+
+# Runs one scenario in a fresh process on a fresh copy. Returns its metrics.
+def measure(name, args, env):
+    with tempfile.TemporaryDirectory(prefix="bench_apps_") as work_dir:
+        portfolio = copyPortfolio(work_dir)
+        command = [sys.executable, os.path.abspath(__file__), "--run-scenario", name, "--portfolio", portfolio,
+                   "--jokes", str(args.jokes), "--students", str(args.students), "--edits", str(args.edits)]
+        result = subprocess.run(command, env=env, cwd=work_dir, capture_output=True, text=True,
+                                timeout=TIMEOUT + 60)
+    if result.returncode != 0:
+        sys.exit(f"Scenario {name} failed:\n{result.stderr.strip()}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+# The saved baseline, empty if none was recorded yet
+def loadBaseline(update):
+    try:
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        if update:
+            print(f"Replacing unreadable baseline {BASELINE_FILE}: {e}")
+            return {}
+        sys.exit(f"Could not read the baseline {BASELINE_FILE}: {e}")
+    if not isinstance(baseline, dict):
+        if update:
+            return {}
+        sys.exit(f"Baseline {BASELINE_FILE} is not a dictionary of scenarios, record it again with --update-baseline")
+    return baseline
+
+# Metric names that got worse than the baseline allows
+def regressions(current, baseline, tolerance):
+    worse = []
+    for metric in METRICS:
+        if metric in baseline:
+            limit = max(baseline[metric] * (1 + tolerance), baseline[metric] + FLOORS[metric])
+            if current[metric] > limit:
+                worse.append(metric)
+    return worse
+
+def main(args):
+    env = dict(os.environ, SDL_AUDIODRIVER="dummy")
+    xvfb = None
+    if not env.get("DISPLAY") and not args.no_xvfb:
+        xvfb, env["DISPLAY"] = startXvfb()
+    baseline = loadBaseline(args.update_baseline)
+    failed = False
+    recorded = False
+    try:
+        print(f"{'Scenario':<10}" + "".join(f"{metric:>14}" for metric in METRICS) + "   vs baseline")
+        for name in args.scenario or SCENARIOS:
+            runs = [measure(name, args, env) for _ in range(args.repeat)]
+            # The median of each metric over the repeats
+            current = {metric: statistics.median(run[metric] for run in runs) for metric in METRICS}
+            row = f"{name:<10}" + "".join(f"{current[metric]:>14.3f}" for metric in METRICS)
+            if args.update_baseline or name not in baseline:
+                # Nothing to compare with yet: these numbers become the baseline
+                baseline[name] = current
+                recorded = True
+                print(row + "   saved")
+            else:
+                worse = regressions(current, baseline[name], args.tolerance)
+                failed = failed or bool(worse)
+                print(row + ("   REGRESSED: " + ", ".join(worse) if worse else "   ok"))
+    finally:
+        if xvfb:
+            xvfb.terminate()
+            xvfb.wait()
+    if recorded:
+        tmp = BASELINE_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(baseline, f, indent=2)
+        os.replace(tmp, BASELINE_FILE)
+        print(f"Baseline written to {BASELINE_FILE}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the three apps headlessly and check for regressions.")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Run only this scenario (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario, the median is reported")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--update-baseline", action="store_true", help="Save these results as the new baseline")
+    parser.add_argument("--no-xvfb", action="store_true", help="Don't start Xvfb, use the current DISPLAY")
+    parser.add_argument("--jokes", type=int, default=JOKES_TOLD, help="Jokes told in the jokes scenario")
+    parser.add_argument("--students", type=int, default=STUDENT_ROWS, help="Rows in the generated roster")
+    parser.add_argument("--edits", type=int, default=STUDENT_EDITS, help="Records edited in the students scenario")
+    parser.add_argument("--run-scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--portfolio", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run_scenario:
+        print(json.dumps(runScenario(args.run_scenario, args.portfolio, args)))
+    else:
+        sys.exit(main(args))
@@ -0,0 +1,95 @@
+import os
+import statistics
+import time
+
+from PIL import Image
+
+import asset_pack
+
+# Before/after timings for loading the apps' images from disk versus the asset pack.
+# Each case is the PIL work an app does before handing an image to Tk, at the window size it uses:
+# - startup: first background (and icon / GIF frames) when an app opens
+# - screen switch: MathQuiz moving between its menu, quiz and results backgrounds
+# Build the pack first with: python asset_pack.py build
+# (Converting to a Tk PhotoImage costs the same either way and needs a display, so it isn't timed.)
+
+BASE_DIR = asset_pack.BASE_DIR
+ROUNDS = 20
+
+# Stretches an image to the window like MathQuiz.on_resize
+def stretch(img, size):
+    return img.resize(size, Image.LANCZOS)
+
+# Scales and crops an image to cover the window like StudentManager's add_responsive_background
+def cover(img, size):
+    w, h = size
+    scale = max(w / img.width, h / img.height)
+    resized = img.resize((int(img.width * scale), int(img.height * scale)), Image.LANCZOS)
+    left, top = (resized.width - w) // 2, (resized.height - h) // 2
+    return resized.crop((left, top, left + w, top + h))
+
+# Loads an image the old way: decode the file from disk every time
+def fromDisk(rel_path, size):
+    return Image.open(os.path.join(BASE_DIR, rel_path)).convert("RGBA")
+
+# Loads an image from the memory-mapped pack: no decoding, smallest variant that is big enough
+def fromPack(pack):
+    return lambda rel_path, size: pack.image(rel_path, size)
+
+# (name, [(image, window size, fit function)]) for each scenario
+SCENARIOS = [
+    ("MathQuiz startup", [("Exercise1/menu_bg.png", (500, 450), stretch)]),
+    ("MathQuiz screen switch", [("Exercise1/quiz_bg.png", (500, 450), stretch),
+                                ("Exercise1/results_bg.png", (500, 450), stretch),
+                                ("Exercise1/menu_bg.png", (500, 450), stretch)]),
+    ("StudentManager startup", [("Exercise3/smbackground2.png", (1000, 700), cover),
+                                ("Exercise3/student.png", (24, 24), lambda img, size: img)]),
+    ("StudentManager window", [("Exercise3/smbackground.png", (1000, 700), cover)]),
+]
+
+# Median milliseconds to run every step of a scenario with the given loader
+def timeScenario(steps, loader):
+    times = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for rel_path, size, fit in steps:
+            fit(loader(rel_path, size), size)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+# Median milliseconds to get every AlexaJokes GIF frame at 600x300
+def timeGif(pack):
+    path = os.path.join(BASE_DIR, "Exercise2/jokesbg.gif")
+    if not os.path.exists(path):
+        return None, None
+    disk, packed = [], []
+    for _ in range(max(1, ROUNDS // 4)):
+        start = time.perf_counter()
+        gif = Image.open(path)
+        for n in range(getattr(gif, "n_frames", 1)):
+            gif.seek(n)
+            gif.copy().resize((600, 300))
+        disk.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        pack.frames(path)
+        packed.append(time.perf_counter() - start)
+    return statistics.median(disk) * 1000, statistics.median(packed) * 1000
+
+def main():
+    pack = asset_pack.openPack()
+    if pack is None:
+        print("No asset pack found, run: python asset_pack.py build")
+        return
+    print(f"{'Scenario':<26}{'disk (ms)':>12}{'pack (ms)':>12}{'speed-up':>10}")
+    for name, steps in SCENARIOS:
+        before = timeScenario(steps, fromDisk)
+        after = timeScenario(steps, fromPack(pack))
+        print(f"{name:<26}{before:>12.2f}{after:>12.2f}{before / after:>9.1f}x")
+    before, after = timeGif(pack)
+    if before is None:
+        print(f"{'AlexaJokes GIF frames':<26}{'(jokesbg.gif not found)':>34}")
+    else:
+        print(f"{'AlexaJokes GIF frames':<26}{before:>12.2f}{after:>12.2f}{before / after:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import os
+import runpy
+import sys
+
+# Starts one of the portfolio apps with the shared modules in this folder (asset_pack.py) importable:
+#   python run.py mathquiz [--server HOST:PORT] [--player NAME]
+#   python run.py jokes [--server HOST:PORT]
+#   python run.py students
+# The apps also run on their own (python "Exercise1/01 - MathQuiz.py"), they then decode their
+# images from disk instead of using the asset pack.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APPS = {
+    "mathquiz": ("Exercise1", "01 - MathQuiz.py"),
+    "jokes": ("Exercise2", "02 - AlexaJokes.py"),
+    "students": ("Exercise3", "03 - StudentManager.py"),
+}
+
+def main(argv):
+    if not argv or argv[0] not in APPS:
+        print(f"usage: python run.py {{{','.join(APPS)}}} [app arguments]")
+        return 2
+    folder, script = APPS[argv[0]]
+    app_dir = os.path.join(BASE_DIR, folder)
+    sys.path.insert(0, app_dir)    # The app's own helper modules, as when it is started directly
+    sys.argv = [script] + argv[1:]
+    runpy.run_path(os.path.join(app_dir, script), run_name="__main__")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))